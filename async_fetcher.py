@@ -0,0 +1,352 @@
+"""
+Cliente HTTP assíncrono mínimo baseado apenas em asyncio
+Permite manter milhares de conexões abertas em uma única thread
+"""
+
+import asyncio
+import base64
+import ssl
+import zlib
+import urllib.parse
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+from http_utils import CHUNK_SIZE, is_html_content_type
+
+# Brotli é opcional: sem ele 'br' não é anunciado no Accept-Encoding
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+SUPPORTED_ENCODINGS = ('gzip', 'deflate', 'br') if brotli else ('gzip', 'deflate')
+
+
+class AsyncFetchError(Exception):
+    """Erro ao buscar uma URL com o cliente assíncrono"""
+    
+    def __init__(self, message: str, response: Optional['AsyncResponse'] = None):
+        super().__init__(message)
+        self.response = response  # resposta 4xx/5xx que originou o erro, se houver
+
+
+class AsyncResponse:
+    """Resposta HTTP obtida pelo AsyncFetcher"""
+    
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes,
+                 truncated: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.truncated = truncated
+    
+    def raise_for_status(self):
+        """Lança AsyncFetchError para respostas 4xx/5xx"""
+        if self.status_code >= 400:
+            raise AsyncFetchError(f"{self.status_code} Error for url: {self.url}", self)
+
+
+class AsyncFetcher:
+    """Cliente HTTP/1.1 assíncrono com reuso de conexões keep-alive por host
+    
+    Com max_content_length o corpo é lido só até o limite (a conexão é
+    descartada e a resposta marcada como truncada); com html_only o corpo de
+    respostas cujo Content-Type não é HTML nem chega a ser lido.
+    
+    proxies segue o formato do requests ({'http': ..., 'https': ..., 'no_proxy': ...});
+    apenas proxies HTTP são suportados, com túnel CONNECT para URLs https.
+    """
+    
+    MAX_REDIRECTS = 5
+    
+    def __init__(self, headers: Dict = None, timeout: float = 10, max_idle_per_host: int = 10,
+                 max_content_length: Optional[int] = None, html_only: bool = False,
+                 proxies: Dict = None):
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.max_content_length = max_content_length
+        self.html_only = html_only
+        self.proxies = {key: value for key, value in (proxies or {}).items() if value}
+        self._idle: Dict[Tuple, List] = {}
+        self._ssl_context = ssl.create_default_context()
+        
+        for key, proxy in self.proxies.items():
+            if key not in ('no', 'no_proxy') and self._parse_proxy(proxy).scheme != 'http':
+                raise ValueError(f"Proxy não suportado pelo cliente assíncrono: {proxy}")
+        
+        # Só anuncia as codificações que _decode_body sabe descomprimir
+        for name in list(self.headers):
+            if name.lower() == 'accept-encoding':
+                accepted = [coding.strip() for coding in str(self.headers[name]).split(',')
+                            if coding.split(';')[0].strip().lower() in SUPPORTED_ENCODINGS]
+                self.headers[name] = ', '.join(accepted) or 'identity'
+    
+    @staticmethod
+    def _parse_proxy(proxy: str) -> urllib.parse.SplitResult:
+        return urllib.parse.urlsplit(proxy if '://' in proxy else 'http://' + proxy)
+    
+    @staticmethod
+    def _host_header(host: str, port: Optional[int] = None) -> str:
+        """Monta host[:porta] com literais IPv6 entre colchetes"""
+        if ':' in host:
+            host = f"[{host}]"
+        return host if port is None else f"{host}:{port}"
+    
+    def _proxy_for(self, parsed: urllib.parse.SplitResult) -> Optional[urllib.parse.SplitResult]:
+        """Escolhe o proxy da URL como o requests: scheme://host, esquema e 'all'"""
+        if not self.proxies:
+            return None
+        no_proxy = self.proxies.get('no_proxy') or self.proxies.get('no')
+        if no_proxy and urllib.request.proxy_bypass_environment(parsed.hostname, {'no': no_proxy}):
+            return None
+        proxy = (self.proxies.get(f"{parsed.scheme}://{parsed.hostname}")
+                 or self.proxies.get(parsed.scheme) or self.proxies.get('all'))
+        return self._parse_proxy(proxy) if proxy else None
+    
+    @staticmethod
+    def _proxy_authorization(proxy: urllib.parse.SplitResult) -> Optional[str]:
+        if proxy.username is None:
+            return None
+        credentials = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+        return 'Basic ' + base64.b64encode(credentials.encode('latin-1')).decode('ascii')
+    
+    async def get(self, url: str) -> AsyncResponse:
+        """Faz um GET seguindo redirecionamentos"""
+        return await asyncio.wait_for(self._get(url), timeout=self.timeout)
+    
+    async def _get(self, url: str) -> AsyncResponse:
+        for _ in range(self.MAX_REDIRECTS + 1):
+            response = await self._request(url)
+            location = response.headers.get('location')
+            if response.status_code in (301, 302, 303, 307, 308) and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            return response
+        raise AsyncFetchError(f"Redirecionamentos demais: {url}")
+    
+    async def _request(self, url: str) -> AsyncResponse:
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme not in ('http', 'https'):
+            raise AsyncFetchError(f"Esquema não suportado: {url}")
+        
+        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        proxy = self._proxy_for(parsed)
+        key = (parsed.scheme, parsed.hostname, port, proxy)
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+        
+        host_header = self._host_header(parsed.hostname, parsed.port)
+        headers = {'Host': host_header, 'Connection': 'keep-alive'}
+        if proxy is not None and parsed.scheme == 'http':
+            # Proxy HTTP recebe a URL absoluta; https usa o túnel aberto em _connect
+            path = f"http://{host_header}{path}"
+            authorization = self._proxy_authorization(proxy)
+            if authorization:
+                headers['Proxy-Authorization'] = authorization
+        headers.update(self.headers)
+        request = f"GET {path} HTTP/1.1\r\n"
+        request += ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+        request += "\r\n"
+        
+        reader, writer, reused = await self._acquire(key)
+        try:
+            try:
+                status_code, response_headers, body, truncated, keep_alive = await self._exchange(
+                    reader, writer, request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not reused:
+                    raise
+                # Conexão ociosa fechada pelo servidor: tenta novamente com uma nova
+                writer.close()
+                reader, writer, _ = await self._connect(key)
+                status_code, response_headers, body, truncated, keep_alive = await self._exchange(
+                    reader, writer, request)
+        except BaseException:
+            writer.close()
+            raise
+        
+        if keep_alive:
+            self._release(key, reader, writer)
+        else:
+            writer.close()
+        
+        content, decoded_truncated = self._decode_body(body, response_headers)
+        return AsyncResponse(url, status_code, response_headers, content, truncated or decoded_truncated)
+    
+    async def _exchange(self, reader, writer, request: str):
+        """Envia a requisição e lê a resposta na conexão informada"""
+        writer.write(request.encode('latin-1'))
+        await writer.drain()
+        return await self._read_response(reader)
+    
+    async def _acquire(self, key):
+        """Obtém uma conexão ociosa do host ou abre uma nova"""
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        return await self._connect(key)
+    
+    async def _connect(self, key):
+        scheme, host, port, proxy = key
+        ssl_context = self._ssl_context if scheme == 'https' else None
+        if proxy is None:
+            reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context, limit=2 ** 20)
+            return reader, writer, False
+        
+        reader, writer = await asyncio.open_connection(proxy.hostname, proxy.port or 80, limit=2 ** 20)
+        if ssl_context is not None:
+            try:
+                await self._open_tunnel(reader, writer, host, port, proxy)
+                await writer.start_tls(ssl_context, server_hostname=host)
+            except BaseException:
+                writer.close()
+                raise
+        return reader, writer, False
+    
+    async def _open_tunnel(self, reader, writer, host: str, port: int, proxy):
+        """Pede ao proxy um túnel CONNECT até host:porta"""
+        target = self._host_header(host, port)
+        request = f"CONNECT {target} HTTP/1.1\r\nHost: {target}\r\n"
+        authorization = self._proxy_authorization(proxy)
+        if authorization:
+            request += f"Proxy-Authorization: {authorization}\r\n"
+        writer.write((request + "\r\n").encode('latin-1'))
+        await writer.drain()
+        
+        status_line = await reader.readline()
+        parts = status_line.decode('latin-1').split(None, 2)
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+        if len(parts) < 2 or not parts[1].startswith('2'):
+            raise AsyncFetchError(f"Proxy recusou o túnel para {target}: {status_line.decode('latin-1').strip()}")
+    
+    def _release(self, key, reader, writer):
+        idle = self._idle.setdefault(key, [])
+        if len(idle) < self.max_idle_per_host:
+            idle.append((reader, writer))
+        else:
+            writer.close()
+    
+    async def _read_response(self, reader):
+        """Lê status, headers e corpo (até max_content_length) de uma resposta HTTP/1.1"""
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Conexão fechada pelo servidor")
+        parts = status_line.decode('latin-1').split(None, 2)
+        version, status_code = parts[0], int(parts[1])
+        
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+        
+        limit = self.max_content_length
+        truncated = False
+        
+        if status_code in (204, 304) or 100 <= status_code < 200:
+            body = b''
+        elif self.html_only and not (300 <= status_code < 400) and \
+                not is_html_content_type(headers.get('content-type')):
+            # Não é HTML: descarta a conexão sem ler o corpo
+            body = b''
+            keep_alive = False
+        elif 'chunked' in headers.get('transfer-encoding', '').lower():
+            body, truncated = await self._read_chunked(reader, limit)
+        elif 'content-length' in headers:
+            length = int(headers['content-length'])
+            if limit is not None and length > limit:
+                body, truncated = await reader.readexactly(limit), True
+            else:
+                body = await reader.readexactly(length)
+        else:
+            body, truncated = await self._read_until_eof(reader, limit)
+            keep_alive = False
+        
+        if truncated:
+            # O restante do corpo ficou na conexão, que não pode ser reutilizada
+            keep_alive = False
+        
+        return status_code, headers, body, truncated, keep_alive
+    
+    async def _read_chunked(self, reader, limit: Optional[int] = None) -> Tuple[bytes, bool]:
+        chunks = []
+        total = 0
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                # Descarta trailers até a linha em branco
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                break
+            if limit is not None and total + size > limit:
+                chunks.append(await reader.readexactly(limit - total))
+                return b''.join(chunks), True
+            chunks.append(await reader.readexactly(size))
+            total += size
+            await reader.readexactly(2)
+        return b''.join(chunks), False
+    
+    async def _read_until_eof(self, reader, limit: Optional[int] = None) -> Tuple[bytes, bool]:
+        """Lê até o servidor fechar a conexão ou o limite ser atingido"""
+        chunks = []
+        total = 0
+        while True:
+            chunk = await reader.read(CHUNK_SIZE)
+            if not chunk:
+                return b''.join(chunks), False
+            chunks.append(chunk)
+            total += len(chunk)
+            if limit is not None and total > limit:
+                return b''.join(chunks)[:limit], True
+    
+    def _decode_body(self, body: bytes, headers: Dict[str, str]) -> Tuple[bytes, bool]:
+        """Descomprime corpos gzip/deflate/br sem passar de max_content_length"""
+        encoding = headers.get('content-encoding', '').lower()
+        if encoding == 'br' and brotli is not None:
+            content = brotli.decompress(body)
+            limit = self.max_content_length
+            if limit is not None and len(content) > limit:
+                return content[:limit], True
+            return content, False
+        if encoding == 'gzip':
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == 'deflate':
+            decompressor = zlib.decompressobj()
+            try:
+                return self._decompress(decompressor, body)
+            except zlib.error:
+                decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        else:
+            return body, False
+        return self._decompress(decompressor, body)
+    
+    def _decompress(self, decompressor, body: bytes) -> Tuple[bytes, bool]:
+        """Descomprime no máximo max_content_length bytes; retorna (corpo, truncado)"""
+        limit = self.max_content_length
+        if limit is None:
+            return decompressor.decompress(body), False
+        content = decompressor.decompress(body, limit)
+        return content, bool(decompressor.unconsumed_tail)
+    
+    async def close(self):
+        """Fecha todas as conexões ociosas"""
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle.clear()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória dos resultados
+Compara o antigo CrawlResult (dataclass com __dict__ e datetime) com o
+layout compacto atual, com e sem compressão do conteúdo, e guardado em um
+ResultStore (URLs deduplicadas pela tabela de strings)
+
+Uso: python benchmark_memory.py [quantidade_de_paginas]
+"""
+
+import sys
+import os
+import gc
+import random
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from result_store import ResultStore
+from web_crawler import CrawlResult
+
+
+@dataclass
+class CrawlResultAntigo:
+    """Layout anterior do CrawlResult, para comparação"""
+    url: str
+    title: str
+    description: str
+    content: str
+    links: List[str]
+    images: List[str]
+    timestamp: datetime
+    status_code: int
+    response_time: float
+    truncated: bool = False
+
+
+def gerar_paginas(quantidade: int):
+    """Gera dados parecidos com um crawl de um site: menu repetido e links próprios"""
+    aleatorio = random.Random(42)
+    menu = [f"https://example.com/secao/{i}" for i in range(40)]
+    palavras = "crawler página conteúdo notícia produto preço artigo texto dados busca".split()
+    
+    for i in range(quantidade):
+        # Strings novas a cada página, como as que saem do parse
+        links = [url + "" for url in menu] + [
+            f"https://example.com/artigo/{aleatorio.randrange(quantidade * 5)}" for _ in range(20)
+        ]
+        images = [f"https://example.com/img/logo.png", f"https://example.com/img/{i}.jpg"]
+        content = " ".join(aleatorio.choice(palavras) for _ in range(300))
+        yield dict(
+            url=f"https://example.com/artigo/{i}", title=f"Artigo {i}", description="Descrição do artigo",
+            content=content, links=links, images=images, timestamp=datetime.now(),
+            status_code=200, response_time=aleatorio.random()
+        )
+
+
+def medir(quantidade: int, criar, armazenar: bool = False) -> int:
+    """Bytes alocados para manter quantidade resultados na memória
+    
+    armazenar=True guarda os resultados em um ResultStore sem limite de memória.
+    """
+    gc.collect()
+    tracemalloc.start()
+    resultados = ResultStore(max_memory_bytes=None) if armazenar else []
+    for pagina in gerar_paginas(quantidade):
+        resultados.append(criar(pagina))
+    gc.collect()
+    usado, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultados
+    return usado
+
+
+def main():
+    """Executa o benchmark e imprime a tabela de memória"""
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    
+    layouts = [
+        ("dataclass antigo", lambda pagina: CrawlResultAntigo(**pagina), False),
+        ("compacto", lambda pagina: CrawlResult(**pagina), False),
+        ("compacto + zlib", lambda pagina: CrawlResult(**pagina, compress=True), False),
+        ("ResultStore", lambda pagina: CrawlResult(**pagina), True),
+        ("ResultStore + zlib", lambda pagina: CrawlResult(**pagina, compress=True), True),
+    ]
+    
+    print(f"🧠 Benchmark de memória ({quantidade} resultados)")
+    print("=" * 50)
+    
+    base = None
+    for nome, criar, armazenar in layouts:
+        usado = medir(quantidade, criar, armazenar)
+        base = base or usado
+        print(f"{nome:18} {usado / 1024 / 1024:8.1f} MB  {usado / quantidade:8.0f} B/página  "
+              f"{base / usado:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos backends de parse de HTML
+Mede parse + extract_content de cada backend disponível sobre páginas
+sintéticas (ou arquivos HTML passados na linha de comando) e confere
+se todos produzem o mesmo resultado
+
+Uso: python benchmark_parsers.py [arquivo.html ...]
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from web_crawler import WebCrawler
+from html_parsers import available_backends, parse_html
+
+
+def gerar_pagina(paragrafos: int = 200) -> bytes:
+    """Gera uma página parecida com um artigo de blog"""
+    partes = [
+        '<html><head><title>Artigo de teste</title>',
+        '<meta name="description" content="Página sintética para benchmark">',
+        '<script>var analytics = {id: 1};</script><style>p { margin: 0 }</style></head><body>',
+        '<nav>' + ''.join(f'<a href="/secao/{i}">Seção {i}</a>' for i in range(50)) + '</nav>',
+        '<article class="post-content"><h1>Título do artigo</h1>'
+    ]
+    for i in range(paragrafos):
+        partes.append(
+            f'<p>Parágrafo {i} com <b>negrito</b>, <a href="/link/{i}">um link</a> '
+            f'e <img src="/img/{i}.png"> uma imagem. Lorem ipsum dolor sit amet.</p>'
+        )
+    partes.append('</article><footer>Rodapé</footer></body></html>')
+    return ''.join(partes).encode('utf-8')
+
+
+def medir(crawler: WebCrawler, paginas, backend: str, repeticoes: int):
+    """Retorna (segundos por página, resultados) do backend"""
+    resultados = [crawler.extract_content(parse_html(html, backend), {}) for html in paginas]
+    
+    start = time.perf_counter()
+    for _ in range(repeticoes):
+        for html in paginas:
+            crawler.extract_content(parse_html(html, backend), {})
+    elapsed = time.perf_counter() - start
+    
+    return elapsed / (repeticoes * len(paginas)), resultados
+
+
+def normalizar(resultado: dict) -> dict:
+    """Ordena listas para comparar resultados de backends diferentes"""
+    return {chave: sorted(valor) if isinstance(valor, list) else valor for chave, valor in resultado.items()}
+
+
+def main():
+    """Executa o benchmark e imprime a tabela de tempos"""
+    if len(sys.argv) > 1:
+        paginas = []
+        for caminho in sys.argv[1:]:
+            with open(caminho, 'rb') as f:
+                paginas.append(f.read())
+    else:
+        paginas = [gerar_pagina(50), gerar_pagina(200), gerar_pagina(1000)]
+    
+    crawler = WebCrawler()
+    tamanho = sum(len(html) for html in paginas) / len(paginas) / 1024
+    print(f"🏁 Benchmark de parse ({len(paginas)} páginas, média de {tamanho:.0f} KB)")
+    print("=" * 50)
+    
+    tempos = {}
+    referencia = None
+    for backend in available_backends():
+        tempo, resultados = medir(crawler, paginas, backend, repeticoes=5)
+        tempos[backend] = tempo
+        
+        resultados = [normalizar(r) for r in resultados]
+        if referencia is None:
+            referencia = resultados
+        iguais = "✓" if resultados == referencia else "❌ resultado diferente"
+        print(f"{backend:12} {tempo * 1000:8.2f} ms/página  {iguais}")
+    
+    mais_lento = max(tempos.values())
+    print("-" * 50)
+    for backend, tempo in tempos.items():
+        print(f"{backend:12} {mais_lento / tempo:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
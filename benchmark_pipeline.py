@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark do estágio de parse
+Compara páginas/s de parse + extração em um pool de threads (todas
+disputando o GIL) com o ParsePool do modo pipeline, de 1 processo até o
+número de núcleos
+
+Uso: python benchmark_pipeline.py [quantidade_de_paginas]
+"""
+
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_parsers import gerar_pagina
+from extraction import ExtractionPlan
+from html_parsers import parse_html, resolve_backend
+from parse_pool import ParsePool
+
+
+def medir_threads(paginas, workers: int, backend: str) -> float:
+    """Páginas por segundo com parse em threads"""
+    plan = ExtractionPlan(None, backend)
+    
+    def processar(html):
+        return plan.extract(parse_html(html, backend))
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(processar, paginas))
+    return len(paginas) / (time.perf_counter() - start)
+
+
+def medir_processos(paginas, workers: int, backend: str) -> float:
+    """Páginas por segundo com o ParsePool (processos já iniciados antes da medição)"""
+    with ParsePool(workers) as pool:
+        # Aquece os processos: import das bibliotecas e compilação do plano
+        for future in [pool.submit(paginas[0], None, backend) for _ in range(workers * 2)]:
+            future.result()
+        
+        start = time.perf_counter()
+        for future in [pool.submit(html, None, backend) for html in paginas]:
+            future.result()
+        return len(paginas) / (time.perf_counter() - start)
+
+
+def main():
+    """Executa o benchmark e imprime a tabela de páginas/s"""
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    paginas = [gerar_pagina(200) for _ in range(quantidade)]
+    backend = resolve_backend('auto')
+    nucleos = os.cpu_count() or 1
+    
+    print(f"🏁 Benchmark do estágio de parse ({quantidade} páginas, backend {backend}, {nucleos} núcleos)")
+    print("=" * 50)
+    
+    workers = 1
+    while True:
+        threads = medir_threads(paginas, workers, backend)
+        processos = medir_processos(paginas, workers, backend)
+        print(f"{workers:2} workers  threads {threads:8.1f} pág/s  processos {processos:8.1f} pág/s")
+        if workers >= nucleos:
+            break
+        workers = min(workers * 2, nucleos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+"""
+Pools de conexões HTTP com keep-alive
+Reaproveita conexões TCP/TLS entre requisições ao mesmo host: um adapter
+do requests com tamanho por host, limite de hosts e descarte de conexões
+ociosas para o WebCrawler, e um handler do urllib com keep-alive para o
+SimpleCrawler (que sem ele abre uma conexão nova por página). Com um
+DNSCache, as conexões novas resolvem o host pelo cache
+"""
+
+import http.client
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from dns_cache import DNSCache
+
+try:
+    from requests.adapters import HTTPAdapter
+    from urllib3 import HTTPConnectionPool, HTTPSConnectionPool, PoolManager
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.exceptions import HTTPError as URLLib3Error, NameResolutionError
+except ImportError:  # SimpleCrawler funciona só com a biblioteca padrão
+    HTTPAdapter = None
+
+# Conexões por host, hosts com pool próprio e segundos até uma conexão ociosa ser descartada
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_POOL_CONNECTIONS = 100
+DEFAULT_IDLE_TIMEOUT = 30.0
+
+# Falhas de envio em uma conexão reaproveitada que o servidor já fechou
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionError)
+
+
+class ConnectionStats:
+    """Contadores thread-safe de conexões novas e reaproveitadas, por host"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hosts: Dict[str, Dict[str, int]] = {}
+        self.expired = 0
+        self.connects = 0
+        self.connect_time = 0.0
+        self.prewarmed = 0
+    
+    def record(self, host: str, reused: bool):
+        """Registra uma requisição feita em uma conexão nova ou reaproveitada"""
+        with self._lock:
+            counters = self.hosts.setdefault(host, {'new': 0, 'reused': 0})
+            counters['reused' if reused else 'new'] += 1
+    
+    def record_expired(self):
+        """Registra uma conexão descartada por ficar ociosa além do idle_timeout"""
+        with self._lock:
+            self.expired += 1
+    
+    def record_connect(self, elapsed: float):
+        """Registra o tempo de abertura de uma conexão (DNS + TCP + TLS)"""
+        with self._lock:
+            self.connects += 1
+            self.connect_time += elapsed
+    
+    def record_prewarm(self):
+        """Registra uma conexão aberta antes de a requisição precisar dela"""
+        with self._lock:
+            self.prewarmed += 1
+    
+    def get_statistics(self) -> Dict:
+        """Conexões novas, reaproveitadas e taxa de reuso (total e por host)"""
+        with self._lock:
+            new = sum(counters['new'] for counters in self.hosts.values())
+            reused = sum(counters['reused'] for counters in self.hosts.values())
+            return {
+                'new_connections': new,
+                'reused_connections': reused,
+                'reuse_rate': round(reused / (new + reused), 3) if new + reused else 0.0,
+                'expired_idle': self.expired,
+                'prewarmed': self.prewarmed,
+                'connects': self.connects,
+                'avg_connect_ms': round(self.connect_time / self.connects * 1000, 3) if self.connects else 0.0,
+                'hosts': {host: dict(counters) for host, counters in self.hosts.items()}
+            }
+
+
+class _ConnectionMixin:
+    """Conexão do urllib3 que resolve o host pelo DNSCache e mede o tempo de conexão"""
+    
+    stats: ConnectionStats = None
+    dns_cache: Optional[DNSCache] = None
+    
+    def _new_conn(self):
+        """Abre o socket tentando cada endereço do cache (sem DNSCache, resolve como o urllib3)"""
+        if self.dns_cache is None:
+            return super()._new_conn()
+        host = self._dns_host
+        try:
+            addresses = self.dns_cache.addresses(host, self.port)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        
+        error = None
+        try:
+            for address in addresses:
+                # O urllib3 conecta em _dns_host; o TLS continua usando self.host (SNI)
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except URLLib3Error as e:
+                    error = e
+            raise error
+        finally:
+            self._dns_host = host
+    
+    def connect(self):
+        """Conecta medindo o tempo total (DNS, TCP e handshake TLS)"""
+        start = time.perf_counter()
+        super().connect()
+        if self.stats is not None:
+            self.stats.record_connect(time.perf_counter() - start)
+
+
+class _PoolMixin:
+    """Descarta conexões ociosas demais e conta conexões novas/reaproveitadas"""
+    
+    stats: ConnectionStats = None
+    idle_timeout: Optional[float] = None
+    dns_cache: Optional[DNSCache] = None
+    
+    def _new_conn(self):
+        """Conexão nova ligada aos contadores e ao DNSCache do pool"""
+        conn = super()._new_conn()
+        conn.stats = self.stats
+        conn.dns_cache = self.dns_cache
+        return conn
+    
+    def prewarm(self, timeout: Optional[float] = None) -> bool:
+        """Abre uma conexão e a deixa ociosa no pool se o host ainda não tem nenhuma pronta"""
+        if any(conn is not None and conn.sock is not None for conn in list(self.pool.queue)):
+            return False
+        try:
+            conn = super()._get_conn(timeout=0)
+        except URLLib3Error:
+            return False  # pool bloqueante sem conexões livres
+        try:
+            if conn.sock is not None:
+                return False
+            conn.timeout = timeout
+            conn.connect()
+            self.stats.record_prewarm()
+            return True
+        except (OSError, URLLib3Error):
+            conn.close()
+            return False
+        finally:
+            self._put_conn(conn)
+    
+    def _get_conn(self, timeout=None):
+        """Conexão do pool; as ociosas além do idle_timeout são fechadas antes do uso"""
+        conn = super()._get_conn(timeout)
+        last_used = getattr(conn, 'last_used', None)
+        if (self.idle_timeout is not None and conn.sock is not None and last_used is not None and
+                time.monotonic() - last_used > self.idle_timeout):
+            conn.close()
+            self.stats.record_expired()
+        # Conexão sem socket será aberta (TCP + TLS) na requisição
+        self.stats.record(self.host, reused=conn.sock is not None)
+        return conn
+    
+    def _put_conn(self, conn):
+        """Devolve a conexão ao pool marcando o horário do último uso"""
+        if conn is not None:
+            conn.last_used = time.monotonic()
+        super()._put_conn(conn)
+
+
+if HTTPAdapter is not None:
+    class _HTTPConnection(_ConnectionMixin, HTTPConnection):
+        pass
+    
+    class _HTTPSConnection(_ConnectionMixin, HTTPSConnection):
+        pass
+    
+    class _HTTPPool(_PoolMixin, HTTPConnectionPool):
+        ConnectionCls = _HTTPConnection
+    
+    class _HTTPSPool(_PoolMixin, HTTPSConnectionPool):
+        ConnectionCls = _HTTPSConnection
+    
+    class _PoolManager(PoolManager):
+        """PoolManager que cria pools com descarte de ociosas e contadores"""
+        
+        def __init__(self, stats: ConnectionStats, idle_timeout: Optional[float],
+                     dns_cache: Optional[DNSCache] = None, **kwargs):
+            super().__init__(**kwargs)
+            self.stats = stats
+            self.idle_timeout = idle_timeout
+            self.dns_cache = dns_cache
+            self.pool_classes_by_scheme = {'http': _HTTPPool, 'https': _HTTPSPool}
+        
+        def _new_pool(self, scheme, host, port, request_context=None):
+            """Cria o pool do host com os contadores e o idle_timeout do manager"""
+            pool = super()._new_pool(scheme, host, port, request_context)
+            pool.stats = self.stats
+            pool.idle_timeout = self.idle_timeout
+            pool.dns_cache = self.dns_cache
+            return pool
+    
+    class PooledHTTPAdapter(HTTPAdapter):
+        """Adapter do requests com pool por host, limite de hosts e conexões ociosas expiradas
+        
+        pool_connections é quantos hosts mantêm um pool aberto (os menos
+        usados são fechados), pool_maxsize quantas conexões cada host guarda
+        para reuso e, com pool_block=True, o máximo de conexões simultâneas
+        por host (os workers excedentes esperam uma livre). Com dns_cache,
+        as conexões novas resolvem o host pelo cache compartilhado.
+        """
+        
+        def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                     pool_maxsize: int = DEFAULT_POOL_MAXSIZE, pool_block: bool = False,
+                     idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT,
+                     stats: Optional[ConnectionStats] = None, dns_cache: Optional[DNSCache] = None):
+            self.idle_timeout = idle_timeout
+            self.stats = stats or ConnectionStats()
+            self.dns_cache = dns_cache
+            super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                             pool_block=pool_block)
+        
+        def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+            """Usa o PoolManager com contadores e descarte de conexões ociosas"""
+            self._pool_connections = connections
+            self._pool_maxsize = maxsize
+            self._pool_block = block
+            self.poolmanager = _PoolManager(self.stats, self.idle_timeout, self.dns_cache, num_pools=connections,
+                                            maxsize=maxsize, block=block, **pool_kwargs)
+        
+        def prewarm(self, url: str, timeout: Optional[float] = None) -> bool:
+            """Abre antecipadamente uma conexão para o host da URL (sem proxies)"""
+            return self.poolmanager.connection_from_url(url).prewarm(timeout)
+        
+        def __setstate__(self, state):
+            """Recria o adapter a partir do pickle (o requests só restaura alguns atributos)"""
+            self.idle_timeout = state.pop('idle_timeout', DEFAULT_IDLE_TIMEOUT)
+            self.stats = ConnectionStats()
+            self.dns_cache = None
+            super().__setstate__(state)
+
+
+class _PooledResponse(http.client.HTTPResponse):
+    """Resposta que devolve a conexão ao KeepAlivePool quando o corpo é lido até o fim"""
+    
+    release = None
+    
+    def _close_conn(self):
+        """Chamado pelo http.client ao terminar de ler o corpo"""
+        super()._close_conn()
+        release, self.release = self.release, None
+        if release:
+            release(not self.will_close)
+    
+    def close(self):
+        """Fechada antes do fim do corpo, a conexão tem dados pendentes e é descartada"""
+        release, self.release = self.release, None
+        super().close()
+        if release:
+            release(False)
+
+
+class KeepAlivePool:
+    """Conexões http.client ociosas por host, reaproveitadas entre requisições
+    
+    Cada host guarda até max_per_host conexões e o pool todo até max_total
+    (as ociosas há mais tempo são fechadas primeiro). Conexões ociosas há
+    mais de idle_timeout segundos são descartadas em vez de reaproveitadas.
+    """
+    
+    def __init__(self, max_per_host: int = 2, max_total: int = DEFAULT_POOL_MAXSIZE,
+                 idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT,
+                 stats: Optional[ConnectionStats] = None):
+        self.max_per_host = max_per_host
+        self.max_total = max_total
+        self.idle_timeout = idle_timeout
+        self.stats = stats or ConnectionStats()
+        
+        self._lock = threading.Lock()
+        self._idle: 'OrderedDict[object, tuple]' = OrderedDict()  # conexão -> (host, devolvida em)
+    
+    def acquire(self, host: str, factory):
+        """Conexão ociosa do host ou uma nova criada por factory(); retorna (conexão, reaproveitada)"""
+        now = time.monotonic()
+        expired = []
+        conn = None
+        with self._lock:
+            for candidate, (candidate_host, released_at) in list(self._idle.items()):
+                if self.idle_timeout is not None and now - released_at > self.idle_timeout:
+                    del self._idle[candidate]
+                    expired.append(candidate)
+                elif conn is None and candidate_host == host:
+                    del self._idle[candidate]
+                    conn = candidate
+        for candidate in expired:
+            candidate.close()
+            self.stats.record_expired()
+        
+        self.stats.record(host, reused=conn is not None)
+        return (conn, True) if conn is not None else (factory(), False)
+    
+    def release(self, host: str, conn, reusable: bool = True):
+        """Devolve a conexão ao pool (ou a fecha se não puder ser reaproveitada)"""
+        if not reusable:
+            conn.close()
+            return
+        evicted = []
+        with self._lock:
+            same_host = [candidate for candidate, (candidate_host, _) in self._idle.items() if candidate_host == host]
+            if len(same_host) >= self.max_per_host:
+                evicted.append(same_host[0])
+                del self._idle[same_host[0]]
+            self._idle[conn] = (host, time.monotonic())
+            while len(self._idle) > self.max_total:
+                evicted.append(self._idle.popitem(last=False)[0])
+        for candidate in evicted:
+            candidate.close()
+    
+    def close(self):
+        """Fecha todas as conexões ociosas"""
+        with self._lock:
+            idle, self._idle = list(self._idle), OrderedDict()
+        for conn in idle:
+            conn.close()
+    
+    def __len__(self) -> int:
+        return len(self._idle)
+    
+    def get_statistics(self) -> Dict:
+        """Contadores de conexões e quantas estão ociosas no pool"""
+        return dict(self.stats.get_statistics(), idle=len(self))
+
+
+class KeepAliveHandler(urllib.request.HTTPHandler, urllib.request.HTTPSHandler):
+    """Handler do urllib que reaproveita conexões pelo KeepAlivePool
+    
+    Usado com urllib.request.build_opener, mantém redirecionamentos,
+    HTTPError e demais handlers do urllib. Uma conexão reaproveitada que o
+    servidor já fechou é trocada por uma nova e a requisição é repetida.
+    Com dns_cache, as conexões novas resolvem o host pelo cache.
+    """
+    
+    def __init__(self, pool: Optional[KeepAlivePool] = None, context=None,
+                 dns_cache: Optional[DNSCache] = None):
+        urllib.request.HTTPHandler.__init__(self)
+        urllib.request.HTTPSHandler.__init__(self, context=context)
+        self.pool = pool if pool is not None else KeepAlivePool()
+        self.dns_cache = dns_cache
+    
+    def http_open(self, req):
+        """Abre a requisição http:// em uma conexão do pool"""
+        return self._open(req, http.client.HTTPConnection, {})
+    
+    def https_open(self, req):
+        """Abre a requisição https:// em uma conexão do pool (TLS feito uma vez por conexão)"""
+        return self._open(req, http.client.HTTPSConnection, {'context': self._context})
+    
+    def _open(self, req, connection_class, connection_kwargs):
+        """Envia a requisição e liga a resposta à devolução da conexão"""
+        host = req.host
+        if not host:
+            raise urllib.error.URLError('no host given')
+        
+        headers = dict(req.unredirected_hdrs)
+        headers.update({name: value for name, value in req.headers.items() if name not in headers})
+        headers['Connection'] = 'keep-alive'
+        headers = {name.title(): value for name, value in headers.items()}
+        
+        # https via proxy (ProxyHandler): a conexão vai ao proxy e abre um túnel CONNECT
+        tunnel_host = req._tunnel_host
+        tunnel_headers = {}
+        if tunnel_host and 'Proxy-Authorization' in headers:
+            tunnel_headers['Proxy-Authorization'] = headers.pop('Proxy-Authorization')
+        key = f"{req.type}://{tunnel_host}@{host}" if tunnel_host else f"{req.type}://{host}"
+        
+        def factory():
+            conn = connection_class(host, timeout=req.timeout, **connection_kwargs)
+            if tunnel_host:
+                conn.set_tunnel(tunnel_host, headers=tunnel_headers)
+            if self.dns_cache is not None:
+                conn._create_connection = self.dns_cache.create_connection
+            return conn
+        
+        conn, reused = self.pool.acquire(key, factory)
+        try:
+            try:
+                response = self._send(conn, req, headers)
+            except _STALE_ERRORS:
+                if not reused:
+                    raise
+                # O servidor fechou a conexão ociosa: repete em uma conexão nova
+                conn.close()
+                conn = factory()
+                self.pool.stats.record(key, reused=False)
+                response = self._send(conn, req, headers)
+        except OSError as e:
+            conn.close()
+            raise urllib.error.URLError(e)
+        except Exception:
+            conn.close()
+            raise
+        
+        response.release = lambda reusable: self.pool.release(key, conn, reusable)
+        response.url = req.get_full_url()
+        response.msg = response.reason
+        return response
+    
+    @staticmethod
+    def _send(conn, req, headers):
+        """Faz a requisição na conexão e lê o cabeçalho da resposta"""
+        conn.timeout = req.timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(req.timeout)
+        conn.response_class = _PooledResponse
+        conn.request(req.get_method(), req.selector, req.data, headers,
+                     encode_chunked=req.has_header('Transfer-encoding'))
+        return conn.getresponse()
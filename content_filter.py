@@ -0,0 +1,328 @@
+"""
+Filtros de conteúdo compilados
+Compila uma vez por job as listas de palavras-chave (em um autômato
+Aho-Corasick, ou em uma expressão regular em forma de trie quando o pacote
+pyahocorasick não está instalado, ambos encontrando qualquer palavra em uma
+única passada pelo texto) e a expressão regular do filtro, e informa qual
+regra aceitou ou rejeitou cada página. O pré-filtro opcional descarta
+páginas pelo HTML bruto ou só pelo <head>, antes do parse
+"""
+
+import html
+import json
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick é opcional: sem ele a busca usa a trie em regex
+    ahocorasick = None
+
+# Regras na ordem em que são avaliadas (da mais barata para a mais cara)
+FILTER_RULES = ('min_length', 'keywords', 'regex', 'exclude_keywords')
+
+# 'raw': palavras-chave obrigatórias no texto visível do HTML bruto (nunca descarta
+#        uma página que o filtro completo aceitaria)
+# 'head': todas as regras, exceto min_length, sobre <title> e meta description
+PREFILTER_MODES = ('raw', 'head')
+
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title\s*>', re.I | re.S)
+_META_RE = re.compile(r'<meta\b[^>]*>', re.I)
+_ATTR_RE = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+_HEAD_END_RE = re.compile(r'</head\s*>|<body[\s>]', re.I)
+
+# Trechos fora do get_text() da página (comentários, scripts, estilos, template, ruby) e marcações
+_HIDDEN_RE = re.compile(r'<!--.*?-->|<(script|style|template|rt|rp)\b[^>]*>(.*?)</\1\s*>', re.I | re.S)
+# Conteúdo de texto bruto, sem entidades nem tags (as demais são HTML normal)
+_RAW_TEXT_TAGS = ('script', 'style')
+_TAG_RE = re.compile(r'</?[a-zA-Z][^>]*>|<[!?][^>]*>')
+
+
+def extract_head(html_text: str):
+    """(título, descrição) do <head> usando apenas expressões regulares, sem montar a DOM"""
+    match = _HEAD_END_RE.search(html_text)
+    head = html_text[:match.start()] if match else html_text
+    
+    title_match = _TITLE_RE.search(head)
+    title = html.unescape(title_match.group(1)).strip() if title_match else ''
+    
+    description = ''
+    for tag in _META_RE.findall(head):
+        attrs = {name.lower(): next((value for value in values if value), '')
+                 for name, *values in _ATTR_RE.findall(tag)}
+        if attrs.get('name', '').lower() == 'description':
+            description = html.unescape(attrs.get('content', '')).strip()
+            break
+    return title, description
+
+
+def visible_text(html_text: str) -> str:
+    """Texto visível do HTML sem montar a DOM, como get_text(strip=True) da página inteira
+    
+    Cada trecho entre tags é decodificado e aparado e os trechos são unidos
+    sem separador, então o texto de qualquer elemento extraído aparece aqui
+    como um pedaço contínuo. O content das metatags e o texto de script,
+    style, template e ruby (que get_text() da página omite, mas um seletor
+    que aponte para esses elementos extrai) vêm depois, separados.
+    """
+    hidden = []
+    
+    def hide(match):
+        tag, inner = match.group(1), match.group(2)
+        if tag is not None:
+            if tag.lower() in _RAW_TEXT_TAGS:
+                hidden.append(inner.strip())
+            else:
+                hidden.append(''.join(html.unescape(part).strip() for part in _TAG_RE.split(inner)))
+        return '<>'
+    
+    text = _HIDDEN_RE.sub(hide, html_text)
+    parts = [html.unescape(part).strip() for part in _TAG_RE.split(text.replace('<>', '<x>'))]
+    
+    metas = hidden
+    for tag in _META_RE.findall(html_text):
+        for name, *values in _ATTR_RE.findall(tag):
+            if name.lower() == 'content':
+                metas.append(html.unescape(next((value for value in values if value), '')))
+    return '\x00'.join([''.join(parts)] + metas)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Expressão regular equivalente a 'w1|w2|...', com prefixos comuns fatorados
+    
+    ['spam', 'spammer', 'sale'] vira 's(?:a(?:le)|pam(?:mer)?)': o motor do re
+    testa cada posição do texto contra a trie em vez de contra cada palavra.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = None  # fim de palavra
+    
+    def build(node: Dict) -> str:
+        is_end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if is_end:
+            # Guloso: tenta a palavra mais longa e volta para a mais curta
+            pattern = ('(?:' + pattern + ')?') if len(branches) == 1 else pattern + '?'
+        return pattern
+    
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Busca de várias palavras-chave (sem diferenciar maiúsculas) em uma passada"""
+    
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({keyword.lower() for keyword in keywords if keyword is not None})
+        # '' está contida em qualquer texto, como em "'' in texto"
+        self._matches_all = '' in self.keywords
+        words = [keyword for keyword in self.keywords if keyword]
+        
+        self._automaton = None
+        self._regex = None
+        if words and ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for word in words:
+                self._automaton.add_word(word, word)
+            self._automaton.make_automaton()
+        elif words:
+            self._regex = re.compile(_trie_pattern(words))
+    
+    @property
+    def backend(self) -> str:
+        """Algoritmo usado na busca ('aho-corasick' ou 'trie-regex')"""
+        return 'aho-corasick' if ahocorasick is not None else 'trie-regex'
+    
+    def search(self, text_lower: str) -> Optional[str]:
+        """Primeira palavra-chave encontrada no texto já em minúsculas (ou None)"""
+        if self._automaton is not None:
+            for _, word in self._automaton.iter(text_lower):
+                return word
+        elif self._regex is not None:
+            match = self._regex.search(text_lower)
+            if match:
+                return match.group()
+        return '' if self._matches_all else None
+    
+    def find_all(self, text_lower: str) -> List[str]:
+        """Palavras-chave encontradas no texto, sem repetição, na ordem em que aparecem
+        
+        Com a trie em regex as ocorrências sobrepostas a outra já encontrada não
+        são reportadas ('spammer' não reporta também 'spam').
+        """
+        if self._automaton is not None:
+            return list(dict.fromkeys(word for _, word in self._automaton.iter(text_lower)))
+        if self._regex is not None:
+            return list(dict.fromkeys(match.group() for match in self._regex.finditer(text_lower)))
+        return []
+    
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+
+class FilterDecision:
+    """Resultado de um filtro: aceito ou não e a regra (e o trecho) que decidiu"""
+    
+    __slots__ = ('accepted', 'rule', 'match')
+    
+    def __init__(self, accepted: bool, rule: Optional[str] = None, match: Optional[str] = None):
+        self.accepted = accepted
+        self.rule = rule
+        self.match = match
+    
+    def __bool__(self) -> bool:
+        return self.accepted
+    
+    def __repr__(self):
+        return f"FilterDecision(accepted={self.accepted}, rule={self.rule!r}, match={self.match!r})"
+
+
+class ContentFilter:
+    """Filtros de conteúdo de um job compilados uma única vez
+    
+    Aceita o mesmo dicionário de filter_content (keywords, exclude_keywords,
+    min_length, regex). Expressões regulares inválidas geram ValueError na
+    compilação, não a cada página.
+    """
+    
+    def __init__(self, filters: Optional[Dict] = None):
+        filters = filters or {}
+        self.filters = dict(filters)
+        self.min_length = filters.get('min_length') or 0
+        self.keywords = KeywordMatcher(filters.get('keywords') or [])
+        self.exclude_keywords = KeywordMatcher(filters.get('exclude_keywords') or [])
+        
+        pattern = filters.get('regex')
+        try:
+            self.regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+        except re.error as e:
+            raise ValueError(f"Expressão regular inválida no filtro: {pattern!r} ({e})") from e
+        
+        self.prefilter = filters.get('prefilter') or None
+        if self.prefilter is not None and self.prefilter not in PREFILTER_MODES:
+            raise ValueError(f"Modo de pré-filtro inválido: {self.prefilter} (use {', '.join(PREFILTER_MODES)})")
+        
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.rejected = {rule: 0 for rule in FILTER_RULES}
+        
+        self.prechecked = 0
+        self.prerejected = {rule: 0 for rule in FILTER_RULES}
+        self.prefilter_time = 0.0
+        self.parse_time_saved = 0.0
+    
+    @staticmethod
+    def key(filters: Optional[Dict]) -> str:
+        """Chave estável de um dicionário de filtros (para cache de filtros compilados)"""
+        return json.dumps(filters or {}, sort_keys=True, default=str)
+    
+    def check(self, content: str) -> FilterDecision:
+        """Avalia o texto e retorna a decisão com a regra responsável"""
+        decision = self._evaluate(content)
+        self.record_check(decision)
+        return decision
+    
+    def record_check(self, decision: FilterDecision):
+        """Contabiliza uma decisão de check (também as tomadas em um processo de parse)"""
+        with self._lock:
+            self.checked += 1
+            if not decision.accepted:
+                self.rejected[decision.rule] += 1
+    
+    def precheck(self, html_text: str) -> FilterDecision:
+        """Pré-filtro sobre o HTML decodificado, antes do parse (aceita tudo sem prefilter)"""
+        if self.prefilter is None:
+            return FilterDecision(True)
+        
+        start = time.perf_counter()
+        if self.prefilter == 'raw':
+            decision = FilterDecision(True)
+            if self.keywords:
+                decision = self._precheck_text(visible_text(html_text).lower())
+        else:
+            title, description = extract_head(html_text)
+            decision = self._evaluate(f"{title} {description}", check_length=False)
+        self.record_precheck(decision, time.perf_counter() - start)
+        return decision
+    
+    def _precheck_text(self, text_lower: str) -> FilterDecision:
+        """Pré-filtro 'raw': só rejeita quando nenhuma palavra-chave pode estar no texto extraído
+        
+        O filtro completo junta título, descrição e conteúdo com espaços, então
+        uma palavra-chave com espaços pode atravessar dois campos; para ela
+        basta que cada parte sem espaços apareça no texto visível.
+        """
+        matched = self.keywords.search(text_lower)
+        if matched is not None:
+            return FilterDecision(True, 'keywords', matched)
+        for keyword in self.keywords.keywords:
+            parts = keyword.split()
+            if len(parts) > 1 and all(part in text_lower for part in parts):
+                return FilterDecision(True, 'keywords', keyword)
+        return FilterDecision(False, 'keywords')
+    
+    def record_precheck(self, decision: FilterDecision, elapsed: float):
+        """Contabiliza uma decisão do pré-filtro e o tempo gasto nela"""
+        with self._lock:
+            self.prechecked += 1
+            self.prefilter_time += elapsed
+            if not decision.accepted:
+                self.prerejected[decision.rule] += 1
+    
+    def record_saved(self, seconds: float):
+        """Soma o tempo de parse e extração poupado por uma página descartada no pré-filtro"""
+        with self._lock:
+            self.parse_time_saved += seconds
+    
+    def _evaluate(self, content: str, check_length: bool = True) -> FilterDecision:
+        """Aplica as regras na ordem de FILTER_RULES"""
+        if check_length and len(content) < self.min_length:
+            return FilterDecision(False, 'min_length', str(len(content)))
+        
+        # O texto é convertido para minúsculas uma única vez para as duas listas
+        content_lower = content.lower() if self.keywords or self.exclude_keywords else None
+        
+        matched = None
+        if self.keywords:
+            matched = self.keywords.search(content_lower)
+            if matched is None:
+                return FilterDecision(False, 'keywords')
+        
+        if self.regex is not None:
+            match = self.regex.search(content)
+            if not match:
+                return FilterDecision(False, 'regex')
+            matched = matched if matched is not None else match.group()
+        
+        if self.exclude_keywords:
+            excluded = self.exclude_keywords.search(content_lower)
+            if excluded is not None:
+                return FilterDecision(False, 'exclude_keywords', excluded)
+        
+        return FilterDecision(True, 'keywords' if self.keywords else ('regex' if self.regex else None), matched)
+    
+    def get_statistics(self) -> Dict:
+        """Páginas avaliadas e rejeições por regra"""
+        with self._lock:
+            return {
+                'checked': self.checked,
+                'accepted': self.checked - sum(self.rejected.values()),
+                'rejected': dict(self.rejected),
+                'keywords': len(self.keywords),
+                'exclude_keywords': len(self.exclude_keywords),
+                'matcher': self.keywords.backend,
+                'prefilter': {
+                    'mode': self.prefilter,
+                    'checked': self.prechecked,
+                    'rejected': dict(self.prerejected),
+                    'time': round(self.prefilter_time, 4),
+                    'parse_time_saved': round(self.parse_time_saved, 4)
+                }
+            }
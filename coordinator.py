@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Coordenador de crawling distribuído
+Um serviço TCP pequeno (uma mensagem JSON por linha) que mantém a
+fronteira global, entrega lotes de URLs aos workers (WebCrawler.run_worker)
+em vários nós, deduplica as URLs pelos fingerprints canônicos e recebe os
+resultados. A fronteira é dividida em partições pelo hash do host, e cada
+partição fica com um único worker por vez, então o delay por host continua
+valendo no cluster inteiro
+
+Uso:
+    python coordinator.py serve https://exemplo.com --port 8765 --max-depth 2
+    python coordinator.py worker 127.0.0.1:8765 --threads 4
+"""
+
+import argparse
+import json
+import math
+import socket
+import socketserver
+import threading
+import time
+import urllib.parse
+import uuid
+import zlib
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from frontier import CrawlScope, resolve_link
+from result_store import ResultStore
+from url_utils import VisitedURLSet
+
+DEFAULT_PORT = 8765
+DEFAULT_PARTITIONS = 64
+
+
+def host_partition(url: str, partitions: int) -> int:
+    """Partição da URL pelo hash estável do host (o mesmo em todos os processos)"""
+    host = (urllib.parse.urlsplit(url).hostname or '').lower()
+    return zlib.crc32(host.encode('utf-8')) % partitions
+
+
+class _Partition:
+    """URLs pendentes de um grupo de hosts e o worker que está com elas"""
+    
+    __slots__ = ('queue', 'owner', 'in_flight', 'free_at')
+    
+    def __init__(self):
+        self.queue = deque()
+        self.owner: Optional[str] = None
+        self.in_flight = 0
+        self.free_at = 0.0
+
+
+class Coordinator:
+    """Fronteira global particionada por host, com lotes arrendados aos workers
+    
+    Um lote (lease) só tem URLs de partições que estão com o worker que o
+    pediu. Outro worker só assume a partição quando não há URLs dela em
+    andamento e handoff_delay segundos depois da última terminar, para que
+    dois nós não acessem o mesmo host antes do delay de cortesia. Lotes não
+    concluídos em lease_timeout segundos (worker que caiu) voltam para a
+    fila. O resultado de cada página chega como o dicionário de
+    CrawlResult.to_dict.
+    """
+    
+    def __init__(self, seeds: Iterable[str], max_depth: int = 2, scope='same_domain',
+                 job: Optional[Dict] = None, partitions: int = DEFAULT_PARTITIONS,
+                 lease_timeout: float = 300.0, handoff_delay: float = 1.0,
+                 max_pages: Optional[int] = None, min_workers: int = 1,
+                 tracking_params: Optional[List[str]] = None, sink=None):
+        seeds = list(seeds)
+        self.scope = CrawlScope(seeds, scope)
+        self.max_depth = max_depth
+        self.job = dict(job or {})
+        self.lease_timeout = lease_timeout
+        self.handoff_delay = handoff_delay
+        self.max_pages = max_pages
+        self.min_workers = min_workers  # lotes só saem depois que esse número de workers se registrou
+        self.sink = sink  # exportador incremental (ver exporters.py) que recebe cada resultado
+        
+        self._lock = threading.Lock()
+        self._partitions = [_Partition() for _ in range(partitions)]
+        self._leases: Dict[str, Dict] = {}
+        self.seen = VisitedURLSet(tracking_params)
+        self.results = ResultStore()
+        
+        self.workers: Dict[str, Dict] = {}
+        self.dispatched = 0
+        self.completed = 0
+        self.failed = 0  # páginas sem resultado (erro, robots.txt ou filtros)
+        self.expired = 0
+        
+        for seed in seeds:
+            self.push(seed, 0)
+    
+    def push(self, url: str, depth: int) -> bool:
+        """Enfileira a URL na partição do host; False se já vista, fora do escopo ou funda demais"""
+        with self._lock:
+            return self._push(url, depth)
+    
+    def _push(self, url: str, depth: int, front: bool = False) -> bool:
+        """push sem o lock (chamar com o lock); front=True devolve ao início da fila"""
+        if depth > self.max_depth or url in self.seen:
+            return False
+        if depth > 0 and not self.scope.allows(url):
+            return False
+        self.seen.add(url)
+        self._partitions[host_partition(url, len(self._partitions))].queue.append((url, depth))
+        return True
+    
+    def register(self, name: Optional[str] = None) -> Dict:
+        """Registra um worker e devolve o id dele e os parâmetros do job"""
+        worker_id = f"{name or 'worker'}-{uuid.uuid4().hex[:6]}"
+        with self._lock:
+            self.workers[worker_id] = {'leases': 0, 'pages': 0, 'results': 0, 'last_seen': time.time()}
+        return {'worker': worker_id, 'job': self.job}
+    
+    def lease(self, worker_id: str, max_urls: int = 20) -> Dict:
+        """Entrega um lote de URLs das partições do worker (ou livres)
+        
+        Retorna {'lease', 'urls'}, {'urls': [], 'wait': s} quando só há URLs
+        em partições de outros workers ou em andamento, ou {'urls': [],
+        'done': True} quando o crawling acabou.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._touch(worker_id)
+            self._expire_leases(now)
+            
+            budget = max_urls
+            if self.max_pages is not None:
+                budget = min(budget, self.max_pages - self.dispatched)
+            if len(self.workers) < self.min_workers:
+                budget = 0
+            
+            batch = []
+            if budget > 0:
+                for partition in self._claim(worker_id, now):
+                    if len(batch) >= budget:
+                        break
+                    partition.owner = worker_id
+                    while partition.queue and len(batch) < budget:
+                        url, depth = partition.queue.popleft()
+                        batch.append((url, depth, partition))
+                        partition.in_flight += 1
+            
+            if not batch:
+                if self._finished():
+                    self.workers[worker_id]['done'] = True  # worker já sabe que pode encerrar
+                    return {'urls': [], 'done': True}
+                return {'urls': [], 'wait': 0.2}
+            
+            lease_id = uuid.uuid4().hex[:12]
+            self._leases[lease_id] = {'worker': worker_id, 'urls': batch, 'deadline': now + self.lease_timeout}
+            self.dispatched += len(batch)
+            self.workers[worker_id]['leases'] += 1
+            return {'lease': lease_id, 'urls': [[url, depth] for url, depth, _ in batch]}
+    
+    def _claim(self, worker_id: str, now: float) -> List[_Partition]:
+        """Partições de onde o worker pode tirar URLs agora (chamar com o lock)
+        
+        Cada worker fica com até a sua parte das partições com trabalho;
+        partições ociosas além dessa parte são devolvidas para os outros
+        workers (que ainda esperam o handoff_delay).
+        """
+        active = [p for p in self._partitions if p.queue or p.in_flight]
+        cutoff = time.time() - self.lease_timeout
+        workers = sum(1 for worker in self.workers.values() if worker['last_seen'] >= cutoff)
+        share = max(1, math.ceil(len(active) / max(1, workers)))
+        
+        owned = []
+        for partition in self._partitions:
+            if partition.owner != worker_id:
+                continue
+            if partition.in_flight == 0 and (not partition.queue or len(owned) >= share):
+                partition.owner = None
+            else:
+                owned.append(partition)
+        
+        claimed = [p for p in owned if p.queue]
+        for partition in active:
+            if len(owned) >= share:
+                break
+            if partition not in owned and partition.queue and partition.in_flight == 0 \
+                    and now >= partition.free_at:
+                owned.append(partition)
+                claimed.append(partition)
+        return claimed
+    
+    def complete(self, worker_id: str, lease_id: str, pages: List[Dict]) -> Dict:
+        """Recebe o resultado de um lote: resultados (ou null) e links a seguir por URL"""
+        now = time.monotonic()
+        with self._lock:
+            self._touch(worker_id)
+            lease = self._leases.get(lease_id)
+            if lease is None:
+                # Lote expirado e redistribuído: o trabalho já está com outro worker
+                return {'ok': False, 'error': 'lease expirado'}
+            if lease['worker'] != worker_id:
+                return {'ok': False, 'error': 'lease pertence a outro worker'}
+            del self._leases[lease_id]
+            
+            outcome = {page['url']: page for page in pages}
+            stored = []
+            for url, depth, partition in lease['urls']:
+                self._release(partition, now)
+                page = outcome.get(url)
+                result = page.get('result') if page else None
+                if result is None:
+                    self.failed += 1
+                    continue
+                self.completed += 1
+                self.results.append(result)
+                stored.append(result)
+                # Links relativos são resolvidos contra a URL final (redirecionamentos, <base href>)
+                base = result.get('base_url') or url
+                for href in page.get('links') or ():
+                    link = resolve_link(base, href)
+                    if link:
+                        self._push(link, depth + 1)
+            
+            worker = self.workers[worker_id]
+            worker['pages'] += len(lease['urls'])
+            worker['results'] += len(stored)
+        
+        if self.sink:
+            for result in stored:
+                self.sink.write(result)
+        return {'ok': True}
+    
+    def _release(self, partition: _Partition, now: float):
+        """Uma URL da partição terminou; sem URLs em andamento começa o intervalo de troca de dono"""
+        partition.in_flight -= 1
+        if partition.in_flight == 0:
+            partition.free_at = now + self.handoff_delay
+    
+    def _expire_leases(self, now: float):
+        """Devolve à fila as URLs de lotes vencidos (chamar com o lock)"""
+        for lease_id, lease in list(self._leases.items()):
+            if lease['deadline'] > now:
+                continue
+            del self._leases[lease_id]
+            self.expired += 1
+            self.dispatched -= len(lease['urls'])
+            for url, depth, partition in reversed(lease['urls']):
+                partition.queue.appendleft((url, depth))
+                partition.in_flight -= 1
+                if partition.owner == lease['worker']:
+                    partition.owner = None
+                    partition.free_at = now
+    
+    def _finished(self) -> bool:
+        """Sem lotes em andamento e sem URLs pendentes (ou orçamento de páginas esgotado)"""
+        if self._leases:
+            return False
+        if self.max_pages is not None and self.dispatched >= self.max_pages:
+            return True
+        return not any(partition.queue for partition in self._partitions)
+    
+    def _touch(self, worker_id: str):
+        """Atualiza o último contato do worker (registrando-o se for desconhecido)"""
+        worker = self.workers.setdefault(worker_id, {'leases': 0, 'pages': 0, 'results': 0})
+        worker['last_seen'] = time.time()
+    
+    def is_done(self) -> bool:
+        """Indica se o crawling distribuído terminou"""
+        with self._lock:
+            return self._finished()
+    
+    def all_workers_notified(self) -> bool:
+        """Indica se todos os workers registrados já receberam a resposta 'done'"""
+        with self._lock:
+            return all(worker.get('done') for worker in self.workers.values())
+    
+    def handle(self, message: Dict) -> Dict:
+        """Executa uma mensagem do protocolo ({'op': ...}) e retorna a resposta"""
+        op = message.get('op')
+        if op == 'register':
+            return self.register(message.get('name'))
+        if op == 'lease':
+            return self.lease(message['worker'], int(message.get('max_urls', 20)))
+        if op == 'complete':
+            return self.complete(message['worker'], message['lease'], message.get('pages', []))
+        if op == 'stats':
+            return self.get_statistics()
+        raise ValueError(f"Operação desconhecida: {op}")
+    
+    def get_statistics(self) -> Dict:
+        """Fronteira, lotes em andamento, resultados e atividade de cada worker"""
+        with self._lock:
+            return {
+                'pending': sum(len(partition.queue) for partition in self._partitions),
+                'in_flight': sum(partition.in_flight for partition in self._partitions),
+                'seen': len(self.seen),
+                'dispatched': self.dispatched,
+                'completed': self.completed,
+                'failed': self.failed,
+                'expired_leases': self.expired,
+                'results': len(self.results),
+                'partitions_owned': sum(1 for partition in self._partitions if partition.owner),
+                'workers': {worker_id: dict(worker) for worker_id, worker in self.workers.items()},
+                'done': self._finished()
+            }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Uma conexão de worker: lê mensagens JSON por linha e responde na mesma ordem"""
+    
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.coordinator.handle(json.loads(line))
+            except Exception as e:
+                response = {'error': f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+class CoordinatorServer(socketserver.ThreadingTCPServer):
+    """Servidor TCP do coordenador (uma thread por worker conectado)"""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, coordinator: Coordinator, host: str = '127.0.0.1', port: int = DEFAULT_PORT):
+        super().__init__((host, port), _Handler)
+        self.coordinator = coordinator
+        self._thread = None
+    
+    @property
+    def address(self) -> str:
+        """Endereço host:porta para os workers"""
+        host, port = self.server_address[:2]
+        return f"{host}:{port}"
+    
+    def start(self) -> str:
+        """Atende em uma thread de fundo e retorna o endereço"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self.address
+    
+    def stop(self):
+        """Para de atender e fecha o socket"""
+        self.shutdown()
+        self.server_close()
+
+
+def parse_address(address) -> Tuple[str, int]:
+    """Converte 'host:porta' (ou uma tupla) no endereço do socket"""
+    if isinstance(address, tuple):
+        return address
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+class CoordinatorClient:
+    """Conexão de um worker com o coordenador"""
+    
+    def __init__(self, address, timeout: float = 30.0):
+        self.address = parse_address(address)
+        self._socket = socket.create_connection(self.address, timeout=timeout)
+        self._file = self._socket.makefile('rwb')
+        self.worker_id = None
+        self.job: Dict = {}
+    
+    def request(self, op: str, **fields) -> Dict:
+        """Envia uma mensagem e espera a resposta (RuntimeError se o coordenador recusar)"""
+        self._file.write(json.dumps(dict(fields, op=op), ensure_ascii=False).encode('utf-8') + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Coordenador fechou a conexão")
+        response = json.loads(line)
+        if 'error' in response and op != 'complete':
+            raise RuntimeError(f"Coordenador: {response['error']}")
+        return response
+    
+    def register(self, name: Optional[str] = None) -> str:
+        """Registra o worker e guarda os parâmetros do job"""
+        response = self.request('register', name=name or socket.gethostname())
+        self.worker_id = response['worker']
+        self.job = response.get('job') or {}
+        return self.worker_id
+    
+    def lease(self, max_urls: int = 20) -> Dict:
+        """Pede um lote de URLs"""
+        return self.request('lease', worker=self.worker_id, max_urls=max_urls)
+    
+    def complete(self, lease_id: str, pages: List[Dict]) -> Dict:
+        """Entrega os resultados de um lote"""
+        return self.request('complete', worker=self.worker_id, lease=lease_id, pages=pages)
+    
+    def statistics(self) -> Dict:
+        """Estatísticas do coordenador"""
+        return self.request('stats')
+    
+    def close(self):
+        """Fecha a conexão"""
+        self._file.close()
+        self._socket.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    """Linha de comando: serve (coordenador) ou worker"""
+    parser = argparse.ArgumentParser(description="Crawling distribuído com coordenador TCP")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    serve = commands.add_parser('serve', help="inicia o coordenador")
+    serve.add_argument('seeds', nargs='+')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve.add_argument('--max-depth', type=int, default=2)
+    serve.add_argument('--scope', default='same_domain')
+    serve.add_argument('--max-pages', type=int)
+    serve.add_argument('--handoff-delay', type=float, default=1.0)
+    serve.add_argument('--min-workers', type=int, default=1)
+    serve.add_argument('--output', default='resultados_distribuidos.jsonl')
+    serve.add_argument('--shutdown-grace', type=float, default=30.0,
+                       help="segundos servindo 'done' até todos os workers serem avisados")
+    
+    worker = commands.add_parser('worker', help="executa um worker WebCrawler")
+    worker.add_argument('address')
+    worker.add_argument('--threads', type=int, default=4)
+    worker.add_argument('--batch-size', type=int, default=20)
+    worker.add_argument('--delay', type=float, default=1.0)
+    
+    args = parser.parse_args()
+    
+    if args.command == 'serve':
+        from exporters import JSONLSink
+        
+        with JSONLSink(args.output, row=dict) as sink:
+            coordinator = Coordinator(args.seeds, args.max_depth, args.scope, max_pages=args.max_pages,
+                                      handoff_delay=args.handoff_delay, min_workers=args.min_workers,
+                                      sink=sink)
+            server = CoordinatorServer(coordinator, args.host, args.port)
+            print(f"🛰️ Coordenador em {server.start()} (resultados em {args.output})")
+            try:
+                while not coordinator.is_done():
+                    time.sleep(1)
+                # Continua respondendo 'done' para os workers que ainda não perguntaram
+                deadline = time.monotonic() + args.shutdown_grace
+                while not coordinator.all_workers_notified() and time.monotonic() < deadline:
+                    time.sleep(0.2)
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.stop()
+            stats = coordinator.get_statistics()
+            print(f"✓ {stats['completed']} páginas, {stats['failed']} sem resultado, {len(stats['workers'])} workers")
+    else:
+        from web_crawler import WebCrawler
+        
+        crawler = WebCrawler()
+        crawler.setup_session(delay=args.delay)
+        pages = crawler.run_worker(args.address, batch_size=args.batch_size, max_workers=args.threads)
+        print(f"✓ Worker concluído: {pages} páginas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Estado persistente de crawling em SQLite
+Guarda a fronteira pendente, os fingerprints visitados e os resultados
+concluídos de um job, permitindo retomar um crawling interrompido
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from url_utils import url_fingerprint
+
+
+def _to_signed(fingerprint: int) -> int:
+    """Converte um fingerprint sem sinal de 64 bits para o INTEGER do SQLite"""
+    return fingerprint - (1 << 64) if fingerprint >= (1 << 63) else fingerprint
+
+
+def _to_unsigned(value: int) -> int:
+    """Converte o INTEGER do SQLite de volta para fingerprint sem sinal"""
+    return value + (1 << 64) if value < 0 else value
+
+
+class CrawlState:
+    """Checkpoint de um job de crawling em SQLite com escritas em lote
+    
+    As operações ficam em um buffer e são gravadas em uma única transação
+    quando o buffer atinge batch_size ou depois de flush_interval segundos,
+    sempre na ordem em que foram registradas.
+    """
+    
+    def __init__(self, db_path: str = 'crawl_state.db', job_id: Optional[str] = None,
+                 batch_size: int = 100, flush_interval: float = 2.0,
+                 tracking_params: Optional[List[str]] = None):
+        self.db_path = db_path
+        self.job_id = job_id or uuid.uuid4().hex[:12]
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.tracking_params = tracking_params
+        
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_tables()
+        
+        self._lock = threading.Lock()
+        self._buffer: List[Tuple[str, tuple]] = []
+        self._last_flush = time.monotonic()
+    
+    def _create_tables(self):
+        """Cria as tabelas do checkpoint se ainda não existirem"""
+        with self._conn:
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    mode TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS frontier (
+                    job_id TEXT NOT NULL,
+                    fingerprint INTEGER NOT NULL,
+                    url TEXT NOT NULL,
+                    depth INTEGER NOT NULL,
+                    seq INTEGER NOT NULL,
+                    PRIMARY KEY (job_id, fingerprint)
+                );
+                CREATE TABLE IF NOT EXISTS visited (
+                    job_id TEXT NOT NULL,
+                    fingerprint INTEGER NOT NULL,
+                    PRIMARY KEY (job_id, fingerprint)
+                );
+                CREATE TABLE IF NOT EXISTS results (
+                    job_id TEXT NOT NULL,
+                    fingerprint INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (job_id, fingerprint)
+                );
+            ''')
+    
+    def _fingerprint(self, url: str) -> int:
+        """Fingerprint canônico da URL no formato gravado no banco"""
+        return _to_signed(url_fingerprint(url, self.tracking_params))
+    
+    def start_job(self, mode: str, params: Dict, pending: List[Tuple[str, int]]):
+        """Registra um novo job com seus parâmetros e a fronteira inicial"""
+        try:
+            params_json = json.dumps(params, ensure_ascii=False)
+        except TypeError as e:
+            raise ValueError(f"Parâmetros do job não podem ser salvos no checkpoint (JSON): {e}") from e
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?)',
+                    (self.job_id, mode, params_json, 'running', now, now)
+                )
+        for url, depth in pending:
+            self.record_pending(url, depth)
+        self.flush()
+    
+    def load_job(self) -> Tuple[str, Dict, str]:
+        """Retorna (modo, parâmetros, status) do job"""
+        row = self._conn.execute(
+            'SELECT mode, params, status FROM jobs WHERE job_id = ?', (self.job_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Job não encontrado: {self.job_id}")
+        return row[0], json.loads(row[1]), row[2]
+    
+    @staticmethod
+    def latest_job(db_path: str = 'crawl_state.db', status: str = 'running',
+                   mode: Optional[str] = None) -> Optional[str]:
+        """Retorna o job mais recente com o status (e, se informado, o modo) indicado"""
+        conn = sqlite3.connect(db_path)
+        try:
+            if mode is None:
+                row = conn.execute(
+                    'SELECT job_id FROM jobs WHERE status = ? ORDER BY updated_at DESC LIMIT 1', (status,)
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    'SELECT job_id FROM jobs WHERE status = ? AND mode = ? ORDER BY updated_at DESC LIMIT 1',
+                    (status, mode)
+                ).fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        finally:
+            conn.close()
+        return row[0] if row else None
+    
+    def record_pending(self, url: str, depth: int = 0):
+        """Registra uma URL na fronteira pendente"""
+        self._enqueue(
+            'INSERT OR IGNORE INTO frontier VALUES (?, ?, ?, ?, ?)',
+            (self.job_id, self._fingerprint(url), url, depth, time.time_ns())
+        )
+    
+    def record_done(self, url: str, result_data: Optional[Dict] = None):
+        """Marca a URL como concluída e guarda o resultado (se houver)"""
+        fingerprint = self._fingerprint(url)
+        self._enqueue('DELETE FROM frontier WHERE job_id = ? AND fingerprint = ?',
+                      (self.job_id, fingerprint))
+        self._enqueue('INSERT OR IGNORE INTO visited VALUES (?, ?)', (self.job_id, fingerprint))
+        if result_data is not None:
+            self._enqueue('INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                          (self.job_id, fingerprint, json.dumps(result_data, ensure_ascii=False)))
+    
+    def _enqueue(self, sql: str, params: tuple):
+        """Adiciona uma operação ao buffer, gravando o lote quando necessário"""
+        with self._lock:
+            self._buffer.append((sql, params))
+            should_flush = (len(self._buffer) >= self.batch_size or
+                            time.monotonic() - self._last_flush >= self.flush_interval)
+        if should_flush:
+            self.flush()
+    
+    def flush(self):
+        """Grava todas as operações pendentes em uma única transação"""
+        with self._lock:
+            buffer, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+            if not buffer:
+                return
+            with self._conn:
+                for sql, params in buffer:
+                    self._conn.execute(sql, params)
+                self._conn.execute('UPDATE jobs SET updated_at = ? WHERE job_id = ?',
+                                   (time.time(), self.job_id))
+    
+    def pending(self) -> List[Tuple[str, int]]:
+        """Retorna a fronteira pendente na ordem em que foi registrada"""
+        self.flush()
+        rows = self._conn.execute(
+            'SELECT url, depth FROM frontier WHERE job_id = ? ORDER BY depth, seq', (self.job_id,)
+        ).fetchall()
+        return [(url, depth) for url, depth in rows]
+    
+    def visited_fingerprints(self) -> Iterator[int]:
+        """Itera sobre os fingerprints já visitados"""
+        self.flush()
+        cursor = self._conn.execute('SELECT fingerprint FROM visited WHERE job_id = ?', (self.job_id,))
+        for (value,) in cursor:
+            yield _to_unsigned(value)
+    
+    def results(self) -> Iterator[Dict]:
+        """Itera sobre os resultados concluídos"""
+        self.flush()
+        cursor = self._conn.execute('SELECT data FROM results WHERE job_id = ?', (self.job_id,))
+        for (data,) in cursor:
+            yield json.loads(data)
+    
+    def finish(self, status: str = 'finished'):
+        """Grava o buffer e marca o job como concluído"""
+        self.flush()
+        with self._lock:
+            with self._conn:
+                self._conn.execute('UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?',
+                                   (status, time.time(), self.job_id))
+    
+    def close(self):
+        """Grava o buffer e fecha a conexão"""
+        self.flush()
+        self._conn.close()
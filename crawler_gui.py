@@ -6,12 +6,18 @@ import json
 import os
 from datetime import datetime
 from web_crawler import WebCrawler
+from crawl_state import CrawlState
+from selenium_utils import WAIT_CONDITIONS
+from content_filter import PREFILTER_MODES
 import webbrowser
 
 
 class CrawlerGUI:
     """Interface gráfica moderna para o Web Crawler"""
     
+    CHECKPOINT_DB = "crawl_state.db"
+    MAX_TREE_ROWS = 1000  # a tabela mostra só os resultados mais recentes
+    
     def __init__(self):
         # Configuração do tema
         ctk.set_appearance_mode("dark")
@@ -98,6 +104,15 @@ class CrawlerGUI:
         self.delay_label.pack(anchor="w", padx=10)
         self.delay_scale.configure(command=self.update_delay_label)
         
+        # Auto-throttle: o delay acima vira só o ponto de partida de cada host
+        self.autothrottle_var = tk.BooleanVar(value=False)
+        self.autothrottle_cb = ctk.CTkCheckBox(
+            left_frame,
+            text="Auto-throttle por host (latência e 429/503)",
+            variable=self.autothrottle_var
+        )
+        self.autothrottle_cb.pack(anchor="w", padx=10, pady=5)
+        
         # Timeout
         ctk.CTkLabel(left_frame, text="Timeout (s):").pack(anchor="w", padx=10, pady=(10, 0))
         self.timeout_var = tk.IntVar(value=10)
@@ -179,10 +194,29 @@ class CrawlerGUI:
         selenium_frame = ctk.CTkFrame(advanced_frame)
         selenium_frame.pack(fill="x", padx=20, pady=10)
         
-        ctk.CTkLabel(selenium_frame, text="Tempo de espera Selenium (s):").pack(side="left", padx=10, pady=10)
+        ctk.CTkLabel(selenium_frame, text="Tempo máximo de espera Selenium (s):").pack(side="left", padx=10, pady=10)
         self.selenium_wait_var = tk.IntVar(value=3)
         self.selenium_wait_entry = ctk.CTkEntry(selenium_frame, textvariable=self.selenium_wait_var, width=100)
         self.selenium_wait_entry.pack(side="left", padx=10, pady=10)
+        
+        ctk.CTkLabel(selenium_frame, text="Aguardar:").pack(side="left", padx=10, pady=10)
+        self.selenium_wait_for_var = tk.StringVar(value="ready_state")
+        self.selenium_wait_for_combo = ctk.CTkComboBox(
+            selenium_frame,
+            values=list(WAIT_CONDITIONS),
+            variable=self.selenium_wait_for_var,
+            width=140
+        )
+        self.selenium_wait_for_combo.pack(side="left", padx=10, pady=10)
+        
+        self.selenium_wait_selector_var = tk.StringVar()
+        self.selenium_wait_selector_entry = ctk.CTkEntry(
+            selenium_frame,
+            textvariable=self.selenium_wait_selector_var,
+            placeholder_text="Seletor (para 'selector')",
+            width=200
+        )
+        self.selenium_wait_selector_entry.pack(side="left", padx=10, pady=10)
     
     def setup_filters_tab(self):
         """Configura a aba de filtros e seletores"""
@@ -243,6 +277,17 @@ class CrawlerGUI:
         self.regex_entry = ctk.CTkEntry(canvas_frame, textvariable=self.regex_var, placeholder_text=r"\b(python|django|flask)\b")
         self.regex_entry.pack(fill="x", pady=(0, 10))
         
+        # Pré-filtro: descarta páginas antes do parse completo
+        ctk.CTkLabel(canvas_frame, text="Pré-filtro (antes do parse):").pack(anchor="w", pady=(5, 0))
+        self.prefilter_var = tk.StringVar(value="nenhum")
+        self.prefilter_combo = ctk.CTkComboBox(
+            canvas_frame,
+            values=["nenhum"] + list(PREFILTER_MODES),
+            variable=self.prefilter_var,
+            width=140
+        )
+        self.prefilter_combo.pack(anchor="w", pady=(0, 10))
+        
         # Botões de preset
         preset_frame = ctk.CTkFrame(canvas_frame)
         preset_frame.pack(fill="x", pady=10)
@@ -276,6 +321,7 @@ class CrawlerGUI:
         # Treeview para mostrar resultados
         columns = ("URL", "Título", "Status", "Tempo (s)", "Links", "Imagens")
         self.results_tree = ttk.Treeview(results_content_frame, columns=columns, show="headings", height=15)
+        self.tree_urls = {}  # linha da árvore -> URL completa (a coluna mostra a URL cortada)
         
         # Configurar colunas
         for col in columns:
@@ -301,6 +347,7 @@ class CrawlerGUI:
         ctk.CTkButton(export_frame, text="Excel", command=lambda: self.export_results('excel'), width=80).pack(side="left", padx=5, pady=10)
         ctk.CTkButton(export_frame, text="CSV", command=lambda: self.export_results('csv'), width=80).pack(side="left", padx=5, pady=10)
         ctk.CTkButton(export_frame, text="JSON", command=lambda: self.export_results('json'), width=80).pack(side="left", padx=5, pady=10)
+        ctk.CTkButton(export_frame, text="Parquet", command=lambda: self.export_results('parquet'), width=80).pack(side="left", padx=5, pady=10)
         
         # Bind para duplo clique
         self.results_tree.bind("<Double-1>", self.on_result_double_click)
@@ -347,6 +394,15 @@ class CrawlerGUI:
         )
         self.stop_button.pack(side="left", padx=5, pady=10)
         
+        self.resume_button = ctk.CTkButton(
+            buttons_frame, 
+            text="⏯️ Retomar", 
+            command=self.resume_crawling,
+            width=100,
+            height=40
+        )
+        self.resume_button.pack(side="left", padx=5, pady=10)
+        
         self.config_button = ctk.CTkButton(
             buttons_frame, 
             text="💾 Salvar Config", 
@@ -396,6 +452,7 @@ class CrawlerGUI:
         self.exclude_keywords_var.set("")
         self.min_length_var.set(0)
         self.regex_var.set("")
+        self.prefilter_var.set("nenhum")
     
     def get_urls(self):
         """Obtém a lista de URLs do campo de texto"""
@@ -434,6 +491,9 @@ class CrawlerGUI:
         if self.regex_var.get().strip():
             filters['regex'] = self.regex_var.get().strip()
         
+        if filters and self.prefilter_var.get() in PREFILTER_MODES:
+            filters['prefilter'] = self.prefilter_var.get()
+        
         return filters
     
     def get_headers(self):
@@ -459,6 +519,26 @@ class CrawlerGUI:
         
         return proxies if proxies else None
     
+    def get_job_params(self):
+        """Parâmetros do job gravados no checkpoint (a retomada usa estes, não os da tela)"""
+        params = {
+            'max_workers': 1,
+            'kwargs': {
+                'selectors': self.get_selectors(),
+                'content_filters': self.get_filters(),
+                'respect_robots': self.respect_robots_var.get()
+            }
+        }
+        if self.use_selenium_var.get():
+            js_code = self.js_text.get("1.0", tk.END).strip()
+            params['selenium'] = {
+                'wait_time': self.selenium_wait_var.get(),
+                'execute_js': js_code if js_code and not js_code.startswith("//") else None,
+                'wait_for': self.selenium_wait_for_var.get(),
+                'wait_selector': self.selenium_wait_selector_var.get().strip() or None
+            }
+        return params
+    
     def start_crawling(self):
         """Inicia o processo de crawling"""
         urls = self.get_urls()
@@ -466,17 +546,38 @@ class CrawlerGUI:
             messagebox.showerror("Erro", "Por favor, insira pelo menos uma URL!")
             return
         
+        # Compila seletores e filtros antes de começar (erros não chegam às páginas)
+        params = self.get_job_params()
+        try:
+            self.crawler.get_extraction_plan(params['kwargs']['selectors'])
+            self.crawler.get_content_filter(params['kwargs']['content_filters'])
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        
         # Configura interface
         self.is_crawling = True
         self.start_button.configure(state="disabled")
+        self.resume_button.configure(state="disabled")
         self.stop_button.configure(state="normal")
         self.progress_bar.set(0)
         
         # Limpa resultados anteriores
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
+        self.clear_results_tree()
+        
+        self.configure_crawler()
         
-        # Configura o crawler
+        # Checkpoint em SQLite para poder retomar o crawling depois
+        self.crawler.enable_checkpoint(self.CHECKPOINT_DB)
+        self.crawler.checkpoint.start_job('gui', params, [(url, 0) for url in urls])
+        
+        # Inicia thread de crawling
+        self.crawl_thread = threading.Thread(target=self.run_crawling, args=(urls, params))
+        self.crawl_thread.daemon = True
+        self.crawl_thread.start()
+    
+    def configure_crawler(self):
+        """Aplica as configurações da interface na sessão do crawler"""
         headers = self.get_headers()
         proxies = self.get_proxies()
         
@@ -486,17 +587,46 @@ class CrawlerGUI:
             timeout=self.timeout_var.get(),
             delay=self.delay_var.get()
         )
+        if self.autothrottle_var.get():
+            self.crawler.setup_autothrottle(start_delay=self.delay_var.get())
+        else:
+            self.crawler.throttle = None
+    
+    def resume_crawling(self):
+        """Retoma o último crawling interrompido a partir do checkpoint"""
+        # Só jobs da interface: os do modo recursivo não são uma lista de URLs
+        job_id = (CrawlState.latest_job(self.CHECKPOINT_DB, mode='gui')
+                  if os.path.exists(self.CHECKPOINT_DB) else None)
+        if not job_id:
+            messagebox.showinfo("Retomar", "Nenhum crawling interrompido encontrado.")
+            return
         
-        # Inicia thread de crawling
-        self.crawl_thread = threading.Thread(target=self.run_crawling, args=(urls,))
+        self.crawler.close_selenium_pool()
+        self.crawler = WebCrawler()
+        self.configure_crawler()
+        _, params, pending = self.crawler.load_checkpoint(job_id, self.CHECKPOINT_DB)
+        
+        self.is_crawling = True
+        self.start_button.configure(state="disabled")
+        self.resume_button.configure(state="disabled")
+        self.stop_button.configure(state="normal")
+        self.progress_bar.set(0)
+        
+        # Só os resultados que cabem na árvore (os mais antigos podem estar em disco)
+        self.clear_results_tree()
+        for result in self.crawler.results[-self.MAX_TREE_ROWS:]:
+            self.add_result_to_tree(result)
+        
+        self.crawl_thread = threading.Thread(target=self.run_crawling,
+                                             args=([url for url, _ in pending], params))
         self.crawl_thread.daemon = True
         self.crawl_thread.start()
     
-    def run_crawling(self, urls):
-        """Executa o crawling em thread separada"""
+    def run_crawling(self, urls, params):
+        """Executa o crawling em thread separada com os parâmetros salvos no job"""
         try:
-            selectors = self.get_selectors()
-            filters = self.get_filters()
+            kwargs = params.get('kwargs', {})
+            selenium_options = params.get('selenium')
             
             total_urls = len(urls)
             
@@ -510,27 +640,28 @@ class CrawlerGUI:
                 self.progress_bar.set(progress / 100)
                 
                 # Faz crawling
-                if self.use_selenium_var.get():
-                    js_code = self.js_text.get("1.0", tk.END).strip()
-                    js_code = js_code if js_code and not js_code.startswith("//") else None
-                    
+                if selenium_options is not None:
                     result = self.crawler.crawl_with_selenium(
-                        url, 
-                        wait_time=self.selenium_wait_var.get(),
-                        execute_js=js_code
-                    )
-                else:
-                    result = self.crawler.crawl_url(
                         url,
-                        selectors=selectors,
-                        content_filters=filters,
-                        respect_robots=self.respect_robots_var.get()
+                        selectors=kwargs.get('selectors'),
+                        content_filters=kwargs.get('content_filters'),
+                        **selenium_options
                     )
+                else:
+                    result = self.crawler.crawl_url(url, **kwargs)
+                
+                self.crawler.record_checkpoint(url, result)
                 
                 # Adiciona resultado à interface
                 if result:
                     self.root.after(0, self.add_result_to_tree, result)
             
+            # Crawling completo encerra o job; se foi interrompido, fica disponível para retomar
+            if self.is_crawling:
+                self.crawler.finish_checkpoint()
+            elif self.crawler.checkpoint:
+                self.crawler.checkpoint.flush()
+            
             # Finaliza
             self.root.after(0, self.crawling_finished)
             
@@ -539,8 +670,14 @@ class CrawlerGUI:
             self.root.after(0, self.crawling_finished)
     
     def add_result_to_tree(self, result):
-        """Adiciona um resultado à árvore de resultados"""
-        self.results_tree.insert("", "end", values=(
+        """Adiciona um resultado à árvore de resultados (mantém só os MAX_TREE_ROWS mais recentes)"""
+        rows = self.results_tree.get_children()
+        if len(rows) >= self.MAX_TREE_ROWS:
+            removed = rows[:len(rows) - self.MAX_TREE_ROWS + 1]
+            self.results_tree.delete(*removed)
+            for item in removed:
+                self.tree_urls.pop(item, None)
+        item = self.results_tree.insert("", "end", values=(
             result.url[:50] + "..." if len(result.url) > 50 else result.url,
             result.title[:30] + "..." if len(result.title) > 30 else result.title,
             result.status_code,
@@ -548,11 +685,18 @@ class CrawlerGUI:
             len(result.links),
             len(result.images)
         ))
+        self.tree_urls[item] = result.url
+    
+    def clear_results_tree(self):
+        """Remove todas as linhas da árvore de resultados"""
+        self.results_tree.delete(*self.results_tree.get_children())
+        self.tree_urls.clear()
     
     def crawling_finished(self):
         """Finaliza o processo de crawling"""
         self.is_crawling = False
         self.start_button.configure(state="normal")
+        self.resume_button.configure(state="normal")
         self.stop_button.configure(state="disabled")
         self.progress_bar.set(1.0)
         self.status_var.set("Crawling concluído!")
@@ -576,6 +720,8 @@ class CrawlerGUI:
 • Total de links encontrados: {stats['total_links_found']}
 • Total de imagens encontradas: {stats['total_images_found']}
 • URLs visitadas: {stats['total_urls_visited']}
+• Cache robots.txt: {stats['robots_cache']['hits']} acertos / {stats['robots_cache']['misses']} downloads
+• Resultados em disco: {stats['result_store']['spilled']} de {stats['result_store']['total']}
             """.strip()
             self.stats_label.configure(text=stats_text)
     
@@ -583,15 +729,8 @@ class CrawlerGUI:
         """Manipula duplo clique nos resultados"""
         selection = self.results_tree.selection()
         if selection:
-            item = self.results_tree.item(selection[0])
-            url = item['values'][0]
-            # Remove "..." se existir
-            if url.endswith("..."):
-                # Encontra a URL completa nos resultados
-                for result in self.crawler.results:
-                    if result.url.startswith(url[:-3]):
-                        url = result.url
-                        break
+            # URL completa da linha (a coluna pode estar cortada com "...")
+            url = self.tree_urls.get(selection[0]) or self.results_tree.item(selection[0])['values'][0]
             
             # Abre no navegador
             webbrowser.open(url)
@@ -606,7 +745,8 @@ class CrawlerGUI:
         filetypes = {
             'excel': [("Excel files", "*.xlsx")],
             'csv': [("CSV files", "*.csv")],
-            'json': [("JSON files", "*.json")]
+            'json': [("JSON files", "*.json")],
+            'parquet': [("Parquet files", "*.parquet")]
         }
         
         filename = filedialog.asksaveasfilename(
@@ -626,6 +766,7 @@ class CrawlerGUI:
         config = {
             'urls': self.urls_text.get("1.0", tk.END).strip(),
             'delay': self.delay_var.get(),
+            'autothrottle': self.autothrottle_var.get(),
             'timeout': self.timeout_var.get(),
             'user_agent': self.user_agent_var.get(),
             'respect_robots': self.respect_robots_var.get(),
@@ -635,13 +776,16 @@ class CrawlerGUI:
             'https_proxy': self.https_proxy_var.get(),
             'js_code': self.js_text.get("1.0", tk.END).strip(),
             'selenium_wait': self.selenium_wait_var.get(),
+            'selenium_wait_for': self.selenium_wait_for_var.get(),
+            'selenium_wait_selector': self.selenium_wait_selector_var.get(),
             'title_selector': self.title_selector_var.get(),
             'desc_selector': self.desc_selector_var.get(),
             'content_selector': self.content_selector_var.get(),
             'keywords': self.keywords_var.get(),
             'exclude_keywords': self.exclude_keywords_var.get(),
             'min_length': self.min_length_var.get(),
-            'regex': self.regex_var.get()
+            'regex': self.regex_var.get(),
+            'prefilter': self.prefilter_var.get()
         }
         
         filename = filedialog.asksaveasfilename(
@@ -685,8 +829,10 @@ class CrawlerGUI:
         if self.is_crawling:
             if messagebox.askokcancel("Fechar", "Crawling em andamento. Deseja realmente fechar?"):
                 self.is_crawling = False
+                self.crawler.close_selenium_pool()
                 self.root.destroy()
         else:
+            self.crawler.close_selenium_pool()
             self.root.destroy()
 
 
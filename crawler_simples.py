@@ -8,12 +8,19 @@ import urllib.request
 import urllib.parse
 import urllib.error
 import html.parser
-import json
 import time
 import re
 from datetime import datetime
 import os
 
+from url_utils import VisitedURLSet
+from exporters import JSONLSink, JSONSink
+from result_store import ResultStore
+from http_utils import CHUNK_SIZE, DEFAULT_MAX_CONTENT_LENGTH, is_html_content_type, parse_retry_after, read_limited
+from connection_pool import KeepAliveHandler, KeepAlivePool
+from dns_cache import DNSCache
+from retry import RetryLater, RetryQueue, error_retry_after, load_retry_policy
+
 
 class SimpleHTMLParser(html.parser.HTMLParser):
     """Parser HTML simples usando apenas bibliotecas padrão"""
@@ -60,19 +67,56 @@ class SimpleCrawler:
     """Web Crawler simples usando apenas bibliotecas padrão do Python"""
     
     def __init__(self):
-        self.results = []
-        self.visited_urls = set()
+        self.results = ResultStore()  # orçamento de memória; os mais antigos vão para disco
+        self.visited_urls = VisitedURLSet()  # fingerprints das URLs canônicas
         self.user_agent = "SimpleCrawler/1.0 (Python)"
+        self.max_content_length = DEFAULT_MAX_CONTENT_LENGTH  # None = sem limite
+        self.sink = None  # JSONL gravado a cada resultado (ver stream_results_to)
+        self.retry_policy = load_retry_policy()  # max_retries do config.json
+        self.setup_connection_pool()
+    
+    def setup_connection_pool(self, max_per_host=2, max_total=10, idle_timeout=30.0, dns_ttl=300.0):
+        """Reaproveita conexões (e o handshake TLS) entre páginas do mesmo host
+        
+        Conexões novas resolvem o host por um cache de DNS com TTL de dns_ttl segundos.
+        """
+        if getattr(self, 'connection_pool', None) is not None:
+            self.connection_pool.close()
+        self.connection_pool = KeepAlivePool(max_per_host, max_total, idle_timeout)
+        self.dns_cache = DNSCache(dns_ttl)
+        self.opener = urllib.request.build_opener(KeepAliveHandler(self.connection_pool,
+                                                                   dns_cache=self.dns_cache))
+    
+    def close_connections(self):
+        """Fecha as conexões keep-alive ociosas"""
+        self.connection_pool.close()
     
     def crawl_url(self, url, delay=1.0, timeout=10):
-        """Faz crawling de uma URL"""
+        """Faz crawling de uma URL
+        
+        O corpo é lido em blocos até max_content_length; respostas que não
+        são HTML são descartadas sem ler o corpo. Timeouts, conexões
+        derrubadas e respostas 429/5xx são tentados de novo com backoff
+        (ver retry_policy).
+        """
+        attempt, started = 0, time.monotonic()
+        while True:
+            try:
+                return self._crawl_attempt(url, delay, timeout, attempt, started)
+            except RetryLater as retry:
+                time.sleep(retry.delay)
+                attempt += 1
+    
+    def _crawl_attempt(self, url, delay, timeout, attempt=0, started=None):
+        """Uma tentativa de crawl_url; lança RetryLater quando vale tentar de novo"""
         try:
-            # Evita URLs duplicadas
-            if url in self.visited_urls:
-                print(f"URL já visitada: {url}")
-                return None
-            
-            self.visited_urls.add(url)
+            # Evita URLs duplicadas (novas tentativas já foram registradas na primeira)
+            if attempt == 0:
+                if url in self.visited_urls:
+                    print(f"URL já visitada: {url}")
+                    return None
+                
+                self.visited_urls.add(url)
             
             # Delay entre requisições
             if delay > 0:
@@ -92,12 +136,20 @@ class SimpleCrawler:
             
             # Faz a requisição
             start_time = time.time()
-            with urllib.request.urlopen(req, timeout=timeout) as response:
+            with self.opener.open(req, timeout=timeout) as response:
                 response_time = time.time() - start_time
                 status_code = response.getcode()
                 
-                # Lê o conteúdo
-                content = response.read()
+                content_type = response.headers.get('Content-Type')
+                if not is_html_content_type(content_type):
+                    print(f"⏭️ Conteúdo não-HTML ignorado ({content_type}): {url}")
+                    return None
+                
+                # Lê o conteúdo em blocos, parando no limite de tamanho
+                content, truncated = read_limited(iter(lambda: response.read(CHUNK_SIZE), b''),
+                                                  self.max_content_length)
+                if truncated:
+                    print(f"✂️ Conteúdo truncado em {self.max_content_length} bytes: {url}")
                 
                 # Detecta encoding
                 encoding = 'utf-8'
@@ -120,10 +172,13 @@ class SimpleCrawler:
                 'status_code': status_code,
                 'response_time': round(response_time, 2),
                 'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'content_length': len(html_content)
+                'content_length': len(html_content),
+                'truncated': truncated
             }
             
             self.results.append(result)
+            if self.sink:
+                self.sink.write(result)
             
             print(f"✓ Sucesso: {result['title'][:50]}...")
             print(f"  Status: {status_code}, Tempo: {response_time:.2f}s")
@@ -131,37 +186,73 @@ class SimpleCrawler:
             
             return result
             
-        except urllib.error.HTTPError as e:
-            print(f"❌ Erro HTTP {e.code}: {url}")
-            return None
-        except urllib.error.URLError as e:
-            print(f"❌ Erro de URL: {e.reason}")
-            return None
         except Exception as e:
-            print(f"❌ Erro inesperado: {e}")
+            retry_after = parse_retry_after(error_retry_after(e))
+            wait = self.retry_policy.next_delay(e, attempt, started or time.monotonic(), retry_after)
+            if wait is not None:
+                print(f"🔁 Falha temporária ({e}), nova tentativa em {wait:.1f}s: {url}")
+                raise RetryLater(wait, e) from e
+            
+            if isinstance(e, urllib.error.HTTPError):
+                print(f"❌ Erro HTTP {e.code}: {url}")
+            elif isinstance(e, urllib.error.URLError):
+                print(f"❌ Erro de URL: {e.reason}")
+            else:
+                print(f"❌ Erro inesperado: {e}")
             return None
     
     def crawl_multiple_urls(self, urls, delay=1.0, timeout=10):
-        """Faz crawling de múltiplas URLs"""
-        results = []
+        """Faz crawling de múltiplas URLs
+        
+        URLs com falha temporária voltam para o fim da fila e só são
+        tentadas de novo depois do backoff, sem atrasar as demais.
+        """
+        results = {}
         total = len(urls)
+        queue = list(enumerate(urls, 1))
+        queue.reverse()
+        retries = RetryQueue()
         
         print(f"🕷️ Iniciando crawling de {total} URLs...")
         print("=" * 50)
         
-        for i, url in enumerate(urls, 1):
+        while queue or retries:
+            queue.extend(reversed(retries.pop_due()))
+            if not queue:
+                time.sleep(retries.next_due_in() or 0)
+                continue
+            
+            i, url, *retry = queue.pop()
+            attempt, started = retry or (0, time.monotonic())
             print(f"\n[{i}/{total}] ", end="")
-            result = self.crawl_url(url, delay, timeout)
+            try:
+                result = self._crawl_attempt(url, delay, timeout, attempt, started)
+            except RetryLater as e:
+                retries.push((i, url, attempt + 1, started), e.delay)
+                continue
             if result:
-                results.append(result)
+                results[i] = result
         
-        return results
+        # Mantém a ordem das URLs de entrada
+        return [results[i] for i in sorted(results)]
+    
+    def stream_results_to(self, filename="resultados_simples.jsonl"):
+        """Grava cada resultado em JSONL assim que ele é obtido"""
+        self.close_stream()
+        self.sink = JSONLSink(filename, row=dict)
+    
+    def close_stream(self):
+        """Fecha o arquivo JSONL aberto por stream_results_to"""
+        if self.sink:
+            self.sink.close()
+            self.sink = None
     
     def save_results_json(self, filename="resultados_simples.json"):
-        """Salva resultados em JSON"""
+        """Salva resultados em JSON, um item por vez"""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.results, f, indent=2, ensure_ascii=False)
+            with JSONSink(filename, row=dict) as sink:
+                for result in self.results:
+                    sink.write(result)
             print(f"\n💾 Resultados salvos em: {filename}")
             return True
         except Exception as e:
@@ -187,6 +278,10 @@ class SimpleCrawler:
         print(f"Total de imagens encontradas: {total_images}")
         print(f"URLs visitadas: {len(self.visited_urls)}")
         
+        connections = self.connection_pool.get_statistics()
+        print(f"Conexões novas/reaproveitadas: {connections['new_connections']}/"
+              f"{connections['reused_connections']}")
+        
         # Status codes
         status_codes = {}
         for result in self.results:
@@ -0,0 +1,229 @@
+"""
+Cache de DNS em processo e pré-aquecimento de hosts
+Guarda as resoluções de getaddrinfo por um TTL, compartilhadas entre os
+workers (uma única consulta por host mesmo com vários workers pedindo ao
+mesmo tempo), e resolve/conecta em segundo plano os hosts das URLs que
+estão prestes a ser buscadas
+"""
+
+import socket
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_DNS_TTL = 300.0
+DEFAULT_NEGATIVE_TTL = 30.0
+
+
+class _Entry:
+    """Resolução de um host: endereços ou o erro, válidos até expires"""
+    
+    __slots__ = ('addresses', 'error', 'expires')
+    
+    def __init__(self, addresses: List[Tuple], error: Optional[Exception], expires: float):
+        self.addresses = addresses
+        self.error = error
+        self.expires = expires
+
+
+class DNSCache:
+    """Cache thread-safe de getaddrinfo com TTL e cache negativo
+    
+    Falhas de resolução ficam em cache por negative_ttl segundos, para que
+    domínios inexistentes não sejam consultados de novo a cada URL. Com
+    max_entries cheio, as entradas expiradas (ou as mais antigas) saem.
+    """
+    
+    def __init__(self, ttl: float = DEFAULT_DNS_TTL, negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 max_entries: int = 10000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, int], _Entry] = {}
+        self._inflight: Dict[Tuple[str, int], threading.Event] = {}
+        
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.resolve_time = 0.0
+    
+    def resolve(self, host: str, port: int = 80) -> List[Tuple]:
+        """Endereços de getaddrinfo (TCP) do host; lança socket.gaierror se não resolver"""
+        key = (host.lower(), port)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires > time.monotonic():
+                    self.hits += 1
+                    if entry.error is not None:
+                        raise entry.error
+                    return entry.addresses
+                event = self._inflight.get(key)
+                if event is None:
+                    # Este worker faz a consulta; os demais esperam por ela
+                    event = self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            event.wait()
+        
+        start = time.perf_counter()
+        addresses, error = [], None
+        try:
+            addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            error = e
+        except Exception:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+            raise
+        elapsed = time.perf_counter() - start
+        
+        with self._lock:
+            self.resolve_time += elapsed
+            ttl = self.ttl
+            if error is not None:
+                self.failures += 1
+                ttl = self.negative_ttl
+            if len(self._entries) >= self.max_entries:
+                self._evict()
+            self._entries[key] = _Entry(addresses, error, time.monotonic() + ttl)
+            del self._inflight[key]
+        event.set()
+        
+        if error is not None:
+            raise error
+        return addresses
+    
+    def addresses(self, host: str, port: int = 80) -> List[str]:
+        """IPs do host, na ordem devolvida por getaddrinfo e sem repetição"""
+        return list(dict.fromkeys(sockaddr[0] for *_, sockaddr in self.resolve(host, port)))
+    
+    def create_connection(self, address: Tuple[str, int], timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+                          source_address=None):
+        """socket.create_connection com a resolução vinda do cache
+        
+        Tenta cada endereço do host até um conectar, como a função original.
+        """
+        host, port = address
+        error = None
+        for family, type_, proto, _, sockaddr in self.resolve(host, port):
+            sock = None
+            try:
+                sock = socket.socket(family, type_, proto)
+                if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+                    sock.settimeout(timeout)
+                if source_address:
+                    sock.bind(source_address)
+                sock.connect(sockaddr)
+                return sock
+            except OSError as e:
+                error = e
+                if sock is not None:
+                    sock.close()
+        raise error or OSError(f"getaddrinfo sem endereços para {host}")
+    
+    def _evict(self):
+        """Remove as entradas expiradas ou, se nenhuma expirou, a mais antiga (chamar com o lock)"""
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry.expires <= now]
+        for key in expired or [next(iter(self._entries))]:
+            del self._entries[key]
+    
+    def clear(self):
+        """Esquece todas as resoluções"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_statistics(self) -> Dict:
+        """Consultas, acertos, falhas e tempo médio de uma resolução real"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'lookups': lookups,
+                'hits': self.hits,
+                'misses': self.misses,
+                'failures': self.failures,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'resolve_time': round(self.resolve_time, 4),
+                'avg_resolve_ms': round(self.resolve_time / self.misses * 1000, 3) if self.misses else 0.0
+            }
+
+
+class HostPrefetcher:
+    """Resolve (e opcionalmente conecta) em segundo plano os hosts das próximas URLs
+    
+    warm(url) é chamado depois da resolução para abrir uma conexão no pool
+    do host; hosts já aquecidos há menos de refresh segundos são ignorados.
+    Guarda no máximo max_hosts origens recentes (as expiradas, ou as mais
+    antigas, saem primeiro).
+    """
+    
+    def __init__(self, dns_cache: DNSCache, warm: Optional[Callable[[str], bool]] = None,
+                 max_workers: int = 4, refresh: float = 30.0, max_hosts: int = 10000):
+        self.dns_cache = dns_cache
+        self.warm = warm
+        self.refresh = refresh
+        self.max_hosts = max_hosts
+        
+        self._lock = threading.Lock()
+        self._recent: Dict[str, float] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        
+        self.resolved = 0
+        self.warmed = 0
+    
+    def prefetch(self, urls: Iterable[str]):
+        """Agenda o aquecimento dos hosts das URLs que ainda não foram aquecidos"""
+        now = time.monotonic()
+        for url in urls:
+            parts = urllib.parse.urlsplit(url)
+            if not parts.hostname:
+                continue
+            origin = f"{parts.scheme}://{parts.netloc}".lower()
+            with self._lock:
+                if now - self._recent.get(origin, float('-inf')) < self.refresh:
+                    continue
+                # Reinserida no fim: o dicionário fica em ordem de aquecimento
+                self._recent.pop(origin, None)
+                if len(self._recent) >= self.max_hosts:
+                    self._prune(now)
+                self._recent[origin] = now
+            self._executor.submit(self._prefetch_url, url, parts)
+    
+    def _prune(self, now: float):
+        """Remove as origens expiradas e, se ainda cheio, as mais antigas (chamar com o lock)"""
+        self._recent = {origin: warmed_at for origin, warmed_at in self._recent.items()
+                        if now - warmed_at < self.refresh}
+        while len(self._recent) >= self.max_hosts:
+            del self._recent[next(iter(self._recent))]
+    
+    def _prefetch_url(self, url: str, parts):
+        """Resolve o host e abre a conexão (falhas ficam para a requisição de verdade)"""
+        try:
+            port = parts.port or (443 if parts.scheme == 'https' else 80)
+            self.dns_cache.resolve(parts.hostname, port)
+            with self._lock:
+                self.resolved += 1
+            if self.warm and self.warm(url):
+                with self._lock:
+                    self.warmed += 1
+        except Exception:
+            pass
+    
+    def close(self):
+        """Aguarda os aquecimentos em andamento e encerra as threads"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+    
+    def get_statistics(self) -> Dict:
+        """Hosts resolvidos e conexões abertas antecipadamente"""
+        with self._lock:
+            return {'resolved': self.resolved, 'warmed': self.warmed}
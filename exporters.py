@@ -0,0 +1,344 @@
+"""
+Exportadores incrementais de resultados
+Cada sink grava um resultado assim que ele chega, sem montar um DataFrame
+no fim do crawling: a memória fica constante e o que já foi gravado
+sobrevive se o processo cair
+"""
+
+import csv
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional: só os formatos parquet/arrow dependem dele
+    pa = None
+
+# Colunas da exportação tabular (mesmas do antigo DataFrame de export_results)
+EXPORT_COLUMNS = [
+    'URL', 'Título', 'Descrição', 'Conteúdo', 'Número de Links', 'Número de Imagens',
+    'Status Code', 'Tempo de Resposta (s)', 'Timestamp'
+]
+
+def result_row(result) -> Dict:
+    """Linha de exportação de um CrawlResult (conteúdo resumido em 500 caracteres)"""
+    return {
+        'URL': result.url,
+        'Título': result.title,
+        'Descrição': result.description,
+        'Conteúdo': result.content[:500] + '...' if len(result.content) > 500 else result.content,
+        'Número de Links': len(result.links),
+        'Número de Imagens': len(result.images),
+        'Status Code': result.status_code,
+        'Tempo de Resposta (s)': round(result.response_time, 2),
+        'Timestamp': result.timestamp.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def full_row(result) -> Dict:
+    """Registro completo de um CrawlResult (conteúdo inteiro, links e imagens como listas)"""
+    return {
+        'url': result.url,
+        'title': result.title,
+        'description': result.description,
+        'content': result.content,
+        'links': list(result.links),
+        'images': list(result.images),
+        'timestamp': result.timestamp,
+        'status_code': result.status_code,
+        'response_time': result.response_time,
+        'truncated': result.truncated,
+        'duplicate_of': result.duplicate_of,
+        'base_url': result.base_url
+    }
+
+
+def arrow_schema():
+    """Esquema Arrow de full_row (links e images como colunas de listas)"""
+    return pa.schema([
+        ('url', pa.string()),
+        ('title', pa.string()),
+        ('description', pa.string()),
+        ('content', pa.string()),
+        ('links', pa.list_(pa.string())),
+        ('images', pa.list_(pa.string())),
+        ('timestamp', pa.timestamp('us')),
+        ('status_code', pa.int32()),
+        ('response_time', pa.float64()),
+        ('truncated', pa.bool_()),
+        ('duplicate_of', pa.string()),
+        ('base_url', pa.string())
+    ])
+
+
+class ResultSink:
+    """Destino incremental de resultados, thread-safe
+    
+    row converte cada resultado no registro gravado (result_row por padrão).
+    Os dados são enviados ao disco a cada flush_every resultados ou depois
+    de flush_interval segundos, o que vier primeiro.
+    """
+    
+    def __init__(self, filename: str, row: Callable = result_row,
+                 flush_every: int = 100, flush_interval: float = 2.0):
+        self.filename = filename
+        self.row = row
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.count = 0
+        
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._closed = False
+    
+    def write(self, result):
+        """Grava um resultado"""
+        record = self.row(result)
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"Exportador já fechado: {self.filename}")
+            self._write(record)
+            self.count += 1
+            self._pending += 1
+            if (self._pending >= self.flush_every or
+                    time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush()
+    
+    def flush(self):
+        """Envia ao disco o que estiver em buffer"""
+        with self._lock:
+            if not self._closed:
+                self._flush()
+    
+    def close(self):
+        """Finaliza o arquivo"""
+        with self._lock:
+            if self._closed:
+                return
+            self._close()
+            self._closed = True
+    
+    def _flush(self):
+        """Zera o contador do agendamento de flush (chamar com o lock)"""
+        self._pending = 0
+        self._last_flush = time.monotonic()
+    
+    def _write(self, record: Dict):
+        """Grava um registro no formato do sink (chamar com o lock)"""
+        raise NotImplementedError
+    
+    def _close(self):
+        """Finaliza e fecha o arquivo (chamar com o lock)"""
+        raise NotImplementedError
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JSONLSink(ResultSink):
+    """Um objeto JSON por linha; o arquivo é válido a cada linha gravada"""
+    
+    def __init__(self, filename: str, row: Callable = result_row, **kwargs):
+        super().__init__(filename, row, **kwargs)
+        self._file = open(filename, 'w', encoding='utf-8')
+    
+    def _write(self, record: Dict):
+        """Grava o registro como uma linha JSON"""
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+    
+    def _flush(self):
+        """Envia o buffer do arquivo ao sistema operacional"""
+        self._file.flush()
+        super()._flush()
+    
+    def _close(self):
+        """Fecha o arquivo"""
+        self._file.close()
+
+
+class JSONSink(ResultSink):
+    """Array JSON gravado item a item (o ']' final é escrito no close)"""
+    
+    def __init__(self, filename: str, row: Callable = result_row, indent: Optional[int] = 2, **kwargs):
+        super().__init__(filename, row, **kwargs)
+        self.indent = indent
+        self._file = open(filename, 'w', encoding='utf-8')
+        self._file.write('[')
+    
+    def _write(self, record: Dict):
+        """Grava o registro como próximo item do array"""
+        separator = ',' if self.count else ''
+        item = json.dumps(record, ensure_ascii=False, indent=self.indent)
+        if self.indent is not None:
+            item = '\n' + '\n'.join(' ' * self.indent + line for line in item.splitlines())
+        self._file.write(separator + item)
+    
+    def _flush(self):
+        """Envia o buffer do arquivo ao sistema operacional"""
+        self._file.flush()
+        super()._flush()
+    
+    def _close(self):
+        """Fecha o array e o arquivo"""
+        self._file.write('\n]\n' if self.count and self.indent is not None else ']')
+        self._file.close()
+
+
+class CSVSink(ResultSink):
+    """CSV com cabeçalho, uma linha por resultado"""
+    
+    def __init__(self, filename: str, row: Callable = result_row, columns=None, **kwargs):
+        super().__init__(filename, row, **kwargs)
+        self._file = open(filename, 'w', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=columns or EXPORT_COLUMNS, extrasaction='ignore')
+        self._writer.writeheader()
+    
+    def _write(self, record: Dict):
+        """Grava o registro como uma linha do CSV"""
+        self._writer.writerow(record)
+    
+    def _flush(self):
+        """Envia o buffer do arquivo ao sistema operacional"""
+        self._file.flush()
+        super()._flush()
+    
+    def _close(self):
+        """Fecha o arquivo"""
+        self._file.close()
+
+
+class ExcelSink(ResultSink):
+    """Planilha Excel no modo write-only do openpyxl
+    
+    As linhas vão para um arquivo temporário do openpyxl em vez de ficar
+    na memória; o .xlsx só é montado no close.
+    """
+    
+    def __init__(self, filename: str, row: Callable = result_row, columns=None, **kwargs):
+        from openpyxl import Workbook
+        
+        super().__init__(filename, row, **kwargs)
+        self.columns = columns or EXPORT_COLUMNS
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet('Resultados')
+        self._sheet.append(self.columns)
+    
+    def _write(self, record: Dict):
+        """Acrescenta o registro como uma linha da planilha"""
+        self._sheet.append([record.get(column) for column in self.columns])
+    
+    def _close(self):
+        """Monta e salva o arquivo .xlsx"""
+        self._workbook.save(self.filename)
+
+
+class _ArrowSink(ResultSink):
+    """Base dos formatos colunares: acumula row_group_size registros e grava um lote
+    
+    Cada lote vira um row group (Parquet) ou record batch (Arrow IPC), então a
+    memória usada fica limitada ao tamanho do lote.
+    """
+    
+    def __init__(self, filename: str, row: Callable = full_row, row_group_size: int = 10000, **kwargs):
+        if pa is None:
+            raise ImportError("Exportação Parquet/Arrow requer o pacote pyarrow (pip install pyarrow)")
+        super().__init__(filename, row, **kwargs)
+        self.row_group_size = row_group_size
+        self.schema = arrow_schema()
+        self._columns: Dict[str, List] = {name: [] for name in self.schema.names}
+        self._buffered = 0
+    
+    def _write(self, record: Dict):
+        """Acumula o registro nas colunas e grava o lote quando ele enche"""
+        for name, values in self._columns.items():
+            values.append(record.get(name))
+        self._buffered += 1
+        if self._buffered >= self.row_group_size:
+            self._write_buffer()
+    
+    def _write_buffer(self):
+        """Converte as colunas acumuladas em uma tabela Arrow e grava"""
+        if not self._buffered:
+            return
+        table = pa.Table.from_pydict(self._columns, schema=self.schema)
+        self._write_table(table)
+        for values in self._columns.values():
+            values.clear()
+        self._buffered = 0
+    
+    def _write_table(self, table):
+        """Grava uma tabela no arquivo (implementado pelo formato)"""
+        raise NotImplementedError
+    
+    def _close(self):
+        """Grava o último lote e fecha o arquivo"""
+        self._write_buffer()
+        self._writer.close()
+
+
+class ParquetSink(_ArrowSink):
+    """Parquet comprimido, um row group a cada row_group_size resultados
+    
+    O rodapé do Parquet só é escrito no close; use JSONL se precisar ler o
+    arquivo enquanto o crawling ainda está rodando.
+    """
+    
+    def __init__(self, filename: str, row: Callable = full_row, compression: str = 'zstd', **kwargs):
+        super().__init__(filename, row, **kwargs)
+        self.compression = compression
+        self._writer = pq.ParquetWriter(filename, self.schema, compression=compression)
+    
+    def _write_table(self, table):
+        """Grava a tabela como um row group"""
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+
+
+class ArrowSink(_ArrowSink):
+    """Arquivo Arrow IPC (Feather v2), lido via memory map sem cópia"""
+    
+    def __init__(self, filename: str, row: Callable = full_row, compression: Optional[str] = 'zstd', **kwargs):
+        super().__init__(filename, row, **kwargs)
+        self.compression = compression
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        self._writer = pa.ipc.new_file(filename, self.schema, options=options)
+    
+    def _write_table(self, table):
+        """Grava a tabela como record batches"""
+        self._writer.write_table(table)
+
+
+SINKS = {
+    'excel': ExcelSink, 'csv': CSVSink, 'json': JSONSink, 'jsonl': JSONLSink,
+    'parquet': ParquetSink, 'arrow': ArrowSink
+}
+
+
+def create_sink(filename: str, format: str = 'excel', **kwargs) -> ResultSink:
+    """Cria o exportador incremental do formato ('excel', 'csv', 'json', 'jsonl', 'parquet' ou 'arrow')"""
+    sink_class = SINKS.get(format.lower())
+    if sink_class is None:
+        raise ValueError(f"Formato de exportação inválido: {format}")
+    return sink_class(filename, **kwargs)
+
+
+def read_columnar(filename: str, columns: Optional[List[str]] = None):
+    """Lê um arquivo Parquet ou Arrow exportado como DataFrame do pandas
+    
+    columns limita a leitura às colunas pedidas (as demais nem são descomprimidas).
+    """
+    if pa is None:
+        raise ImportError("Leitura Parquet/Arrow requer o pacote pyarrow (pip install pyarrow)")
+    if filename.endswith(('.arrow', '.feather', '.ipc')):
+        with pa.memory_map(filename) as source:
+            table = pa.ipc.open_file(source).read_all()
+            if columns:
+                table = table.select(columns)
+            return table.to_pandas()
+    return pq.read_table(filename, columns=columns).to_pandas()
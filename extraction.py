@@ -0,0 +1,311 @@
+"""
+Planos de extração compilados
+Compila uma vez os seletores CSS de um job (ou de um preset do config.json)
+e preenche todos os campos de extract_content com o mínimo de percursos na árvore
+"""
+
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import soupsieve
+from bs4 import Tag
+
+from html_parsers import LxmlDocument, LxmlElement, css_to_xpath, resolve_backend
+
+try:
+    import cssselect
+    from lxml import etree
+except ImportError:  # lxml_raw indisponível: os planos usam apenas soupsieve
+    cssselect = None
+
+DEFAULT_SELECTORS = {
+    'title': ['title', 'h1', '.title', '#title'],
+    'description': ['meta[name="description"]', '.description', '.summary', 'p:first-of-type'],
+    'content': ['article', '.content', '.post-content', '.entry-content', 'main', '#content'],
+    'links': ['a[href]'],
+    'images': ['img[src]']
+}
+
+# Campos de texto (o primeiro seletor que casar vence) e campos de lista com o atributo coletado
+TEXT_FIELDS = ('title', 'description', 'content')
+LIST_FIELDS = (('links', 'href'), ('images', 'src'))
+
+# <base href> do documento (content['base']): base dos links relativos junto com a URL final
+_BASE_XPATH = etree.XPath('(//base[@href])[1]/@href') if cssselect is not None else None
+
+
+class _Rule:
+    """Seletor compilado de um campo"""
+    
+    __slots__ = ('field', 'priority', 'selector', 'attribute', 'matcher')
+    
+    def __init__(self, field: str, priority: int, selector: str, attribute: Optional[str], matcher):
+        self.field = field
+        self.priority = priority
+        self.selector = selector
+        self.attribute = attribute
+        self.matcher = matcher
+
+
+def _index_key(selector: str) -> Optional[Tuple[str, str]]:
+    """Chave de índice do elemento casado pelo seletor: ('id'|'class'|'tag', valor)
+    
+    Usa a parte mais à direita do seletor ('article p.lead' -> ('class', 'lead')).
+    Retorna None quando o seletor pode casar com qualquer elemento.
+    """
+    if cssselect is None or ',' in selector:
+        return None
+    try:
+        node = cssselect.parse(selector)[0].parsed_tree
+    except Exception:
+        return None
+    
+    keys = {}
+    while True:
+        kind = type(node).__name__
+        if kind == 'CombinedSelector':  # combinador: o elemento casado é o da direita
+            node = node.subselector
+            continue
+        if kind == 'Hash':
+            keys.setdefault('id', node.id)
+        elif kind == 'Class':
+            keys.setdefault('class', node.class_name)
+        elif kind == 'Element':
+            if node.element:
+                keys.setdefault('tag', node.element.lower())
+            break
+        elif kind not in ('Attrib', 'Pseudo', 'Function'):
+            break  # negação, :is() etc. ficam sem índice
+        node = node.selector
+    
+    for kind in ('id', 'class', 'tag'):
+        if kind in keys:
+            return kind, keys[kind]
+    return None
+
+
+class ExtractionPlan:
+    """Seletores de um job compilados para um backend de parse
+    
+    Seletores inválidos geram ValueError na compilação, não a cada página.
+    Em árvores BeautifulSoup todos os campos são preenchidos em um único
+    percurso, testando cada elemento só contra os seletores indexados pela
+    sua tag, classes ou id.
+    Em árvores lxml_raw cada campo de lista vira uma única expressão XPath
+    (união dos seletores) avaliada em C.
+    """
+    
+    def __init__(self, selectors: Optional[Dict] = None, backend: str = 'auto', name: str = 'custom'):
+        selectors = selectors or {}
+        self.name = name
+        self.backend = resolve_backend(backend)
+        self.selectors = {field: list(selectors.get(field, default))
+                          for field, default in DEFAULT_SELECTORS.items()}
+        
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.parse_time = 0.0
+        self.match_time = 0.0
+        self.text_time = 0.0
+        
+        if self.backend == 'lxml_raw':
+            self._compile_lxml()
+        else:
+            self._compile_soup()
+    
+    @staticmethod
+    def key(selectors: Optional[Dict]) -> str:
+        """Chave estável de um dicionário de seletores (para cache de planos)"""
+        return json.dumps(selectors or {}, sort_keys=True)
+    
+    def _rules(self):
+        """Itera (campo, prioridade, seletor, atributo) de todos os campos"""
+        for field in TEXT_FIELDS:
+            for priority, selector in enumerate(self.selectors[field]):
+                yield field, priority, selector, None
+        for field, attribute in LIST_FIELDS:
+            for priority, selector in enumerate(self.selectors[field]):
+                yield field, priority, selector, attribute
+    
+    def _compile_soup(self):
+        """Compila os seletores com soupsieve e os indexa por id, classe ou tag"""
+        self._index: Dict[Tuple[str, str], Tuple[_Rule, ...]] = {}
+        self._any_tag: Tuple[_Rule, ...] = ()
+        
+        for field, priority, selector, attribute in self._rules():
+            try:
+                matcher = soupsieve.compile(selector)
+            except Exception as e:
+                raise ValueError(f"Seletor CSS inválido em '{field}': {selector!r} ({e})") from e
+            
+            rule = _Rule(field, priority, selector, attribute, matcher)
+            key = _index_key(selector)
+            if key:
+                self._index[key] = self._index.get(key, ()) + (rule,)
+            else:
+                self._any_tag += (rule,)
+    
+    def _compile_lxml(self):
+        """Traduz os seletores para XPath; campos de lista viram uma única união"""
+        def to_xpath(field, selector):
+            try:
+                return css_to_xpath(selector)
+            except Exception as e:
+                raise ValueError(f"Seletor CSS inválido em '{field}': {selector!r} ({e})") from e
+        
+        self._text_xpaths = {
+            field: [(selector, etree.XPath(to_xpath(field, selector))) for selector in self.selectors[field]]
+            for field in TEXT_FIELDS
+        }
+        self._list_xpaths = {}
+        for field, attribute in LIST_FIELDS:
+            expressions = [to_xpath(field, selector) for selector in self.selectors[field]]
+            self._list_xpaths[field] = (attribute, etree.XPath(' | '.join(expressions)) if expressions else None)
+    
+    def extract(self, document) -> Dict:
+        """Extrai título, descrição, conteúdo, links e imagens do documento"""
+        if isinstance(document, LxmlDocument):
+            if self.backend != 'lxml_raw':
+                raise ValueError("Documento lxml_raw em um plano compilado para BeautifulSoup")
+            best, lists, base, match_time = self._match_lxml(document)
+        else:
+            if self.backend == 'lxml_raw':
+                raise ValueError("Documento BeautifulSoup em um plano compilado para lxml_raw")
+            best, lists, base, match_time = self._match_soup(document)
+        
+        start = time.perf_counter()
+        content = {}
+        for field in TEXT_FIELDS:
+            content[field] = self._text(*best[field]) if field in best else ""
+        text_time = time.perf_counter() - start
+        
+        content.update(lists)
+        content['base'] = base.strip() if base else ''
+        
+        with self._lock:
+            self.pages += 1
+            self.match_time += match_time
+            self.text_time += text_time
+        
+        return content
+    
+    def _match_soup(self, soup) -> Tuple[Dict, Dict, Optional[str], float]:
+        """Percorre a árvore uma vez registrando o melhor elemento de cada campo e o <base href>"""
+        start = time.perf_counter()
+        best: Dict[str, Tuple[int, str, object]] = {}
+        lists = {field: {} for field, _ in LIST_FIELDS}
+        base = None
+        index = self._index
+        any_tag = self._any_tag
+        
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            if base is None and element.name == 'base':
+                base = element.get('href')
+            
+            # Só os seletores indexados pela tag, classes ou id do elemento são testados
+            rules = index.get(('tag', element.name), ())
+            attrs = element.attrs
+            if attrs:
+                element_id = attrs.get('id')
+                if element_id:
+                    rules += index.get(('id', element_id), ())
+                for class_name in attrs.get('class') or ():
+                    rules += index.get(('class', class_name), ())
+            rules += any_tag
+            
+            for rule in rules:
+                if rule.attribute is None:
+                    current = best.get(rule.field)
+                    # Só um seletor de prioridade maior pode substituir o elemento já achado
+                    if current is not None and current[0] <= rule.priority:
+                        continue
+                    if rule.matcher.match(element):
+                        best[rule.field] = (rule.priority, rule.selector, element)
+                elif rule.matcher.match(element):
+                    value = element.get(rule.attribute)
+                    if value:
+                        lists[rule.field][value] = None
+        
+        # select_one devolve o primeiro elemento em ordem de documento para o seletor vencedor
+        best = {field: (selector, element) for field, (_, selector, element) in best.items()}
+        lists = {field: list(values) for field, values in lists.items()}
+        return best, lists, base, time.perf_counter() - start
+    
+    def _match_lxml(self, document: LxmlDocument) -> Tuple[Dict, Dict, Optional[str], float]:
+        """Avalia as expressões XPath compiladas sobre a árvore lxml"""
+        start = time.perf_counter()
+        best = {}
+        lists = {field: [] for field, _ in LIST_FIELDS}
+        base = None
+        root = document.root
+        
+        if root is not None:
+            for field, xpaths in self._text_xpaths.items():
+                for selector, xpath in xpaths:
+                    elements = xpath(root)
+                    if elements:
+                        best[field] = (selector, LxmlElement(elements[0]))
+                        break
+            
+            for field, (attribute, xpath) in self._list_xpaths.items():
+                if xpath is not None:
+                    values = (element.get(attribute) for element in xpath(root))
+                    lists[field] = list(dict.fromkeys(value for value in values if value))
+            base = next(iter(_BASE_XPATH(root)), None)
+        
+        return best, lists, base, time.perf_counter() - start
+    
+    @staticmethod
+    def _text(selector: str, element) -> str:
+        """Texto de um campo; seletores de meta usam o atributo content"""
+        if selector.startswith('meta'):
+            return element.get('content', '')
+        return element.get_text(strip=True)
+    
+    def record_parse(self, elapsed: float):
+        """Soma o tempo de parse de uma página feita com este plano"""
+        with self._lock:
+            self.parse_time += elapsed
+    
+    def record_page(self, parse_time: float, match_time: float, text_time: float):
+        """Soma os tempos de uma página extraída fora deste plano (em um processo de parse)"""
+        with self._lock:
+            self.pages += 1
+            self.parse_time += parse_time
+            self.match_time += match_time
+            self.text_time += text_time
+    
+    def average_page_time(self) -> float:
+        """Tempo médio (s) de parse + extração por página até agora"""
+        with self._lock:
+            if not self.pages:
+                return 0.0
+            return (self.parse_time + self.match_time + self.text_time) / self.pages
+    
+    def get_statistics(self) -> Dict:
+        """Tempo acumulado por etapa (parse, casamento de seletores, extração de texto)"""
+        with self._lock:
+            total = self.parse_time + self.match_time + self.text_time
+            return {
+                'backend': self.backend,
+                'pages': self.pages,
+                'parse_time': round(self.parse_time, 4),
+                'match_time': round(self.match_time, 4),
+                'text_time': round(self.text_time, 4),
+                'avg_ms_per_page': round(total / self.pages * 1000, 3) if self.pages else 0.0
+            }
+
+
+def load_preset_plans(config_file: str = 'config.json', backend: str = 'auto') -> Dict[str, ExtractionPlan]:
+    """Compila os presets do config.json (ecommerce, blog, social...) em planos de extração"""
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    
+    return {
+        name: ExtractionPlan(preset.get('selectors', {}), backend, name)
+        for name, preset in config.get('presets', {}).items()
+    }
@@ -0,0 +1,105 @@
+"""
+Fronteira de crawling recursivo
+Fila em largura (BFS) de URLs pendentes com controle de profundidade e escopo
+"""
+
+import re
+import urllib.parse
+from collections import deque
+from typing import Iterable, List, Optional, Tuple
+from url_utils import VisitedURLSet
+
+
+def resolve_link(base_url: str, href: str) -> Optional[str]:
+    """Resolve um href relativo contra a URL da página, descartando fragmentos
+    
+    Retorna None para links que não são HTTP(S) (mailto:, javascript:, etc.).
+    """
+    href = href.strip()
+    if not href:
+        return None
+    
+    url, _ = urllib.parse.urldefrag(urllib.parse.urljoin(base_url, href))
+    if urllib.parse.urlsplit(url).scheme not in ('http', 'https'):
+        return None
+    return url
+
+
+class CrawlScope:
+    """Define quais URLs descobertas podem entrar na fronteira
+    
+    scope pode ser:
+    - 'same_domain': mesmo host das sementes (incluindo subdomínios)
+    - 'any': qualquer URL HTTP(S)
+    - uma expressão regular (string ou compilada) aplicada à URL completa
+    """
+    
+    def __init__(self, seeds: Iterable[str], scope='same_domain'):
+        self.scope = scope
+        self.pattern = None
+        self.domains = set()
+        
+        if scope == 'same_domain':
+            for seed in seeds:
+                host = (urllib.parse.urlsplit(seed).hostname or '').lower()
+                if host.startswith('www.'):
+                    host = host[4:]
+                if host:
+                    self.domains.add(host)
+        elif scope != 'any':
+            self.pattern = re.compile(scope) if isinstance(scope, str) else scope
+    
+    def allows(self, url: str) -> bool:
+        """Verifica se a URL está dentro do escopo"""
+        if self.pattern is not None:
+            return self.pattern.search(url) is not None
+        
+        if self.domains:
+            host = (urllib.parse.urlsplit(url).hostname or '').lower()
+            return any(host == domain or host.endswith('.' + domain) for domain in self.domains)
+        
+        return True
+
+
+class Frontier:
+    """Fila FIFO de (url, profundidade) com deduplicação e limite de profundidade
+    
+    A deduplicação usa a forma canônica da URL (ver url_utils).
+    """
+    
+    def __init__(self, scope: CrawlScope, max_depth: int = 2,
+                 tracking_params: Optional[Iterable[str]] = None):
+        self.scope = scope
+        self.max_depth = max_depth
+        self.queue = deque()
+        self.seen = VisitedURLSet(tracking_params)
+    
+    def push(self, url: str, depth: int) -> bool:
+        """Adiciona uma URL na fronteira; retorna False se foi descartada"""
+        if depth > self.max_depth or url in self.seen:
+            return False
+        if depth > 0 and not self.scope.allows(url):
+            return False
+        
+        self.seen.add(url)
+        self.queue.append((url, depth))
+        return True
+    
+    def add_links(self, base_url: str, links: List[str], depth: int) -> List[str]:
+        """Resolve e enfileira os links de uma página; retorna as URLs que entraram"""
+        if depth > self.max_depth:
+            return []
+        
+        added = []
+        for href in links:
+            url = resolve_link(base_url, href)
+            if url and self.push(url, depth):
+                added.append(url)
+        return added
+    
+    def pop(self) -> Tuple[str, int]:
+        """Remove a próxima URL (a mais rasa primeiro)"""
+        return self.queue.popleft()
+    
+    def __len__(self) -> int:
+        return len(self.queue)
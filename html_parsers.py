@@ -0,0 +1,159 @@
+"""
+Backends de parse de HTML
+Permite escolher entre BeautifulSoup com 'html.parser', BeautifulSoup com
+'lxml' ou uma árvore lxml pura (sem BeautifulSoup), todos expondo a mesma
+interface usada por WebCrawler.extract_content (select, select_one, get, get_text)
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # lxml é opcional
+    etree = None
+
+try:
+    from cssselect import HTMLTranslator
+except ImportError:  # lxml_raw exige o pacote cssselect
+    HTMLTranslator = None
+
+# Do mais rápido para o mais lento (ver benchmark_parsers.py)
+PARSER_BACKENDS = ('lxml_raw', 'lxml', 'html.parser')
+
+# Tags cujo texto o BeautifulSoup guarda em classes próprias e omite de get_text();
+# elementos dentro delas (ex.: o conteúdo de um <template>) têm texto vazio
+_STRING_CONTAINERS = frozenset(('script', 'style', 'template', 'rt', 'rp'))
+
+# :first-of-type/:last-of-type viram count(irmãos) = 0, quadrático em listas longas
+_NO_SIBLING_RE = re.compile(r'count\(((?:preceding|following)-sibling::[\w*-]+)\) = 0')
+
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_:.-]+)', re.I)
+
+
+def available_backends() -> Tuple[str, ...]:
+    """Backends utilizáveis com as bibliotecas instaladas, do mais rápido para o mais lento"""
+    backends = []
+    if etree is not None:
+        if HTMLTranslator is not None:
+            backends.append('lxml_raw')
+        backends.append('lxml')
+    backends.append('html.parser')
+    return tuple(backends)
+
+
+def resolve_backend(backend: str = 'auto') -> str:
+    """Converte 'auto' no backend mais rápido disponível e valida o nome"""
+    available = available_backends()
+    if backend == 'auto':
+        return available[0]
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Backend de parse inválido: {backend}")
+    if backend not in available:
+        raise ValueError(f"Backend de parse indisponível (instale lxml/cssselect): {backend}")
+    return backend
+
+
+def parse_html(html, backend: str = 'auto'):
+    """Faz o parse do HTML (str ou bytes) com o backend escolhido"""
+    backend = resolve_backend(backend)
+    if backend == 'lxml_raw':
+        return LxmlDocument.parse(html)
+    return BeautifulSoup(html, backend)
+
+
+def decode_html(html: bytes) -> str:
+    """Decodifica bytes usando o charset declarado, UTF-8 ou windows-1252"""
+    match = _CHARSET_RE.search(html[:4096])
+    if match:
+        try:
+            return html.decode(match.group(1).decode('ascii'))
+        except (LookupError, UnicodeDecodeError):
+            pass
+    try:
+        return html.decode('utf-8')
+    except UnicodeDecodeError:
+        return html.decode('windows-1252', errors='replace')
+
+
+def css_to_xpath(selector: str) -> str:
+    """Traduz um seletor CSS para XPath (lança cssselect.SelectorError se inválido)"""
+    xpath = HTMLTranslator().css_to_xpath(selector)
+    # not(irmão[1]) para no primeiro irmão encontrado em vez de percorrer todos
+    return _NO_SIBLING_RE.sub(r'not(\1[1])', xpath)
+
+
+@lru_cache(maxsize=512)
+def _compile_selector(selector: str):
+    """Traduz o seletor CSS para XPath uma única vez"""
+    return etree.XPath(css_to_xpath(selector))
+
+
+class LxmlElement:
+    """Elemento lxml com a interface de bs4.Tag usada na extração"""
+    
+    __slots__ = ('element',)
+    
+    def __init__(self, element):
+        self.element = element
+    
+    def get(self, attribute: str, default=None):
+        """Valor de um atributo"""
+        return self.element.get(attribute, default)
+    
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        """Texto do elemento (sem comentários nem scripts), igual a bs4.Tag.get_text"""
+        texts = []
+        if self.element.tag in _STRING_CONTAINERS:
+            texts.extend(self.element.itertext())
+        elif not any(ancestor.tag in _STRING_CONTAINERS for ancestor in self.element.iterancestors()):
+            _collect_text(self.element, texts)
+        if strip:
+            texts = [text.strip() for text in texts]
+            texts = [text for text in texts if text]
+        return separator.join(texts)
+
+
+def _collect_text(element, texts: List[str]):
+    """Acumula o texto visível da subárvore, pulando comentários e _STRING_CONTAINERS"""
+    if element.text:
+        texts.append(element.text)
+    for child in element:
+        # Comentários e instruções de processamento têm tag que não é str
+        if isinstance(child.tag, str) and child.tag not in _STRING_CONTAINERS:
+            _collect_text(child, texts)
+        if child.tail:
+            texts.append(child.tail)
+
+
+class LxmlDocument:
+    """Documento lxml puro com select/select_one no estilo do BeautifulSoup"""
+    
+    __slots__ = ('root',)
+    
+    def __init__(self, root):
+        self.root = root
+    
+    @classmethod
+    def parse(cls, html) -> 'LxmlDocument':
+        """Faz o parse de str ou bytes; documentos vazios viram uma árvore vazia"""
+        if isinstance(html, bytes):
+            html = decode_html(html)
+        # lxml recusa str com declaração de encoding, então o parse é feito em UTF-8.
+        # etree.HTMLParser (e não lxml.html) evita o custo das classes HtmlElement
+        parser = etree.HTMLParser(encoding='utf-8')
+        return cls(etree.fromstring(html.encode('utf-8'), parser))
+    
+    def select(self, selector: str) -> List[LxmlElement]:
+        """Todos os elementos que casam com o seletor CSS"""
+        if self.root is None:
+            return []
+        return [LxmlElement(element) for element in _compile_selector(selector)(self.root)]
+    
+    def select_one(self, selector: str) -> Optional[LxmlElement]:
+        """Primeiro elemento que casa com o seletor CSS"""
+        elements = self.select(selector)
+        return elements[0] if elements else None
@@ -0,0 +1,180 @@
+"""
+Cache HTTP em disco para re-crawls com requisições condicionais
+Guarda ETag/Last-Modified, o corpo comprimido e o conteúdo já extraído
+de cada URL canônica, com remoção LRU limitada por tamanho
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+
+from url_utils import canonicalize_url, url_fingerprint
+
+
+class CacheEntry:
+    """Entrada do cache HTTP"""
+    
+    def __init__(self, fingerprint: int, url: str, etag: Optional[str], last_modified: Optional[str],
+                 body: bytes, status_code: int, extraction_key: Optional[str], extracted: Optional[str]):
+        self.fingerprint = fingerprint
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.status_code = status_code
+        self.extraction_key = extraction_key
+        self.extracted = extracted
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers If-None-Match/If-Modified-Since para revalidar a entrada"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+    
+    def get_body(self) -> bytes:
+        """Retorna o corpo descomprimido"""
+        return zlib.decompress(self.body)
+    
+    def get_extracted(self, extraction_key: str) -> Optional[Dict]:
+        """Conteúdo extraído em cache, se foi gerado com os mesmos seletores"""
+        if self.extracted is None or self.extraction_key != extraction_key:
+            return None
+        return json.loads(self.extracted)
+
+
+class HTTPCache:
+    """Cache HTTP persistente em SQLite com política LRU limitada por bytes"""
+    
+    def __init__(self, db_path: str = 'http_cache.db', max_bytes: int = 256 * 1024 * 1024,
+                 tracking_params: Optional[List[str]] = None):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.tracking_params = tracking_params
+        
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS entries (
+                    fingerprint INTEGER PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body BLOB NOT NULL,
+                    status_code INTEGER NOT NULL,
+                    extraction_key TEXT,
+                    extracted TEXT,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)')
+        self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+    
+    def _key(self, url: str) -> int:
+        """Chave SQLite (INTEGER com sinal) do fingerprint canônico da URL"""
+        fingerprint = url_fingerprint(url, self.tracking_params)
+        return fingerprint - (1 << 64) if fingerprint >= (1 << 63) else fingerprint
+    
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Busca a entrada da URL, atualizando o acesso para a política LRU
+        
+        O acerto só é contado quando o servidor confirma a entrada com 304
+        (ver record_not_modified); sem entrada, conta uma falha.
+        """
+        key = self._key(url)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, etag, last_modified, body, status_code, extraction_key, extracted '
+                'FROM entries WHERE fingerprint = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute('UPDATE entries SET last_access = ? WHERE fingerprint = ?',
+                                   (time.time(), key))
+        return CacheEntry(key, *row)
+    
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str], body: bytes,
+              status_code: int, extraction_key: Optional[str] = None, extracted: Optional[Dict] = None):
+        """Guarda (ou substitui) a resposta de uma URL e aplica a remoção LRU
+        
+        Substituir uma entrada (o servidor respondeu 200 com corpo novo) conta como falha.
+        """
+        key = self._key(url)
+        compressed = zlib.compress(body)
+        extracted_json = json.dumps(extracted, ensure_ascii=False) if extracted is not None else None
+        size = len(compressed) + len(extracted_json or '')
+        
+        with self._lock:
+            with self._conn:
+                old = self._conn.execute('SELECT size FROM entries WHERE fingerprint = ?', (key,)).fetchone()
+                if old:
+                    self._total_bytes -= old[0]
+                    self.misses += 1
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (key, canonicalize_url(url, self.tracking_params), etag, last_modified, compressed,
+                     status_code, extraction_key, extracted_json, size, time.time())
+                )
+                self._total_bytes += size
+                self._evict()
+    
+    def record_not_modified(self, entry: CacheEntry, extraction_key: str, extracted: Dict):
+        """Conta um 304 (acerto) e atualiza o conteúdo extraído se os seletores mudaram"""
+        with self._lock:
+            self.hits += 1
+            self.not_modified += 1
+            if entry.extraction_key == extraction_key:
+                return
+            extracted_json = json.dumps(extracted, ensure_ascii=False)
+            with self._conn:
+                self._conn.execute(
+                    'UPDATE entries SET extraction_key = ?, extracted = ?, size = ? WHERE fingerprint = ?',
+                    (extraction_key, extracted_json, len(entry.body) + len(extracted_json), entry.fingerprint)
+                )
+                self._total_bytes += len(extracted_json) - len(entry.extracted or '')
+                self._evict()
+    
+    def _evict(self):
+        """Remove as entradas menos usadas até caber no limite (chamar com o lock)"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        cursor = self._conn.execute('SELECT fingerprint, size FROM entries ORDER BY last_access')
+        to_delete = []
+        for fingerprint, size in cursor:
+            if self._total_bytes <= target:
+                break
+            to_delete.append((fingerprint,))
+            self._total_bytes -= size
+        self._conn.executemany('DELETE FROM entries WHERE fingerprint = ?', to_delete)
+        self.evictions += len(to_delete)
+    
+    def get_statistics(self) -> Dict:
+        """Retorna contadores de acertos (304), falhas (sem entrada ou corpo novo) e remoções"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'evictions': self.evictions,
+                'size_bytes': self._total_bytes
+            }
+    
+    def close(self):
+        """Fecha o banco do cache"""
+        self._conn.close()
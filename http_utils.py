@@ -0,0 +1,56 @@
+"""
+Utilitários HTTP usando apenas bibliotecas padrão
+Leitura de corpos em blocos com limite de bytes, detecção de respostas
+que não são HTML e leitura do Retry-After, compartilhados pelos crawlers
+síncrono, assíncrono e simples
+"""
+
+import email.utils
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Tuple
+
+# Mesmo valor de max_content_length do config.json
+DEFAULT_MAX_CONTENT_LENGTH = 1024 * 1024
+
+CHUNK_SIZE = 64 * 1024
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+
+def is_html_content_type(content_type: Optional[str]) -> bool:
+    """Verifica se o Content-Type é HTML (ou ausente, caso em que o corpo é aceito)"""
+    if not content_type:
+        return True
+    return content_type.split(';', 1)[0].strip().lower() in HTML_CONTENT_TYPES
+
+
+def read_limited(chunks: Iterable[bytes], max_bytes: Optional[int]) -> Tuple[bytes, bool]:
+    """Junta os blocos até max_bytes; retorna (corpo, truncado)
+    
+    A leitura para no primeiro bloco que ultrapassa o limite, então o
+    restante da resposta nunca é baixado. max_bytes=None lê tudo.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        if max_bytes is not None and len(buffer) > max_bytes:
+            return bytes(buffer[:max_bytes]), True
+    return bytes(buffer), False
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Segundos pedidos por um cabeçalho Retry-After (em segundos ou como data HTTP)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,193 @@
+"""
+Detecção de páginas quase duplicadas
+Calcula um SimHash de 64 bits sobre os shingles (sequências de palavras) do
+conteúdo extraído e procura fingerprints próximos em um índice por bandas:
+com distância de Hamming máxima k, os 64 bits são divididos em k + 1
+bandas e duas páginas parecidas coincidem em pelo menos uma delas, então
+cada consulta só compara com as páginas que caem nas mesmas bandas
+"""
+
+import hashlib
+import re
+import threading
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional: sem ele o SimHash é somado bit a bit em Python
+    np = None
+
+FINGERPRINT_BITS = 64
+
+# Exemplos de URLs guardados por grupo e grupos mantidos nas estatísticas
+MAX_EXAMPLES = 5
+DEFAULT_MAX_CLUSTERS = 10000
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def _shingle_hash(shingle: str) -> int:
+    """Hash estável de 64 bits (o hash() do Python muda entre processos)"""
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def simhash(text: str, shingle_size: int = 3) -> Optional[int]:
+    """SimHash de 64 bits do texto; None se ele tiver menos palavras que shingle_size"""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < shingle_size:
+        return None
+    
+    # Shingles repetidos contam várias vezes (peso pela frequência)
+    hashes = [_shingle_hash(' '.join(words[i:i + shingle_size]))
+              for i in range(len(words) - shingle_size + 1)]
+    
+    if np is not None:
+        # Soma de cada posição de bit em todas as linhas de uma vez
+        bits = np.unpackbits(np.array(hashes, dtype='<u8').view(np.uint8)).reshape(-1, FINGERPRINT_BITS)
+        majority = bits.sum(axis=0) * 2 > len(hashes)
+        return int.from_bytes(np.packbits(majority).tobytes(), 'little')
+    
+    counts = [0] * FINGERPRINT_BITS
+    for value in hashes:
+        for bit in range(FINGERPRINT_BITS):
+            if value >> bit & 1:
+                counts[bit] += 1
+    fingerprint = 0
+    for bit, count in enumerate(counts):
+        if count * 2 > len(hashes):
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def similarity(a: int, b: int) -> float:
+    """Similaridade entre dois SimHash (1 - distância de Hamming / 64)"""
+    return 1 - bin(a ^ b).count('1') / FINGERPRINT_BITS
+
+
+class NearDuplicateIndex:
+    """Índice por bandas de SimHash para achar páginas quase duplicadas
+    
+    threshold é a similaridade mínima (0.95 tolera até 3 dos 64 bits
+    diferentes). A primeira página de cada grupo é a canônica; as seguintes
+    são registradas como duplicatas dela. Cada grupo guarda só a contagem e
+    até MAX_EXAMPLES URLs; passando de max_clusters grupos, a metade menor
+    é descartada das estatísticas.
+    """
+    
+    def __init__(self, threshold: float = 0.95, shingle_size: int = 3,
+                 max_clusters: int = DEFAULT_MAX_CLUSTERS):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"Limiar de similaridade inválido: {threshold}")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.max_distance = int(round((1 - threshold) * FINGERPRINT_BITS, 6))
+        
+        # k + 1 bandas: pelo princípio da casa dos pombos, até k bits diferentes
+        # deixam ao menos uma banda idêntica
+        bands = min(self.max_distance + 1, FINGERPRINT_BITS)
+        width, extra = divmod(FINGERPRINT_BITS, bands)
+        self._bands = []
+        start = 0
+        for band in range(bands):
+            size = width + (1 if band < extra else 0)
+            self._bands.append((start, (1 << size) - 1))
+            start += size
+        
+        self._lock = threading.Lock()
+        self._index: Dict[tuple, List[int]] = {}
+        self._fingerprints: List[int] = []
+        self._urls: List[str] = []
+        self.max_clusters = max_clusters
+        self.clusters: Dict[str, int] = {}  # URL canônica -> número de duplicatas
+        self._examples: Dict[str, List[str]] = {}
+        self.pruned_clusters = 0
+        self.pages = 0
+        self.duplicates = 0
+        self.skipped = 0
+    
+    def _keys(self, fingerprint: int):
+        """Chaves (banda, valor) do fingerprint no índice"""
+        return [(band, fingerprint >> start & mask) for band, (start, mask) in enumerate(self._bands)]
+    
+    def check(self, url: str, text: str) -> Optional[str]:
+        """Registra a página; retorna a URL canônica se ela for quase duplicata de outra"""
+        fingerprint = simhash(text, self.shingle_size)
+        
+        with self._lock:
+            self.pages += 1
+            if fingerprint is None:
+                self.skipped += 1  # texto curto demais para comparar
+                return None
+            
+            keys = self._keys(fingerprint)
+            best, best_distance = None, self.max_distance + 1
+            seen = set()
+            for key in keys:
+                for candidate in self._index.get(key, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    distance = bin(fingerprint ^ self._fingerprints[candidate]).count('1')
+                    if distance < best_distance:
+                        best, best_distance = candidate, distance
+            
+            if best is not None:
+                canonical = self._urls[best]
+                self._add_duplicate(canonical, url)
+                return canonical
+            
+            # Página nova: passa a ser canônica do seu grupo
+            self._add_page(url, fingerprint, keys)
+            return None
+    
+    def restore(self, url: str, text: str, duplicate_of: Optional[str] = None):
+        """Registra uma página já classificada (ex.: resultados restaurados de um checkpoint)"""
+        fingerprint = simhash(text, self.shingle_size) if duplicate_of is None else None
+        with self._lock:
+            self.pages += 1
+            if duplicate_of is not None:
+                self._add_duplicate(duplicate_of, url)
+            elif fingerprint is None:
+                self.skipped += 1
+            else:
+                self._add_page(url, fingerprint, self._keys(fingerprint))
+    
+    def _add_page(self, url: str, fingerprint: int, keys):
+        """Indexa uma página canônica (chamar com o lock)"""
+        page_id = len(self._fingerprints)
+        self._fingerprints.append(fingerprint)
+        self._urls.append(url)
+        for key in keys:
+            self._index.setdefault(key, []).append(page_id)
+    
+    def _add_duplicate(self, canonical: str, url: str):
+        """Conta a duplicata no grupo da canônica (chamar com o lock)"""
+        self.duplicates += 1
+        self.clusters[canonical] = self.clusters.get(canonical, 0) + 1
+        examples = self._examples.setdefault(canonical, [])
+        if len(examples) < MAX_EXAMPLES:
+            examples.append(url)
+        if len(self.clusters) > self.max_clusters:
+            # Mantém só a metade maior dos grupos
+            keep = sorted(self.clusters, key=self.clusters.get, reverse=True)[:self.max_clusters // 2]
+            self.pruned_clusters += len(self.clusters) - len(keep)
+            self.clusters = {canonical: self.clusters[canonical] for canonical in keep}
+            self._examples = {canonical: self._examples[canonical] for canonical in keep}
+    
+    def get_statistics(self, top: int = 10) -> Dict:
+        """Páginas, duplicatas e os maiores grupos de duplicatas"""
+        with self._lock:
+            largest = sorted(self.clusters.items(), key=lambda item: item[1], reverse=True)[:top]
+            return {
+                'threshold': self.threshold,
+                'pages': self.pages,
+                'unique': len(self._fingerprints),
+                'duplicates': self.duplicates,
+                'skipped': self.skipped,
+                'clusters': len(self.clusters),
+                'pruned_clusters': self.pruned_clusters,
+                'largest_clusters': [
+                    {'url': canonical, 'duplicates': count, 'examples': list(self._examples[canonical])}
+                    for canonical, count in largest
+                ]
+            }
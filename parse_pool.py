@@ -0,0 +1,220 @@
+"""
+Estágio de parse em processos
+No modo pipeline as threads de I/O só baixam as páginas: o corpo bruto vai
+para um ProcessPoolExecutor que aplica pré-filtro, parse, extração e
+filtros fora do GIL do processo principal e devolve apenas o conteúdo
+extraído. Os corpos passam por blocos de memória compartilhada
+reaproveitados, então os bytes da página não são serializados no caminho
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+from content_filter import ContentFilter, FilterDecision
+from extraction import ExtractionPlan
+from html_parsers import decode_html, parse_html
+
+# Estado de cada processo de parse: planos e filtros compilados e blocos já abertos
+_plans: Dict = {}
+_filters: Dict = {}
+_segments: Dict[str, shared_memory.SharedMemory] = {}
+
+
+class ParsedPage:
+    """Resultado compacto do parse de uma página, devolvido pelo processo de parse
+    
+    content só vem preenchido se a página passou pelo pré-filtro e pelos
+    filtros; prefilter e decision são as decisões tomadas (None se o job
+    não tem pré-filtro/filtros). Os tempos alimentam as estatísticas do
+    plano e do filtro no processo principal.
+    """
+    
+    __slots__ = ('content', 'prefilter', 'decision', 'prefilter_time', 'parse_time', 'match_time', 'text_time')
+    
+    def __init__(self, content: Optional[Dict], prefilter: Optional[FilterDecision] = None,
+                 decision: Optional[FilterDecision] = None, prefilter_time: float = 0.0,
+                 parse_time: float = 0.0, match_time: float = 0.0, text_time: float = 0.0):
+        self.content = content
+        self.prefilter = prefilter
+        self.decision = decision
+        self.prefilter_time = prefilter_time
+        self.parse_time = parse_time
+        self.match_time = match_time
+        self.text_time = text_time
+
+
+def _init_worker():
+    """Zera o estado herdado ao iniciar um processo de parse"""
+    _plans.clear()
+    _filters.clear()
+    _segments.clear()
+
+
+def _read_body(body) -> bytes:
+    """Corpo da página: bytes enviados junto com a tarefa ou (bloco, tamanho) na memória compartilhada"""
+    if isinstance(body, bytes):
+        return body
+    name, length = body
+    segment = _segments.get(name)
+    if segment is None:
+        segment = _segments[name] = shared_memory.SharedMemory(name=name)
+    return bytes(segment.buf[:length])
+
+
+def parse_page(body, selectors: Optional[Dict], backend: str, filters: Optional[Dict]) -> ParsedPage:
+    """Pré-filtro, parse, extração e filtros de uma página (roda no processo de parse)"""
+    html = _read_body(body)
+    
+    content_filter = None
+    if filters:
+        key = ContentFilter.key(filters)
+        content_filter = _filters.get(key)
+        if content_filter is None:
+            content_filter = _filters[key] = ContentFilter(filters)
+    
+    prefilter, prefilter_time = None, 0.0
+    if content_filter is not None and content_filter.prefilter is not None:
+        start = time.perf_counter()
+        prefilter = content_filter.precheck(decode_html(html))
+        prefilter_time = time.perf_counter() - start
+        if not prefilter:
+            return ParsedPage(None, prefilter, prefilter_time=prefilter_time)
+    
+    key = (ExtractionPlan.key(selectors), backend)
+    plan = _plans.get(key)
+    if plan is None:
+        plan = _plans[key] = ExtractionPlan(selectors, backend)
+    
+    start = time.perf_counter()
+    document = parse_html(html, plan.backend)
+    parse_time = time.perf_counter() - start
+    match_time, text_time = plan.match_time, plan.text_time
+    content = plan.extract(document)
+    match_time, text_time = plan.match_time - match_time, plan.text_time - text_time
+    
+    decision = None
+    if content_filter is not None:
+        decision = content_filter.check(f"{content['title']} {content['description']} {content['content']}")
+        if not decision:
+            content = None
+    
+    return ParsedPage(content, prefilter, decision, prefilter_time, parse_time, match_time, text_time)
+
+
+def _mp_context():
+    """forkserver no POSIX (processos limpos mesmo com as threads de I/O rodando), spawn no Windows"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class ParsePool:
+    """Pool de processos de parse alimentado pelas threads de I/O
+    
+    Cada corpo de até slot_size bytes é copiado uma vez para um bloco de
+    memória compartilhada livre e o processo de parse lê dali; corpos
+    maiores (ou sem bloco livre) seguem junto com a tarefa. slot_size=None
+    desativa a memória compartilhada.
+    """
+    
+    def __init__(self, workers: Optional[int] = None, slot_size: Optional[int] = 1024 * 1024,
+                 slots: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.slot_size = slot_size
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=_mp_context(), initializer=_init_worker)
+        
+        self._lock = threading.Lock()
+        self._segments: List[shared_memory.SharedMemory] = []
+        if slot_size:
+            # Dois blocos por processo: um sendo lido e o próximo já preenchido
+            for _ in range(slots or self.workers * 2):
+                self._segments.append(shared_memory.SharedMemory(create=True, size=slot_size))
+        self._free = list(self._segments)
+        
+        self.submitted = 0
+        self.shared = 0
+        self.inline = 0
+        self.bytes_sent = 0
+        self.worker_time = 0.0
+    
+    def submit(self, body: bytes, selectors: Optional[Dict], backend: str,
+               filters: Optional[Dict] = None) -> Future:
+        """Envia o corpo para um processo de parse; o Future resolve para um ParsedPage"""
+        segment = None
+        if self.slot_size and len(body) <= self.slot_size:
+            with self._lock:
+                segment = self._free.pop() if self._free else None
+        
+        if segment is not None:
+            segment.buf[:len(body)] = body
+            payload = (segment.name, len(body))
+        else:
+            payload = body
+        
+        try:
+            future = self._executor.submit(parse_page, payload, selectors, backend, filters)
+        except Exception:
+            if segment is not None:
+                self._release(segment)
+            raise
+        
+        with self._lock:
+            self.submitted += 1
+            self.bytes_sent += len(body)
+            if segment is not None:
+                self.shared += 1
+            else:
+                self.inline += 1
+        future.add_done_callback(lambda done: self._finished(done, segment))
+        return future
+    
+    def parse(self, body: bytes, selectors: Optional[Dict], backend: str,
+              filters: Optional[Dict] = None) -> ParsedPage:
+        """Envia o corpo e espera o resultado (a thread de I/O espera sem segurar o GIL)"""
+        return self.submit(body, selectors, backend, filters).result()
+    
+    def _finished(self, future: Future, segment: Optional[shared_memory.SharedMemory]):
+        """Libera o bloco da página e soma o tempo gasto no processo de parse"""
+        if segment is not None:
+            self._release(segment)
+        if not future.cancelled() and future.exception() is None:
+            page = future.result()
+            with self._lock:
+                self.worker_time += page.prefilter_time + page.parse_time + page.match_time + page.text_time
+    
+    def _release(self, segment: shared_memory.SharedMemory):
+        """Devolve o bloco à lista de livres"""
+        with self._lock:
+            self._free.append(segment)
+    
+    def close(self):
+        """Encerra os processos e apaga os blocos de memória compartilhada"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+        self._free = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def get_statistics(self) -> Dict:
+        """Páginas enviadas (por memória compartilhada ou junto da tarefa) e tempo nos processos"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'pages': self.submitted,
+                'shared_memory': self.shared,
+                'inline': self.inline,
+                'bytes': self.bytes_sent,
+                'worker_time': round(self.worker_time, 4),
+                'avg_ms_per_page': round(self.worker_time / self.submitted * 1000, 3) if self.submitted else 0.0
+            }
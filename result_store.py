@@ -0,0 +1,233 @@
+"""
+Armazenamento de resultados com orçamento de memória
+Os resultados mais recentes ficam na memória; quando o orçamento estoura,
+os mais antigos são gravados (pickle) em um arquivo de segmento temporário
+em disco e lidos de volta sob demanda, com a mesma interface de uma lista.
+URLs, links e imagens repetidos entre resultados são deduplicados por uma
+tabela de strings do próprio ResultStore
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from array import array
+from collections import deque
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Orçamento padrão de memória dos resultados
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# Campos de URL deduplicados pela tabela de strings (str ou lista de str)
+SHARED_FIELDS = ('url', 'links', 'images')
+
+
+def _estimate(value) -> int:
+    """Tamanho aproximado de um valor em bytes (strings, listas, arrays, dicts)"""
+    if isinstance(value, (str, bytes)):
+        return len(value) + 49
+    if isinstance(value, array):
+        return value.itemsize * len(value) + 64
+    if isinstance(value, (list, tuple)):
+        return 56 + sum(8 + _estimate(item) for item in value)
+    if isinstance(value, dict):
+        return 232 + sum(8 + _estimate(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+def estimate_size(item) -> int:
+    """Tamanho aproximado de um resultado (CrawlResult com __slots__ ou dict)"""
+    slots = getattr(type(item), '__slots__', None)
+    if slots:
+        return 16 + 8 * len(slots) + sum(_estimate(getattr(item, slot)) for slot in slots)
+    return _estimate(item)
+
+
+class StringTable:
+    """Tabela de strings: valores iguais passam a ser o mesmo objeto
+    
+    Ao contrário de sys.intern, a tabela pertence a quem a criou e é
+    esvaziada com clear(). Ao passar de max_bytes ela recomeça vazia; as
+    strings já compartilhadas continuam nos resultados e são liberadas
+    pelo refcount normalmente.
+    """
+    
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._strings: Dict[str, str] = {}
+    
+    def share(self, value: str) -> Tuple[str, int]:
+        """Retorna (string compartilhada, bytes economizados em relação a value)"""
+        shared = self._strings.get(value)
+        if shared is not None:
+            return shared, (_estimate(value) if shared is not value else 0)
+        if self.max_bytes is not None and self.bytes >= self.max_bytes:
+            self.clear()
+        self._strings[value] = value
+        self.bytes += _estimate(value) + 16
+        return value, 0
+    
+    def clear(self):
+        """Esvazia a tabela"""
+        self._strings = {}
+        self.bytes = 0
+    
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+class ResultStore:
+    """Lista de resultados limitada por memória, com despejo para disco
+    
+    Suporta append, extend, len, iteração e indexação (inclusive fatias e
+    índices negativos). Os índices não mudam quando um resultado vai para
+    o disco, então quem só usa a interface de lista não percebe a troca.
+    max_memory_bytes=None desativa o limite. As strings de SHARED_FIELDS
+    são deduplicadas entre os resultados (listas alteradas no lugar).
+    """
+    
+    def __init__(self, max_memory_bytes: Optional[int] = DEFAULT_MEMORY_BUDGET,
+                 spill_dir: Optional[str] = None):
+        self.max_memory_bytes = max_memory_bytes
+        self.spill_dir = spill_dir
+        
+        self._lock = threading.RLock()
+        self._memory = deque()  # (resultado, tamanho estimado)
+        self._memory_bytes = 0
+        # Limitada a uma fração do orçamento, já que não sai da memória com o despejo
+        self.strings = StringTable((max_memory_bytes or DEFAULT_MEMORY_BUDGET) // 4)
+        
+        # Segmento em disco: registros pickle um após o outro e o offset de cada um
+        self._segment = None
+        self._offsets = array('Q')
+        self._end = 0
+    
+    def append(self, result):
+        """Adiciona um resultado, despejando os mais antigos se o orçamento estourar"""
+        with self._lock:
+            size = estimate_size(result) - self._share_strings(result)
+            self._memory.append((result, size))
+            self._memory_bytes += size
+            if self.max_memory_bytes is not None:
+                # O resultado mais recente sempre fica na memória
+                while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+                    self._spill(*self._memory.popleft())
+    
+    def _share_strings(self, result) -> int:
+        """Troca as strings de SHARED_FIELDS pelas da tabela; retorna os bytes economizados"""
+        saved = 0
+        is_dict = isinstance(result, dict)
+        for field in SHARED_FIELDS:
+            value = result.get(field) if is_dict else getattr(result, field, None)
+            if isinstance(value, str):
+                shared, bytes_saved = self.strings.share(value)
+                saved += bytes_saved
+                if is_dict:
+                    result[field] = shared
+                else:
+                    setattr(result, field, shared)
+            elif isinstance(value, list):
+                for i, item in enumerate(value):
+                    if isinstance(item, str):
+                        value[i], bytes_saved = self.strings.share(item)
+                        saved += bytes_saved
+        return saved
+    
+    def extend(self, results: Iterable):
+        """Adiciona vários resultados"""
+        for result in results:
+            self.append(result)
+    
+    def _spill(self, result, size: int):
+        """Grava um resultado no fim do segmento (chamar com o lock)"""
+        if self._segment is None:
+            if self.spill_dir:
+                os.makedirs(self.spill_dir, exist_ok=True)
+            # Apagado automaticamente ao ser fechado
+            self._segment = tempfile.TemporaryFile(prefix='crawl_results_', suffix='.seg', dir=self.spill_dir)
+        
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        self._segment.seek(self._end)
+        self._segment.write(data)
+        self._offsets.append(self._end)
+        self._end += len(data)
+        self._memory_bytes -= size
+    
+    def _load(self, index: int):
+        """Lê de volta um resultado do segmento (chamar com o lock)"""
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else self._end
+        self._segment.seek(start)
+        return pickle.loads(self._segment.read(end - start))
+    
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._memory)
+    
+    def __getitem__(self, index):
+        with self._lock:
+            if isinstance(index, slice):
+                return [self[i] for i in range(*index.indices(len(self)))]
+            
+            length = len(self)
+            if index < 0:
+                index += length
+            if not 0 <= index < length:
+                raise IndexError("índice de resultado fora do intervalo")
+            
+            spilled = len(self._offsets)
+            if index < spilled:
+                return self._load(index)
+            return self._memory[index - spilled][0]
+    
+    def __iter__(self) -> Iterator:
+        # Por índice: resultados despejados durante a iteração continuam na mesma posição
+        index = 0
+        while True:
+            with self._lock:
+                if index >= len(self):
+                    return
+                result = self[index]
+            yield result
+            index += 1
+    
+    def __repr__(self):
+        return f"ResultStore({len(self)} resultados, {self.spilled} em disco)"
+    
+    @property
+    def in_memory(self) -> int:
+        """Quantidade de resultados mantidos na memória"""
+        return len(self._memory)
+    
+    @property
+    def spilled(self) -> int:
+        """Quantidade de resultados gravados no segmento em disco"""
+        return len(self._offsets)
+    
+    def clear(self):
+        """Remove todos os resultados e apaga o segmento em disco"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._offsets = array('Q')
+            self._end = 0
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+            self.strings.clear()
+    
+    close = clear
+    
+    def get_statistics(self) -> Dict:
+        """Resultados na memória e em disco e bytes usados por cada parte"""
+        with self._lock:
+            return {
+                'total': len(self),
+                'in_memory': len(self._memory),
+                'spilled': len(self._offsets),
+                'memory_bytes': self._memory_bytes,
+                'disk_bytes': self._end,
+                'shared_strings': len(self.strings),
+                'max_memory_bytes': self.max_memory_bytes
+            }
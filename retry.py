@@ -0,0 +1,152 @@
+"""
+Novas tentativas com backoff exponencial e jitter
+Decide quais falhas valem uma nova tentativa (timeouts, conexões
+derrubadas, 429/5xx temporários), calcula a espera de cada tentativa e
+agenda as URLs para mais tarde sem prender um worker durante a espera
+"""
+
+import heapq
+import http.client
+import itertools
+import json
+import random
+import socket
+import time
+import urllib.error
+from typing import List, Optional
+
+try:
+    import requests
+except ImportError:  # SimpleCrawler funciona só com a biblioteca padrão
+    requests = None
+
+# Respostas temporárias que costumam dar certo na próxima tentativa
+RETRY_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+
+_RETRYABLE_ERRORS = (TimeoutError, ConnectionError, socket.timeout, http.client.IncompleteRead,
+                     http.client.RemoteDisconnected)
+if requests is not None:
+    _RETRYABLE_ERRORS += (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+class RetryLater(Exception):
+    """A tentativa falhou de forma temporária; tente de novo depois de delay segundos"""
+    
+    def __init__(self, delay: float, error: Exception):
+        super().__init__(f"nova tentativa em {delay:.2f}s: {error}")
+        self.delay = delay
+        self.error = error
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """Status HTTP de uma exceção de resposta (requests, urllib ou AsyncFetcher)"""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None) if response is not None else None
+    if status is None:
+        status = getattr(error, 'status_code', None)
+    if status is None and isinstance(error, urllib.error.HTTPError):
+        status = error.code
+    return status if isinstance(status, int) else None
+
+
+def error_retry_after(error: Exception) -> Optional[str]:
+    """Valor do cabeçalho Retry-After de uma exceção de resposta, se houver"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) if response is not None else getattr(error, 'headers', None)
+    if headers is None:
+        return None
+    return headers.get('Retry-After') or headers.get('retry-after')
+
+
+class RetryPolicy:
+    """Quantas vezes e quando tentar de novo uma URL
+    
+    A espera da tentativa n é sorteada entre 0 e min(max_delay,
+    base_delay * 2^n) ("full jitter"), para que workers que falharam juntos
+    não voltem todos ao mesmo tempo; um Retry-After maior é respeitado.
+    max_total_time limita o tempo total gasto com uma URL.
+    """
+    
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 30.0,
+                 max_total_time: float = 120.0, retry_statuses=RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_total_time = max_total_time
+        self.retry_statuses = tuple(retry_statuses)
+        self._random = random.Random()
+    
+    def is_retryable(self, error: Exception) -> bool:
+        """Indica se a falha é temporária (timeout, conexão, 429/5xx)"""
+        status = error_status(error)
+        if status is not None:
+            return status in self.retry_statuses
+        if isinstance(error, urllib.error.URLError):
+            # URLError embrulha a falha de rede original em reason
+            return isinstance(error.reason, _RETRYABLE_ERRORS)
+        return isinstance(error, _RETRYABLE_ERRORS)
+    
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Espera antes da tentativa attempt + 1 (attempt começa em 0)"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** attempt)
+        delay = self._random.uniform(0, ceiling)
+        if retry_after:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+    
+    def next_delay(self, error: Exception, attempt: int, started: float,
+                   retry_after: Optional[float] = None) -> Optional[float]:
+        """Espera até a próxima tentativa, ou None se a URL deve ser abandonada
+        
+        started é o time.monotonic() da primeira tentativa da URL.
+        """
+        if attempt >= self.max_retries or not self.is_retryable(error):
+            return None
+        delay = self.backoff(attempt, retry_after)
+        if time.monotonic() - started + delay > self.max_total_time:
+            return None
+        return delay
+
+
+def load_retry_policy(config_file: str = 'config.json', **kwargs) -> RetryPolicy:
+    """Cria a política com o max_retries de default_settings do config.json"""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            settings = json.load(f).get('default_settings', {})
+    except (OSError, ValueError):
+        settings = {}
+    kwargs.setdefault('max_retries', settings.get('max_retries', 3))
+    return RetryPolicy(**kwargs)
+
+
+class RetryQueue:
+    """Fila de tarefas agendadas para depois do backoff (não é thread-safe)
+    
+    O laço de despacho continua atendendo outras URLs e só devolve a
+    tarefa ao pool quando o horário dela chega.
+    """
+    
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+    
+    def push(self, task, delay: float):
+        """Agenda a tarefa para daqui a delay segundos"""
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), task))
+    
+    def pop_due(self) -> List:
+        """Remove e retorna as tarefas cujo horário já chegou"""
+        now = time.monotonic()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[2])
+        return due
+    
+    def next_due_in(self) -> Optional[float]:
+        """Segundos até a próxima tarefa agendada (None se a fila estiver vazia)"""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+    
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -0,0 +1,187 @@
+"""
+Cache de robots.txt por origem (esquema + host)
+Evita baixar o robots.txt a cada página, com TTL, cache negativo
+para falhas e persistência em disco entre execuções
+"""
+
+import json
+import os
+import threading
+import time
+import urllib.parse
+from urllib.robotparser import RobotFileParser
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class RobotsCache:
+    """Cache thread-safe de regras de robots.txt por origem"""
+    
+    def __init__(self, ttl: float = 86400, error_ttl: float = 3600,
+                 cache_file: Optional[str] = None, autosave_every: int = 100):
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.cache_file = cache_file
+        self.autosave_every = autosave_every
+        
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        
+        self._entries: Dict[str, Dict] = {}
+        self._parsers: Dict[str, RobotFileParser] = {}
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._dirty = 0
+        
+        if cache_file:
+            self.load()
+    
+    @staticmethod
+    def origin(url: str) -> str:
+        """Retorna a origem (esquema://host[:porta]) de uma URL"""
+        parsed = urllib.parse.urlsplit(url)
+        return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+    
+    def can_fetch(self, url: str, user_agent: str,
+                  fetch: Callable[[str], Tuple[int, str]]) -> bool:
+        """Verifica se a URL pode ser acessada, baixando o robots.txt só quando necessário
+        
+        fetch recebe a URL do robots.txt e retorna (status_code, texto).
+        """
+        parser = self._get_parser(url, fetch)
+        return parser.can_fetch(user_agent, url)
+    
+    def crawl_delay(self, url: str, user_agent: str = '*') -> Optional[float]:
+        """Retorna o Crawl-delay já conhecido para a origem da URL (sem baixar nada)"""
+        with self._lock:
+            parser = self._parsers.get(self.origin(url))
+        if parser is None:
+            return None
+        delay = parser.crawl_delay(user_agent)
+        return float(delay) if delay is not None else None
+    
+    def sitemaps(self, url: str) -> List[str]:
+        """Retorna as linhas Sitemap: conhecidas para a origem da URL"""
+        with self._lock:
+            entry = self._entries.get(self.origin(url))
+        return list(entry.get('sitemaps', [])) if entry else []
+    
+    def _get_parser(self, url: str, fetch: Callable[[str], Tuple[int, str]]) -> RobotFileParser:
+        """Obtém o parser da origem, buscando o robots.txt se estiver ausente ou expirado"""
+        origin = self.origin(url)
+        
+        with self._lock:
+            parser = self._valid_parser(origin)
+            if parser is not None:
+                self.hits += 1
+                return parser
+            fetch_lock = self._fetch_locks.setdefault(origin, threading.Lock())
+        
+        # Um único download por origem, mesmo com vários workers concorrentes
+        with fetch_lock:
+            with self._lock:
+                parser = self._valid_parser(origin)
+                if parser is not None:
+                    self.hits += 1
+                    return parser
+                self.misses += 1
+            
+            entry = self._download(origin, fetch)
+            
+            with self._lock:
+                self._entries[origin] = entry
+                parser = self._build_parser(entry)
+                self._parsers[origin] = parser
+                self._dirty += 1
+                should_save = self.cache_file and self._dirty >= self.autosave_every
+        
+        if should_save:
+            self.save()
+        
+        return parser
+    
+    def _valid_parser(self, origin: str) -> Optional[RobotFileParser]:
+        """Retorna o parser da origem se a entrada ainda não expirou (chamar com o lock)"""
+        entry = self._entries.get(origin)
+        if entry is None or entry['expires_at'] <= time.time():
+            return None
+        parser = self._parsers.get(origin)
+        if parser is None:
+            parser = self._build_parser(entry)
+            self._parsers[origin] = parser
+        return parser
+    
+    def _download(self, origin: str, fetch: Callable[[str], Tuple[int, str]]) -> Dict:
+        """Baixa o robots.txt da origem e monta a entrada do cache"""
+        now = time.time()
+        try:
+            status_code, text = fetch(urllib.parse.urljoin(origin, '/robots.txt'))
+        except Exception:
+            # Cache negativo: sem robots.txt acessível, permite por padrão
+            with self._lock:
+                self.errors += 1
+            return {'status': None, 'text': '', 'sitemaps': [],
+                    'fetched_at': now, 'expires_at': now + self.error_ttl}
+        
+        if status_code >= 500:
+            ttl = self.error_ttl
+        else:
+            ttl = self.ttl
+        
+        if status_code >= 400:
+            text = ''
+        
+        entry = {'status': status_code, 'text': text, 'sitemaps': [],
+                 'fetched_at': now, 'expires_at': now + ttl}
+        entry['sitemaps'] = self._build_parser(entry).site_maps() or []
+        return entry
+    
+    @staticmethod
+    def _build_parser(entry: Dict) -> RobotFileParser:
+        """Monta um RobotFileParser a partir de uma entrada do cache"""
+        parser = RobotFileParser()
+        status = entry.get('status')
+        if status in (401, 403):
+            parser.disallow_all = True
+            parser.modified()
+        elif status is None or status >= 400:
+            parser.allow_all = True
+            parser.modified()
+        else:
+            parser.parse(entry.get('text', '').splitlines())
+        return parser
+    
+    def get_statistics(self) -> Dict:
+        """Retorna contadores de acertos e falhas do cache"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'fetch_errors': self.errors,
+                'entries': len(self._entries)
+            }
+    
+    def load(self):
+        """Carrega as entradas salvas em disco"""
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            self._entries.update(entries)
+    
+    def save(self):
+        """Salva as entradas em disco de forma atômica"""
+        if not self.cache_file:
+            return
+        with self._lock:
+            entries = dict(self._entries)
+            self._dirty = 0
+        
+        temp_file = f"{self.cache_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(temp_file, self.cache_file)
@@ -0,0 +1,234 @@
+"""
+Utilitários de Selenium
+Pool de WebDrivers reutilizáveis para renderizar páginas com JavaScript
+sem abrir e fechar o Chrome a cada URL
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+WAIT_CONDITIONS = ('ready_state', 'selector', 'network_idle', 'dom_stable', 'sleep')
+
+# Número de recursos carregados e requisições fetch/XHR ainda abertas
+_NETWORK_STATE_JS = """
+if (window.__crawlerPending === undefined) {
+    window.__crawlerPending = 0;
+    var origFetch = window.fetch;
+    if (origFetch) {
+        window.fetch = function() {
+            window.__crawlerPending++;
+            return origFetch.apply(this, arguments).finally(function() { window.__crawlerPending--; });
+        };
+    }
+    var origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        window.__crawlerPending++;
+        this.addEventListener('loadend', function() { window.__crawlerPending--; });
+        return origSend.apply(this, arguments);
+    };
+}
+return [document.readyState, performance.getEntriesByType('resource').length, window.__crawlerPending];
+"""
+
+# Assinatura barata do DOM: número de elementos e tamanho do texto
+_DOM_STATE_JS = """
+return [document.getElementsByTagName('*').length,
+        document.body ? document.body.innerHTML.length : 0];
+"""
+
+
+def get_driver_path() -> str:
+    """Resolve o binário do ChromeDriver uma única vez por processo"""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+def create_chrome_driver(user_agent: Optional[str] = None):
+    """Cria um Chrome headless com as opções padrão do crawler"""
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    if user_agent:
+        chrome_options.add_argument(f'--user-agent={user_agent}')
+    
+    service = Service(get_driver_path())
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+
+def wait_until_ready(driver, wait_for: str = 'ready_state', timeout: float = 3,
+                     selector: Optional[str] = None, idle_time: float = 0.5,
+                     poll_interval: float = 0.1) -> bool:
+    """Aguarda a página ficar pronta, retornando assim que a condição é satisfeita
+    
+    wait_for pode ser:
+    - 'ready_state': document.readyState == 'complete'
+    - 'selector': o seletor CSS informado existe na página
+    - 'network_idle': documento completo e sem novos recursos nem fetch/XHR
+      pendentes durante idle_time segundos
+    - 'dom_stable': DOM sem mudanças durante idle_time segundos
+    - 'sleep': espera fixa de timeout segundos (comportamento antigo)
+    
+    Retorna False se o timeout estourar antes da condição ser satisfeita.
+    """
+    if wait_for not in WAIT_CONDITIONS:
+        raise ValueError(f"Condição de espera inválida: {wait_for}")
+    if wait_for == 'selector' and not selector:
+        raise ValueError("wait_for='selector' exige um seletor CSS")
+    
+    if wait_for == 'sleep':
+        time.sleep(timeout)
+        return True
+    
+    deadline = time.monotonic() + timeout
+    last_state = None
+    stable_since = None
+    
+    while True:
+        if wait_for == 'ready_state':
+            if driver.execute_script('return document.readyState') == 'complete':
+                return True
+        elif wait_for == 'selector':
+            if driver.execute_script('return document.querySelector(arguments[0]) !== null', selector):
+                return True
+        else:
+            if wait_for == 'network_idle':
+                state = driver.execute_script(_NETWORK_STATE_JS)
+                settled = state[0] == 'complete' and state[2] == 0
+            else:
+                state = driver.execute_script(_DOM_STATE_JS)
+                settled = True
+            
+            now = time.monotonic()
+            if not settled or state != last_state:
+                last_state = state
+                stable_since = now if settled else None
+            elif now - stable_since >= idle_time:
+                return True
+        
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll_interval)
+
+
+class WebDriverPool:
+    """Pool thread-safe de WebDrivers de longa duração
+    
+    Os drivers são criados sob demanda até size e reaproveitados entre
+    renderizações. Um driver é reciclado (fechado e recriado depois) ao
+    atingir max_pages_per_driver páginas ou quando uma renderização falha.
+    """
+    
+    def __init__(self, size: int = 2, max_pages_per_driver: int = 50,
+                 driver_factory: Callable = create_chrome_driver):
+        self.size = size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.driver_factory = driver_factory
+        
+        self.created = 0
+        self.recycled = 0
+        self.pages = 0
+        
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._page_counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def acquire(self, timeout: Optional[float] = None):
+        """Obtém um driver livre, criando um novo se o pool ainda não estiver cheio"""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("Nenhum WebDriver livre no pool")
+        if self._closed:
+            self._slots.release()
+            raise RuntimeError("Pool de WebDrivers fechado")
+        
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        try:
+            driver = self.driver_factory()
+        except BaseException:
+            self._slots.release()
+            raise
+        
+        with self._lock:
+            self.created += 1
+            self._page_counts[id(driver)] = 0
+        return driver
+    
+    def release(self, driver, failed: bool = False):
+        """Devolve o driver ao pool, reciclando-o se falhou ou atingiu o limite de páginas"""
+        with self._lock:
+            self.pages += 1
+            pages = self._page_counts.get(id(driver), 0) + 1
+            self._page_counts[id(driver)] = pages
+            recycle = failed or self._closed or pages >= self.max_pages_per_driver
+            if recycle:
+                self._page_counts.pop(id(driver), None)
+                self.recycled += 1
+        
+        if recycle:
+            self._quit(driver)
+        else:
+            self._idle.put(driver)
+        self._slots.release()
+    
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """Context manager que empresta um driver e o devolve ao final"""
+        driver = self.acquire(timeout)
+        failed = False
+        try:
+            yield driver
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.release(driver, failed)
+    
+    @staticmethod
+    def _quit(driver):
+        """Fecha o driver ignorando erros de um navegador que já caiu"""
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    def get_statistics(self) -> Dict:
+        """Retorna contadores de drivers criados, reciclados e páginas renderizadas"""
+        with self._lock:
+            return {
+                'size': self.size,
+                'drivers_created': self.created,
+                'drivers_recycled': self.recycled,
+                'pages_rendered': self.pages
+            }
+    
+    def close(self):
+        """Fecha todos os drivers ociosos; drivers em uso são fechados ao serem devolvidos"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._page_counts.pop(id(driver), None)
+            self._quit(driver)
@@ -8,11 +8,72 @@ import sys
 import os
 import time
 import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from datetime import datetime
 
 # Adiciona o diretório atual ao path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+def start_local_server(pages, response_delay=0.0, keep_alive=False):
+    """Sobe um servidor HTTP local servindo as páginas informadas
+    
+    pages: dict caminho -> HTML (str) ou tupla (status, headers, corpo)
+    keep_alive=True responde em HTTP/1.1, mantendo a conexão aberta.
+    Retorna (servidor, url_base); servidor.client_ports guarda a porta de
+    origem de cada conexão recebida. Use servidor.shutdown() ao final.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1' if keep_alive else 'HTTP/1.0'
+        
+        def do_GET(self):
+            self.server.client_ports.add(self.client_address[1])
+            if response_delay:
+                time.sleep(response_delay)
+            page = pages.get(self.path)
+            if page is None:
+                page = (404, {}, "<html><body>Not found</body></html>")
+            elif isinstance(page, str):
+                page = (200, {}, page)
+            status, headers, body = page
+            etag = headers.get('ETag')
+            if etag and self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            self.send_response(status)
+            if 'Content-Type' not in headers:
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # cliente parou de ler (ex.: limite de tamanho)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 128
+        
+        def handle_error(self, request, client_address):
+            # Cliente que fecha a conexão keep-alive no meio da resposta não é erro
+            if not isinstance(sys.exc_info()[1], ConnectionError):
+                super().handle_error(request, client_address)
+    
+    server = Server(('127.0.0.1', 0), Handler)
+    server.client_ports = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
 def test_imports():
     """Testa se todas as importações estão funcionando"""
     print("🧪 Testando importações...")
@@ -281,6 +342,1905 @@ def test_selenium():
         print("  (Isso é normal se o Chrome não estiver instalado)")
         return True  # Não falha o teste geral
 
+def test_concurrent_crawl():
+    """Testa o crawling concorrente com pool de workers"""
+    print("\n🧪 Testando crawling concorrente...")
+    
+    try:
+        from web_crawler import WebCrawler
+        
+        pages = {f"/p{i}": f"<html><head><title>Página {i}</title></head><body><p>Texto {i}</p></body></html>" for i in range(6)}
+        server, base_url = start_local_server(pages, response_delay=0.2)
+        
+        try:
+            # Dois hosts distintos apontando para o mesmo servidor
+            port = server.server_address[1]
+            urls = [f"http://{host}:{port}/p{i}" for i in range(3) for host in ('127.0.0.1', 'localhost')]
+            urls += urls[:2]  # URLs repetidas não devem ser processadas duas vezes
+            
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0.1, timeout=5)
+            
+            start_time = time.time()
+            results = crawler.crawl_multiple_urls(urls, max_workers=4, respect_robots=False)
+            duration = time.time() - start_time
+            
+            if len(results) != 6 or len(crawler.visited_urls) != 6:
+                print(f"❌ Esperados 6 resultados, obtidos {len(results)}")
+                return False
+            
+            if [r.url for r in results] != urls[:6]:
+                print("❌ Ordem dos resultados diferente da ordem das URLs")
+                return False
+            
+            print("✓ Crawling concorrente funcionando")
+            print(f"  - {len(results)} páginas em {duration:.2f}s")
+            return duration < 1.2
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste concorrente: {e}")
+        return False
+
+def test_async_crawl():
+    """Testa o crawling assíncrono com asyncio"""
+    print("\n🧪 Testando crawling assíncrono...")
+    
+    try:
+        import asyncio
+        from web_crawler import WebCrawler
+        
+        pages = {f"/a{i}": f"<html><head><title>Async {i}</title></head><body><a href='/a{i + 1}'>próxima</a></body></html>" for i in range(20)}
+        server, base_url = start_local_server(pages, response_delay=0.2)
+        
+        try:
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0, timeout=5)
+            
+            urls = [f"{base_url}/a{i}" for i in range(20)] + [f"{base_url}/a0", f"{base_url}/inexistente"]
+            
+            start_time = time.time()
+            results = asyncio.run(crawler.acrawl_many(urls, concurrency=20, respect_robots=False))
+            duration = time.time() - start_time
+            
+            titles = sorted(r.title for r in results)
+            if len(results) != 20 or titles != sorted(f"Async {i}" for i in range(20)):
+                print(f"❌ Esperados 20 resultados, obtidos {len(results)}")
+                return False
+            
+            # O servidor local faz o papel de proxy HTTP: recebe a URL absoluta
+            proxy_pages = {'http://site.invalid/p': "<html><head><title>Via proxy</title></head></html>"}
+            proxy_server, proxy_url = start_local_server(proxy_pages)
+            try:
+                proxied = WebCrawler()
+                proxied.setup_session(delay=0, timeout=5, proxies={'http': proxy_url})
+                via_proxy = asyncio.run(proxied.acrawl_many(['http://site.invalid/p'], respect_robots=False))
+            finally:
+                proxy_server.shutdown()
+            if [r.title for r in via_proxy] != ['Via proxy']:
+                print("❌ Proxies da sessão ignorados no caminho assíncrono")
+                return False
+            
+            from async_fetcher import AsyncFetcher, SUPPORTED_ENCODINGS
+            if AsyncFetcher._host_header('::1', 8080) != '[::1]:8080':
+                print("❌ Literal IPv6 sem colchetes no Host")
+                return False
+            accept = AsyncFetcher(headers={'Accept-Encoding': 'gzip, deflate, br'}).headers['Accept-Encoding']
+            if ('br' in accept) != ('br' in SUPPORTED_ENCODINGS):
+                print(f"❌ Accept-Encoding anuncia codificação não suportada: {accept}")
+                return False
+            
+            print("✓ Crawling assíncrono funcionando")
+            print(f"  - {len(results)} páginas em {duration:.2f}s")
+            return duration < 2.0
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste assíncrono: {e}")
+        return False
+
+def test_robots_cache():
+    """Testa o cache de robots.txt com Crawl-delay, Sitemap e persistência"""
+    print("\n🧪 Testando cache de robots.txt...")
+    
+    try:
+        import tempfile
+        from web_crawler import WebCrawler
+        
+        robots = "User-agent: *\nDisallow: /privado\nCrawl-delay: 1\nSitemap: http://example.com/sitemap.xml\n"
+        pages = {
+            '/robots.txt': (200, {'Content-Type': 'text/plain'}, robots),
+            '/p1': "<html><title>P1</title></html>",
+            '/p2': "<html><title>P2</title></html>",
+            '/privado': "<html><title>Privado</title></html>"
+        }
+        server, base_url = start_local_server(pages)
+        
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                cache_file = os.path.join(tmp, 'robots_cache.json')
+                
+                crawler = WebCrawler()
+                crawler.setup_session(delay=0, timeout=5)
+                crawler.setup_robots_cache(cache_file=cache_file)
+                
+                start_time = time.time()
+                results = crawler.crawl_multiple_urls([f"{base_url}/p1", f"{base_url}/p2", f"{base_url}/privado"])
+                duration = time.time() - start_time
+                
+                stats = crawler.robots_cache.get_statistics()
+                if len(results) != 2 or stats['misses'] != 1 or stats['hits'] != 2:
+                    print(f"❌ Cache de robots.txt incorreto: {stats}")
+                    return False
+                
+                if duration < 1.0:
+                    print("❌ Crawl-delay não foi respeitado")
+                    return False
+                
+                if crawler.robots_cache.sitemaps(base_url) != ["http://example.com/sitemap.xml"]:
+                    print("❌ Sitemap não registrado")
+                    return False
+                
+                # Nova instância deve reaproveitar o cache salvo em disco
+                crawler2 = WebCrawler()
+                crawler2.setup_robots_cache(cache_file=cache_file)
+                allowed = crawler2.check_robots_txt(f"{base_url}/p3")
+                stats2 = crawler2.robots_cache.get_statistics()
+                if not allowed or stats2['misses'] != 0:
+                    print(f"❌ Cache persistido não reaproveitado: {stats2}")
+                    return False
+            
+            print("✓ Cache de robots.txt funcionando")
+            print(f"  - Acertos: {stats['hits']}, Falhas: {stats['misses']}")
+            return True
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste de robots.txt: {e}")
+        return False
+
+def test_frontier_crawl():
+    """Testa o crawling recursivo com profundidade, escopo e orçamento"""
+    print("\n🧪 Testando crawling recursivo...")
+    
+    try:
+        from web_crawler import WebCrawler
+        
+        pages = {
+            '/': "<html><body><a href='/secao/a'>A</a><a href='secao/b#topo'>B</a>"
+                 "<a href='http://externo.invalid/x'>Externo</a><a href='mailto:x@y.z'>Email</a></body></html>",
+            '/secao/a': "<html><body><a href='../secao/c'>C</a><a href='/'>Home</a></body></html>",
+            '/secao/b': "<html><body><a href='profundo'>Profundo</a></body></html>",
+            '/secao/c': "<html><body>C</body></html>",
+            '/secao/profundo': "<html><body>Profundo</body></html>",
+            '/dir': (301, {'Location': '/dir/'}, ""),
+            '/dir/': "<html><body><a href='filho'>Filho</a></body></html>",
+            '/dir/filho': "<html><body>Filho</body></html>",
+            '/base': "<html><head><base href='/sub/'></head><body><a href='x'>X</a></body></html>",
+            '/sub/x': "<html><body>X</body></html>"
+        }
+        server, base_url = start_local_server(pages)
+        
+        try:
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0, timeout=5)
+            results = crawler.crawl_frontier([f"{base_url}/"], max_depth=1, max_workers=2, respect_robots=False)
+            crawled = sorted(r.url.replace(base_url, '') for r in results)
+            
+            if crawled != ['/', '/secao/a', '/secao/b']:
+                print(f"❌ Páginas inesperadas com max_depth=1: {crawled}")
+                return False
+            
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0, timeout=5)
+            results = crawler.crawl_frontier([f"{base_url}/"], max_depth=3, respect_robots=False)
+            if len(results) != 5:
+                print(f"❌ Esperadas 5 páginas com max_depth=3, obtidas {len(results)}")
+                return False
+            
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0, timeout=5)
+            results = crawler.crawl_frontier([f"{base_url}/"], max_depth=3, max_pages=2, respect_robots=False)
+            if len(results) != 2:
+                print(f"❌ Orçamento de páginas não respeitado: {len(results)}")
+                return False
+            
+            # Links relativos resolvidos contra a URL final e o <base href>
+            for parser in ('html.parser', 'auto'):
+                crawler = WebCrawler(parser=parser)
+                crawler.setup_session(delay=0, timeout=5)
+                results = crawler.crawl_frontier([f"{base_url}/dir", f"{base_url}/base"], max_depth=1,
+                                                 respect_robots=False)
+                crawled = sorted(r.url.replace(base_url, '') for r in results)
+                if crawled != ['/base', '/dir', '/dir/filho', '/sub/x'] or results[0].link_base != f"{base_url}/dir/":
+                    print(f"❌ Links relativos resolvidos contra a URL errada ({parser}): {crawled}")
+                    return False
+            
+            print("✓ Crawling recursivo funcionando")
+            return True
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste de crawling recursivo: {e}")
+        return False
+
+def test_url_canonicalization():
+    """Testa a canonicalização de URLs e o conjunto de fingerprints"""
+    print("\n🧪 Testando canonicalização de URLs...")
+    
+    try:
+        from url_utils import canonicalize_url, VisitedURLSet
+        
+        equivalentes = [
+            ("http://a.com/x?b=1&a=2#frag", "http://A.com/x?a=2&b=1"),
+            ("https://Example.com:443/p?utm_source=x&id=3", "https://example.com/p?id=3"),
+            ("http://example.com", "http://example.com:80/"),
+        ]
+        for url1, url2 in equivalentes:
+            if canonicalize_url(url1) != canonicalize_url(url2):
+                print(f"❌ URLs deveriam ser equivalentes: {url1} / {url2}")
+                return False
+        
+        if canonicalize_url("http://a.com:8080/X") != "http://a.com:8080/X":
+            print("❌ Porta não padrão ou caminho alterados indevidamente")
+            return False
+        
+        visited = VisitedURLSet()
+        for i in range(50000):
+            visited.add(f"https://site{i % 100}.com/pagina/{i}?utm_medium=email")
+        
+        if len(visited) != 50000 or "https://SITE7.com/pagina/7" not in visited or "https://site7.com/pagina/8" in visited:
+            print("❌ Conjunto de fingerprints inconsistente")
+            return False
+        
+        print("✓ Canonicalização de URLs funcionando")
+        print(f"  - 50000 URLs em {visited.fingerprints.memory_usage() / 1024:.0f} KB")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro no teste de canonicalização: {e}")
+        return False
+
+def test_checkpoint_resume():
+    """Testa checkpoints em SQLite e a retomada de um crawling interrompido"""
+    print("\n🧪 Testando checkpoint e retomada...")
+    
+    try:
+        import tempfile
+        from collections import Counter
+        from web_crawler import WebCrawler
+        
+        class CountingPages(dict):
+            hits = Counter()
+            
+            def get(self, key, default=None):
+                self.hits[key] += 1
+                return super().get(key, default)
+        
+        pages = CountingPages({f"/r{i}": f"<html><title>R{i}</title><a href='/r{i + 1}'>next</a></html>" for i in range(8)})
+        server, base_url = start_local_server(pages)
+        
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                db_path = os.path.join(tmp, 'state.db')
+                urls = [f"{base_url}/r{i}" for i in range(5)]
+                
+                crawler = WebCrawler()
+                crawler.setup_session(delay=0, timeout=5)
+                job_id = crawler.enable_checkpoint(db_path, batch_size=1)
+                
+                # Simula uma queda depois de 2 páginas
+                original_crawl_url = crawler.crawl_url
+                
+                def crawl_url_com_falha(url, **kwargs):
+                    if url.endswith('/r2'):
+                        raise KeyboardInterrupt()
+                    return original_crawl_url(url, **kwargs)
+                
+                crawler.crawl_url = crawl_url_com_falha
+                try:
+                    crawler.crawl_multiple_urls(urls, respect_robots=False)
+                except KeyboardInterrupt:
+                    pass
+                
+                crawler2 = WebCrawler()
+                crawler2.setup_session(delay=0, timeout=5)
+                results = crawler2.resume(job_id, db_path)
+                
+                if len(results) != 5 or any(pages.hits[f"/r{i}"] != 1 for i in range(5)):
+                    print(f"❌ Retomada incorreta: {len(results)} resultados, acessos {dict(pages.hits)}")
+                    return False
+                
+                # Modo recursivo: interrompe pelo orçamento e continua depois
+                pages.hits.clear()
+                crawler3 = WebCrawler()
+                crawler3.setup_session(delay=0, timeout=5)
+                job_id = crawler3.enable_checkpoint(db_path)
+                crawler3.crawl_frontier([f"{base_url}/r0"], max_depth=10, max_pages=3, respect_robots=False)
+                
+                crawler4 = WebCrawler()
+                crawler4.setup_session(delay=0, timeout=5)
+                mode, params, pending = crawler4.load_checkpoint(job_id, db_path)
+                if mode != 'frontier' or [url for url, _ in pending] != [f"{base_url}/r3"]:
+                    print(f"❌ Fronteira pendente incorreta: {pending}")
+                    return False
+                
+                # Job da interface gráfica: a retomada usa os filtros gravados no job
+                crawler5 = WebCrawler()
+                job_id = crawler5.enable_checkpoint(db_path)
+                gui_params = {'max_workers': 1, 'kwargs': {'respect_robots': False,
+                                                           'content_filters': {'keywords': ['R4']}}}
+                crawler5.checkpoint.start_job('gui', gui_params, [(f"{base_url}/r{i}", 0) for i in (3, 4)])
+                crawler5.checkpoint.close()
+                
+                crawler6 = WebCrawler()
+                crawler6.setup_session(delay=0, timeout=5)
+                titles = [result.title for result in crawler6.resume(job_id, db_path)]
+                if titles != ['R4']:
+                    print(f"❌ Retomada do job da interface ignorou os filtros salvos: {titles}")
+                    return False
+                
+                # Um ContentFilter compilado é salvo pela configuração; a interface só retoma jobs 'gui'
+                from content_filter import ContentFilter
+                from crawl_state import CrawlState
+                crawler7 = WebCrawler()
+                crawler7.setup_session(delay=0, timeout=5)
+                job_id = crawler7.enable_checkpoint(db_path)
+                crawler7.checkpoint.start_job('frontier', {'kwargs': {}}, [(f"{base_url}/r0", 0)])
+                crawler7.checkpoint.close()
+                crawler7.enable_checkpoint(db_path)
+                crawler7.crawl_multiple_urls([f"{base_url}/r1"], respect_robots=False,
+                                             content_filters=ContentFilter({'keywords': ['R1']}))
+                if CrawlState.latest_job(db_path, mode='gui') is not None or \
+                        CrawlState.latest_job(db_path) != job_id:
+                    print("❌ latest_job não filtrou pelo modo do job")
+                    return False
+            
+            print("✓ Checkpoint e retomada funcionando")
+            return True
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste de checkpoint: {e}")
+        return False
+
+def test_http_cache():
+    """Testa o cache HTTP com requisições condicionais (ETag)"""
+    print("\n🧪 Testando cache HTTP condicional...")
+    
+    try:
+        import tempfile
+        from web_crawler import WebCrawler
+        
+        html = "<html><head><title>Produto</title></head><body><article>Detalhes do produto</article></body></html>"
+        pages = {'/produto': (200, {'ETag': '"v1"'}, html)}
+        server, base_url = start_local_server(pages)
+        
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                db_path = os.path.join(tmp, 'http_cache.db')
+                
+                crawler = WebCrawler()
+                crawler.setup_session(delay=0, timeout=5)
+                crawler.setup_http_cache(db_path)
+                first = crawler.crawl_url(f"{base_url}/produto", respect_robots=False)
+                crawler.http_cache.close()
+                
+                # Re-crawl em outra instância: deve receber 304 e não fazer parse
+                crawler2 = WebCrawler()
+                crawler2.setup_session(delay=0, timeout=5)
+                crawler2.setup_http_cache(db_path)
+                parses = []
+                original_extract = crawler2._extract_html
+                crawler2._extract_html = lambda *args: parses.append(1) or original_extract(*args)
+                second = crawler2.crawl_url(f"{base_url}/produto", respect_robots=False)
+                stats = crawler2.http_cache.get_statistics()
+                crawler2.http_cache.close()
+                
+                if not first or not second or second.content != first.content:
+                    print("❌ Resultado do cache diferente do original")
+                    return False
+                
+                if stats['not_modified'] != 1 or stats['hits'] != 1 or parses:
+                    print(f"❌ Cache condicional não utilizado: {stats}")
+                    return False
+                
+                # Página alterada: 200 com corpo novo é falha, não acerto
+                pages['/produto'] = (200, {'ETag': '"v2"'}, html.replace('Detalhes', 'Novos detalhes'))
+                crawler3 = WebCrawler()
+                crawler3.setup_session(delay=0, timeout=5)
+                crawler3.setup_http_cache(db_path)
+                crawler3.crawl_url(f"{base_url}/produto", respect_robots=False)
+                changed = crawler3.http_cache.get_statistics()
+                crawler3.http_cache.close()
+                if changed['hits'] != 0 or changed['misses'] != 1:
+                    print(f"❌ Resposta 200 contada como acerto do cache: {changed}")
+                    return False
+                
+                # Conteúdo extraído maior após um 304 também respeita o limite de tamanho
+                from http_cache import HTTPCache
+                cache = HTTPCache(os.path.join(tmp, 'pequeno.db'), max_bytes=2000)
+                cache.store("http://a.test/1", '"a"', None, b"a" * 100, 200, 'k', {'content': ''})
+                cache.store("http://a.test/2", '"b"', None, b"b" * 100, 200, 'k', {'content': ''})
+                cache.record_not_modified(cache.get("http://a.test/2"), 'outra', {'content': 'x' * 3000})
+                size = cache.get_statistics()['size_bytes']
+                cache.close()
+                if size > 2000:
+                    print(f"❌ 304 com novo conteúdo extraído passou do limite: {size} bytes")
+                    return False
+            
+            print("✓ Cache HTTP funcionando")
+            print(f"  - Estatísticas: {stats}")
+            return True
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste de cache HTTP: {e}")
+        return False
+
+def test_selenium_pool():
+    """Testa o pool de WebDrivers com drivers simulados (sem Chrome)"""
+    print("\n🧪 Testando pool de WebDrivers...")
+    
+    # Sem try/except: usa assert para a falha aparecer também no pytest
+    from web_crawler import WebCrawler
+    from selenium_utils import WebDriverPool
+    
+    class FakeDriver:
+        ativos = 0
+        
+        def __init__(self):
+            self.page_source = ""
+            self.current_url = ""
+            self.quit_called = False
+        
+        def get(self, url):
+            FakeDriver.ativos += 1
+            try:
+                if FakeDriver.ativos > 2:
+                    raise RuntimeError("Mais drivers em uso do que o tamanho do pool")
+                time.sleep(0.05)
+                self.page_source = f"<html><title>{url}</title></html>"
+                self.current_url = url
+            finally:
+                FakeDriver.ativos -= 1
+        
+        def execute_script(self, script):
+            pass
+        
+        def quit(self):
+            self.quit_called = True
+    
+    crawler = WebCrawler()
+    crawler.selenium_pool = WebDriverPool(size=2, max_pages_per_driver=3, driver_factory=FakeDriver)
+    
+    urls = [f"http://js.invalid/p{i}" for i in range(12)]
+    results = crawler.crawl_many_with_selenium(urls, wait_time=0)
+    stats = crawler.selenium_pool.get_statistics()
+    crawler.close_selenium_pool()
+    
+    assert len(results) == 12 and {r.title for r in results} == set(urls), \
+        f"Renderizações incorretas: {len(results)}"
+    
+    # 12 páginas / 3 por driver = 4 drivers criados e reciclados
+    assert stats['drivers_created'] == 4 and stats['drivers_recycled'] == 4, \
+        f"Reciclagem de drivers incorreta: {stats}"
+    
+    print("✓ Pool de WebDrivers funcionando")
+    print(f"  - Estatísticas: {stats}")
+    return True
+
+def test_selenium_waits():
+    """Testa as esperas por prontidão do Selenium com um driver simulado"""
+    print("\n🧪 Testando esperas por prontidão do Selenium...")
+    
+    try:
+        from selenium_utils import wait_until_ready
+        
+        class FakeDriver:
+            """Página que fica pronta 0.2s depois de carregar"""
+            
+            def __init__(self):
+                self.loaded_at = time.time()
+            
+            def ready(self):
+                return time.time() - self.loaded_at >= 0.2
+            
+            def execute_script(self, script, *args):
+                if 'readyState' in script and 'resource' not in script:
+                    return 'complete' if self.ready() else 'loading'
+                if 'querySelector' in script:
+                    return self.ready() and args[0] == '#app'
+                if 'resource' in script:
+                    return ['complete' if self.ready() else 'loading', 5, 0]
+                # DOM cresce até ficar pronto
+                size = int((time.time() - self.loaded_at) * 100)
+                return [10, 200 if self.ready() else size]
+        
+        for wait_for, selector in [('ready_state', None), ('selector', '#app'),
+                                   ('network_idle', None), ('dom_stable', None)]:
+            start = time.time()
+            ready = wait_until_ready(FakeDriver(), wait_for, timeout=3, selector=selector,
+                                     idle_time=0.2, poll_interval=0.02)
+            elapsed = time.time() - start
+            if not ready or elapsed > 1.0:
+                print(f"❌ Espera '{wait_for}' não retornou cedo: {ready}, {elapsed:.2f}s")
+                return False
+            print(f"  - {wait_for}: {elapsed:.2f}s")
+        
+        start = time.time()
+        ready = wait_until_ready(FakeDriver(), 'selector', timeout=0.3, selector='#inexistente',
+                                 poll_interval=0.02)
+        if ready or time.time() - start < 0.3:
+            print("❌ Timeout da espera por seletor não respeitado")
+            return False
+        
+        print("✓ Esperas por prontidão funcionando")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro no teste de esperas do Selenium: {e}")
+        return False
+
+def test_parser_backends():
+    """Testa se todos os backends de parse produzem a mesma extração"""
+    print("\n🧪 Testando backends de parse...")
+    
+    try:
+        from web_crawler import WebCrawler
+        from html_parsers import available_backends, parse_html
+        
+        html = """<html><head><title> Loja &amp; Café </title>
+        <meta name="description" content="Produtos artesanais"></head>
+        <body><!-- menu --><script>var x = 1;</script><template><p>Modelo oculto</p></template>
+        <article><h1>Café especial</h1><p>Grãos <b>selecionados</b> à mão.</p><style>p {}</style></article>
+        <a href="/a">A</a><a href="/b">B</a><img src="/c.png"></body></html>""".encode('utf-8')
+        selectors_list = [{}, {'title': ['h1'], 'content': ['p:first-of-type', 'article']}]
+        
+        crawler = WebCrawler()
+        for selectors in selectors_list:
+            outputs = {}
+            for backend in available_backends():
+                content = crawler.extract_content(parse_html(html, backend), selectors)
+                content['links'] = sorted(content['links'])
+                content['images'] = sorted(content['images'])
+                outputs[backend] = content
+            
+            reference = outputs['html.parser']
+            for backend, content in outputs.items():
+                if content != reference:
+                    print(f"❌ {backend} difere de html.parser: {content} != {reference}")
+                    return False
+        
+        # Elementos dentro de <template> existem em todos os backends, mas sem texto
+        for backend in available_backends():
+            texts = [element.get_text() for element in parse_html(html, backend).select('p:first-of-type')]
+            if texts != ['', 'Grãos selecionados à mão.']:
+                print(f"❌ {backend}: texto dentro de <template> diferente dos outros backends: {texts}")
+                return False
+        
+        print(f"✓ Backends equivalentes: {', '.join(available_backends())}")
+        print(f"  - Backend padrão (auto): {crawler.parser}")
+        
+        # Backend escolhido por chamada
+        server, base_url = start_local_server({'/': html.decode('utf-8')})
+        try:
+            crawler.setup_session(delay=0, timeout=5)
+            result = crawler.crawl_url(f"{base_url}/", respect_robots=False, parser='html.parser')
+            if not result or result.title != 'Loja & Café':
+                print("❌ crawl_url com parser='html.parser' falhou")
+                return False
+        finally:
+            server.shutdown()
+        
+        print("✓ Backends de parse funcionando")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro no teste de backends de parse: {e}")
+        return False
+
+def test_extraction_plan():
+    """Testa os planos de extração compilados e os presets do config.json"""
+    print("\n🧪 Testando planos de extração...")
+    
+    try:
+        from web_crawler import WebCrawler
+        from html_parsers import available_backends, parse_html
+        
+        html = """<html><head><title>Loja</title><base href="/loja/"></head><body>
+        <h1 class="product-title">Cafeteira</h1>
+        <div class="product-description">Prepara café coado</div>
+        <div class="product-info"><p>Capacidade de <b>1 litro</b></p></div>
+        <a href="/a">A</a><a href="/a">A de novo</a><img src="/foto.png"></body></html>"""
+        
+        crawler = WebCrawler()
+        presets = crawler.load_presets('config.json')
+        if set(presets) != {'ecommerce', 'blog', 'social'}:
+            print(f"❌ Presets não carregados: {list(presets)}")
+            return False
+        
+        for backend in available_backends():
+            content = crawler.extract_content(parse_html(html, backend), presets['ecommerce'])
+            expected = {
+                'title': 'Cafeteira',
+                'description': 'Prepara café coado',
+                'content': 'Capacidade de1 litro',
+                'links': ['/a'],
+                'images': ['/foto.png'],
+                'base': '/loja/'
+            }
+            if content != expected:
+                print(f"❌ Extração com {backend} incorreta: {content}")
+                return False
+        
+        # Seletor inválido falha ao compilar, antes de qualquer requisição
+        try:
+            crawler.crawl_multiple_urls(["http://127.0.0.1:9/"], selectors={'content': ['div[[']})
+            print("❌ Seletor inválido não foi rejeitado")
+            return False
+        except ValueError as e:
+            print(f"✓ Seletor inválido rejeitado na compilação: {e}")
+        
+        stats = crawler.get_extraction_plan(presets['ecommerce']).get_statistics()
+        if stats['pages'] < 1:
+            print(f"❌ Estatísticas do plano não registradas: {stats}")
+            return False
+        
+        print("✓ Planos de extração funcionando")
+        print(f"  - Estatísticas: {stats}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro no teste de planos de extração: {e}")
+        return False
+
+def test_content_limits():
+    """Testa o limite de tamanho do corpo e o descarte de respostas não-HTML"""
+    print("\n🧪 Testando limite de tamanho e tipo de conteúdo...")
+    
+    try:
+        import asyncio
+        from web_crawler import WebCrawler
+        from crawler_simples import SimpleCrawler
+        
+        big_page = "<html><head><title>Grande</title></head><body>" + "<p>texto</p>" * 100000 + "</body></html>"
+        binary = (200, {'Content-Type': 'application/zip'}, b'\0' * (5 * 1024 * 1024))
+        server, base_url = start_local_server({'/grande': big_page, '/arquivo.zip': binary})
+        limit = 100000
+        
+        try:
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0, timeout=5, max_content_length=limit)
+            page = crawler.crawl_url(f"{base_url}/grande", respect_robots=False)
+            skipped = crawler.crawl_url(f"{base_url}/arquivo.zip", respect_robots=False)
+            
+            if not page or not page.truncated or page.title != 'Grande' or skipped is not None:
+                print("❌ WebCrawler não aplicou o limite/tipo de conteúdo")
+                return False
+            if crawler.bytes_downloaded > limit or crawler.non_html_skipped != 1:
+                print(f"❌ Bytes lidos além do limite: {crawler.bytes_downloaded}")
+                return False
+            print(f"✓ WebCrawler: {crawler.bytes_downloaded} bytes lidos, não-HTML descartado")
+            
+            async_crawler = WebCrawler()
+            async_crawler.setup_session(delay=0, timeout=5, max_content_length=limit)
+            results = asyncio.run(async_crawler.acrawl_many(
+                [f"{base_url}/grande", f"{base_url}/arquivo.zip"], respect_robots=False))
+            if len(results) != 1 or not results[0].truncated or async_crawler.bytes_downloaded > limit:
+                print("❌ Crawling assíncrono não aplicou o limite/tipo de conteúdo")
+                return False
+            print("✓ Crawling assíncrono respeitando o limite")
+            
+            simple = SimpleCrawler()
+            simple.max_content_length = limit
+            result = simple.crawl_url(f"{base_url}/grande", delay=0, timeout=5)
+            skipped = simple.crawl_url(f"{base_url}/arquivo.zip", delay=0, timeout=5)
+            if not result or not result['truncated'] or skipped is not None:
+                print("❌ SimpleCrawler não aplicou o limite/tipo de conteúdo")
+                return False
+            print("✓ SimpleCrawler respeitando o limite")
+            
+            return True
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste de limite de conteúdo: {e}")
+        return False
+
+def test_streaming_export():
+    """Testa os exportadores incrementais (JSONL, CSV, Excel e JSON)"""
+    print("\n🧪 Testando exportação incremental...")
+    
+    try:
+        import csv
+        import tempfile
+        from openpyxl import load_workbook
+        from web_crawler import WebCrawler
+        from crawler_simples import SimpleCrawler
+        
+        pages = {f'/p{i}': f"<html><title>Página {i}</title><body><p>Texto {i}</p></body></html>"
+                 for i in range(20)}
+        server, base_url = start_local_server(pages)
+        urls = [f"{base_url}/p{i}" for i in range(20)]
+        
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                crawler = WebCrawler()
+                crawler.setup_session(delay=0, timeout=5)
+                jsonl_path = os.path.join(tmp, 'resultados.jsonl')
+                crawler.open_export(jsonl_path, 'jsonl', keep_results=False, flush_every=5)
+                csv_sink = crawler.open_export(os.path.join(tmp, 'resultados.csv'), 'csv', keep_results=False)
+                
+                results = crawler.crawl_multiple_urls(urls[:10], max_workers=4, respect_robots=False)
+                
+                # Já gravado em disco antes do close (flush a cada 5 resultados)
+                with open(jsonl_path, encoding='utf-8') as f:
+                    lines_before_close = len(f.readlines())
+                crawler.crawl_multiple_urls(urls[10:], max_workers=4, respect_robots=False)
+                crawler.close_exports()
+                
+                if results or crawler.results or lines_before_close < 10:
+                    print(f"❌ Resultados retidos em memória ou não gravados: {lines_before_close}")
+                    return False
+                
+                with open(jsonl_path, encoding='utf-8') as f:
+                    titles = {json.loads(line)['Título'] for line in f}
+                with open(csv_sink.filename, encoding='utf-8') as f:
+                    csv_rows = list(csv.DictReader(f))
+                if len(titles) != 20 or len(csv_rows) != 20:
+                    print(f"❌ Exportação incompleta: {len(titles)} JSONL, {len(csv_rows)} CSV")
+                    return False
+                stats = crawler.get_statistics()
+                if stats.get('total_pages') != 0 or stats['connections']['new_connections'] < 1 or \
+                        stats['total_urls_visited'] != 20:
+                    print(f"❌ Estatísticas perdidas sem resultados retidos: {stats}")
+                    return False
+                print("✓ JSONL e CSV gravados durante o crawling sem reter resultados (estatísticas mantidas)")
+                
+                # Exportação final (export_results) em Excel e JSON
+                crawler.crawl_url(f"{base_url}/extra", respect_robots=False)
+                crawler2 = WebCrawler()
+                crawler2.setup_session(delay=0, timeout=5)
+                crawler2.crawl_multiple_urls(urls[:3], respect_robots=False)
+                excel_path = os.path.join(tmp, 'resultados.xlsx')
+                json_path = os.path.join(tmp, 'resultados.json')
+                crawler2.export_results(excel_path, 'excel')
+                crawler2.export_results(json_path, 'json')
+                
+                rows = list(load_workbook(excel_path, read_only=True).active.iter_rows(values_only=True))
+                with open(json_path, encoding='utf-8') as f:
+                    data = json.load(f)
+                if len(rows) != 4 or rows[0][0] != 'URL' or len(data) != 3:
+                    print(f"❌ Excel/JSON incorretos: {len(rows)} linhas, {len(data)} itens")
+                    return False
+                print("✓ Excel (write-only) e JSON exportados")
+                
+                simple = SimpleCrawler()
+                simple_path = os.path.join(tmp, 'simples.jsonl')
+                simple.stream_results_to(simple_path)
+                simple.crawl_url(urls[0], delay=0, timeout=5)
+                simple.close_stream()
+                with open(simple_path, encoding='utf-8') as f:
+                    if json.loads(f.readline())['title'] != 'Página 0':
+                        print("❌ JSONL do SimpleCrawler incorreto")
+                        return False
+                print("✓ SimpleCrawler gravando JSONL incremental")
+            
+            return True
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste de exportação incremental: {e}")
+        return False
+
+def test_columnar_export():
+    """Testa a exportação Parquet/Arrow com o resultado completo"""
+    print("\n🧪 Testando exportação colunar...")
+    
+    try:
+        import tempfile
+        from datetime import datetime
+        from web_crawler import CrawlResult
+        from exporters import ParquetSink, create_sink, read_columnar
+        import pyarrow.parquet as pq
+        
+        results = [
+            CrawlResult(
+                url=f"https://example.com/p{i}", title=f"Página {i}", description="",
+                content="x" * 2000, links=[f"https://example.com/l{i}/{j}" for j in range(i % 4)],
+                images=[], timestamp=datetime(2024, 1, 1, 12, 0, i % 60), status_code=200,
+                response_time=0.1 * i, truncated=i == 3
+            )
+            for i in range(25)
+        ]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            parquet_path = os.path.join(tmp, 'resultados.parquet')
+            with ParquetSink(parquet_path, row_group_size=10) as sink:
+                for result in results:
+                    sink.write(result)
+            
+            metadata = pq.ParquetFile(parquet_path).metadata
+            if metadata.num_row_groups != 3 or metadata.num_rows != 25:
+                print(f"❌ Row groups incorretos: {metadata.num_row_groups} grupos, {metadata.num_rows} linhas")
+                return False
+            print("✓ Parquet gravado em row groups de 10 resultados")
+            
+            df = read_columnar(parquet_path)
+            if (len(df.loc[0, 'content']) != 2000 or list(df.loc[3, 'links']) != results[3].links
+                    or not df.loc[3, 'truncated'] or df.loc[5, 'timestamp'] != results[5].timestamp):
+                print("❌ Resultado completo não preservado no Parquet")
+                return False
+            print("✓ Conteúdo completo e links como coluna de listas")
+            
+            if list(read_columnar(parquet_path, columns=['url']).columns) != ['url']:
+                print("❌ Leitura de colunas selecionadas falhou")
+                return False
+            
+            arrow_path = os.path.join(tmp, 'resultados.arrow')
+            with create_sink(arrow_path, 'arrow') as sink:
+                for result in results:
+                    sink.write(result)
+            df_arrow = read_columnar(arrow_path, columns=['url', 'links'])
+            if len(df_arrow) != 25 or list(df_arrow.loc[2, 'links']) != results[2].links:
+                print("❌ Arquivo Arrow incorreto")
+                return False
+            print("✓ Arrow IPC gravado e lido via memory map")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro no teste de exportação colunar: {e}")
+        return False
+
+def test_compact_results():
+    """Testa o layout compacto do CrawlResult"""
+    print("\n🧪 Testando resultados compactos...")
+    
+    try:
+        import pickle
+        from datetime import datetime
+        from web_crawler import CrawlResult
+        
+        timestamp = datetime(2024, 5, 1, 10, 30, 15, 250000)
+        menu = ["https://example.com/", "https://example.com/sobre"]
+        first = CrawlResult("https://example.com/a", "A", "", "texto " * 100, list(menu),
+                            ["https://example.com/logo.png"], timestamp, 200, 0.5)
+        second = CrawlResult("https://example.com/b", "B", "", "texto " * 100,
+                             [url + "" for url in menu], [], timestamp, 200, 0.5, compress=True)
+        
+        if hasattr(first, '__dict__'):
+            print("❌ CrawlResult ainda tem __dict__")
+            return False
+        
+        # Mesma API pública do dataclass
+        if (first.url != "https://example.com/a" or first.links != menu or first.timestamp != timestamp
+                or first.images != ["https://example.com/logo.png"] or first.truncated):
+            print("❌ Atributos públicos alterados")
+            return False
+        first.links.append("https://example.com/extra")
+        if first.links[-1] != "https://example.com/extra" or second.links != menu:
+            print("❌ Edição de links no lugar foi perdida")
+            return False
+        print("✓ Slots, listas editáveis e timestamp preservado")
+        
+        if not second.is_compressed or second.content != "texto " * 100:
+            print("❌ Conteúdo comprimido incorreto")
+            return False
+        print("✓ Conteúdo comprimido até ser lido")
+        
+        restored = pickle.loads(pickle.dumps(second))
+        from_dict = CrawlResult.from_dict(first.to_dict())
+        if restored != second or not restored.is_compressed or from_dict != first or first == second:
+            print("❌ pickle/to_dict não preservaram o resultado")
+            return False
+        print("✓ pickle, to_dict e comparação funcionando")
+        
+        first.links = ["https://example.com/novo"]
+        if first.links != ["https://example.com/novo"] or "CrawlResult(url=" not in repr(first):
+            print("❌ Atribuição de links falhou")
+            return False
+        
+        # No ResultStore, links iguais de páginas diferentes viram o mesmo objeto
+        from result_store import ResultStore
+        store = ResultStore(max_memory_bytes=None)
+        pages = [CrawlResult(f"https://example.com/{i}", "", "", "", [url + "" for url in menu], [],
+                             timestamp, 200, 0.1) for i in range(3)]
+        store.extend(pages)
+        if any(link is not shared for page in pages[1:] for link, shared in zip(page.links, pages[0].links)):
+            print("❌ Links repetidos não foram deduplicados pelo ResultStore")
+            return False
+        store.clear()
+        if len(store.strings) or pages[2].links != menu:
+            print("❌ Tabela de strings não foi esvaziada com o ResultStore")
+            return False
+        print("✓ URLs deduplicadas pela tabela de strings do ResultStore")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro no teste de resultados compactos: {e}")
+        return False
+
+def test_result_store():
+    """Testa o armazenamento de resultados com despejo para disco"""
+    print("\n🧪 Testando armazenamento de resultados...")
+    
+    try:
+        import tempfile
+        from datetime import datetime
+        from web_crawler import CrawlResult, WebCrawler
+        from result_store import ResultStore, estimate_size
+        
+        results = [
+            CrawlResult(f"https://example.com/{i}", f"Página {i}", "", "conteúdo " * 500,
+                        [f"https://example.com/{i + 1}"], [], datetime.now(), 200, 0.1)
+            for i in range(50)
+        ]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ResultStore(max_memory_bytes=20000, spill_dir=tmp)
+            store.extend(results)
+            
+            stats = store.get_statistics()
+            if store.spilled == 0 or stats['memory_bytes'] > 20000 or len(store) != 50:
+                print(f"❌ Orçamento de memória não respeitado: {stats}")
+                return False
+            print(f"✓ {store.spilled} resultados em disco, {store.in_memory} na memória")
+            
+            if (list(store) != results or store[0] != results[0] or store[-1] != results[-1]
+                    or store[10:13] != results[10:13]):
+                print("❌ Acesso transparente aos resultados falhou")
+                return False
+            print("✓ Iteração, índices e fatias transparentes")
+            
+            # Os links entram no orçamento e não ficam na memória depois do despejo
+            import gc
+            import tracemalloc
+            def linked_result(i):
+                links = [f"https://example.com/{i}/{j:060d}" for j in range(20)]
+                return CrawlResult(f"https://example.com/{i}", "", "", "", links, [], datetime.now(), 200, 0.1)
+            
+            linked = linked_result(0)
+            if estimate_size(linked) < sum(len(link) for link in linked.links):
+                print("❌ Tamanho estimado ignora os links")
+                return False
+            gc.collect()
+            tracemalloc.start()
+            budget_store = ResultStore(max_memory_bytes=200000, spill_dir=tmp)
+            for i in range(2000):
+                budget_store.append(linked_result(i))
+            gc.collect()
+            resident, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            budget_store.clear()
+            if resident > 1024 * 1024:
+                print(f"❌ {resident} bytes residentes com orçamento de 200 KB")
+                return False
+            print(f"✓ Links contados no orçamento ({resident // 1024} KB residentes para 200 KB)")
+            
+            crawler = WebCrawler()
+            crawler.results.extend(results[:5])
+            crawler.setup_result_store(max_memory_bytes=10000, spill_dir=tmp)
+            crawler.results.extend(results[5:])
+            if len(crawler.results) != 50 or crawler.get_statistics()['result_store']['spilled'] == 0:
+                print("❌ WebCrawler não usou o orçamento configurado")
+                return False
+            
+            # Estatísticas leem cada resultado despejado uma vez só
+            loads = []
+            load = crawler.results._load
+            crawler.results._load = lambda index: loads.append(index) or load(index)
+            stats = crawler.get_statistics()
+            del crawler.results._load
+            if stats['total_pages'] != 50 or len(loads) != crawler.results.spilled:
+                print(f"❌ {len(loads)} leituras do disco para {crawler.results.spilled} resultados despejados")
+                return False
+            print("✓ WebCrawler com orçamento configurável")
+            
+            store.clear()
+            crawler.results.close()
+            if len(store) or os.listdir(tmp):
+                print("❌ Segmento em disco não foi removido")
+                return False
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro no teste de armazenamento de resultados: {e}")
+        return False
+
+def test_content_filter():
+    """Testa os filtros de conteúdo compilados"""
+    print("\n🧪 Testando filtros compilados...")
+    
+    try:
+        import content_filter
+        from content_filter import ContentFilter, KeywordMatcher
+        from web_crawler import WebCrawler
+        
+        # Mesma semântica de 'any(k in texto)' nos dois algoritmos de busca
+        original = content_filter.ahocorasick
+        try:
+            for backend in ('padrão', 'trie-regex'):
+                if backend == 'trie-regex':
+                    content_filter.ahocorasick = None
+                matcher = KeywordMatcher(['Promoção', 'spam', 'spammer', 'grátis'])
+                if (matcher.search("oferta spammer aqui") not in ('spam', 'spammer')
+                        or matcher.search("sem nada") is not None
+                        or matcher.search("promoção imperdível") != 'promoção'
+                        or set(matcher.find_all("grátis e promoção")) != {'grátis', 'promoção'}):
+                    print(f"❌ Busca de palavras-chave incorreta ({matcher.backend})")
+                    return False
+        finally:
+            content_filter.ahocorasick = original
+        print("✓ Busca de várias palavras-chave em uma passada")
+        
+        filters = ContentFilter({
+            'keywords': ['python', 'crawler'],
+            'exclude_keywords': ['cassino', 'apostas'],
+            'min_length': 20,
+            'regex': r'\bvers[aã]o \d+'
+        })
+        cases = [
+            ("curto", 'min_length'),
+            ("texto longo sobre jardinagem e plantas", 'keywords'),
+            ("tutorial de Python sem número de release", 'regex'),
+            ("Python versão 3 com cassino no rodapé", 'exclude_keywords'),
+        ]
+        for text, rule in cases:
+            decision = filters.check(text)
+            if decision or decision.rule != rule:
+                print(f"❌ Regra incorreta para {text!r}: {decision}")
+                return False
+        accepted = filters.check("Crawler em Python, versão 2")
+        if not accepted or accepted.match != 'crawler':
+            print(f"❌ Texto válido rejeitado: {accepted}")
+            return False
+        if filters.check("Python versão 3 com cassino no rodapé").match != 'cassino':
+            print("❌ Palavra excluída não reportada")
+            return False
+        print("✓ Regra responsável reportada em cada decisão")
+        
+        try:
+            ContentFilter({'regex': '(sem fechar'})
+            print("❌ Regex inválida aceita")
+            return False
+        except ValueError:
+            print("✓ Regex inválida rejeitada na compilação")
+        
+        crawler = WebCrawler()
+        job_filters = {'keywords': ['python'], 'min_length': 5}
+        if (not crawler.filter_content("aprendendo python", job_filters)
+                or crawler.filter_content("aprendendo java", job_filters)
+                or crawler.get_content_filter(job_filters) is not crawler.get_content_filter(dict(job_filters))):
+            print("❌ filter_content não reaproveitou o filtro compilado")
+            return False
+        stats = crawler.get_content_filter(job_filters).get_statistics()
+        if stats['checked'] != 2 or stats['rejected']['keywords'] != 1:
+            print(f"❌ Estatísticas de filtro incorretas: {stats}")
+            return False
+        print("✓ Filtro compilado uma vez por job")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro no teste de filtros compilados: {e}")
+        return False
+
+def test_prefilter():
+    """Testa o pré-filtro que descarta páginas antes do parse"""
+    print("\n🧪 Testando pré-filtro...")
+    
+    try:
+        from web_crawler import WebCrawler
+        
+        body = "<p>" + "Texto de enchimento. " * 50 + "</p>"
+        pages = {}
+        for i in range(12):
+            topic = "Python" if i % 3 == 0 else "Jardinagem"
+            pages[f'/p{i}'] = (f"<html><head><title>Artigo {i} sobre {topic}</title>"
+                               f"<meta name='description' content='Tudo sobre {topic.lower()}'></head>"
+                               f"<body><article>{body}</article></body></html>")
+        server, base_url = start_local_server(pages)
+        urls = [f"{base_url}/p{i}" for i in range(12)]
+        
+        try:
+            expected = None
+            for mode in (None, 'raw', 'head'):
+                crawler = WebCrawler()
+                crawler.setup_session(delay=0, timeout=5)
+                filters = {'keywords': ['python'], 'prefilter': mode}
+                results = crawler.crawl_multiple_urls(urls, respect_robots=False, content_filters=filters)
+                titles = sorted(result.title for result in results)
+                parsed = crawler.get_extraction_plan().pages
+                stats = crawler.get_content_filter(filters).get_statistics()['prefilter']
+                
+                if expected is None:
+                    expected = titles
+                    if len(titles) != 4 or parsed != 12:
+                        print(f"❌ Filtro sem pré-filtro incorreto: {titles}")
+                        return False
+                    continue
+                
+                if titles != expected:
+                    print(f"❌ Pré-filtro '{mode}' mudou os resultados: {titles}")
+                    return False
+                if parsed != 4 or stats['rejected']['keywords'] != 8 or stats['parse_time_saved'] <= 0:
+                    print(f"❌ Pré-filtro '{mode}' não evitou o parse: {parsed} parses, {stats}")
+                    return False
+                print(f"✓ Pré-filtro '{mode}': 8 páginas descartadas antes do parse, "
+                      f"{stats['parse_time_saved'] * 1000:.1f} ms poupados")
+            
+            # 'raw' nunca descarta o que o filtro completo aceitaria (texto dividido por tags)
+            from html_parsers import available_backends
+            tricky = [('python', "<article><b>Py</b>thon</article>", None),
+                      ('helloworld', "<article><p>hello</p><p>world</p></article>", None),
+                      ('xy', "<article>x<script>var a</script>y<!-- c --></article>", None),
+                      ('foo bar', "<title>Foo</title><article>bar</article>", None),
+                      ('modelo', "<article><template><p>modelo</p></template></article>", {'content': ['p']}),
+                      ('molde', "<div><template><b>mol</b>de</template></div>", {'content': ['template']}),
+                      ('var a', "<p>x</p><script>var a</script>", {'content': ['script']})]
+            for keyword, html, selectors in tricky:
+                for backend in available_backends():
+                    crawler = WebCrawler(parser=backend)
+                    content_filter = crawler.get_content_filter({'keywords': [keyword], 'prefilter': 'raw'})
+                    content = crawler._extract_html(html, selectors)
+                    full = content_filter.check(f"{content['title']} {content['description']} {content['content']}")
+                    if full and not content_filter.precheck(html):
+                        print(f"❌ Pré-filtro 'raw' descartou página aceita pelo filtro ({backend}): {html}")
+                        return False
+            if WebCrawler().get_content_filter({'keywords': ['python'], 'prefilter': 'raw'}).precheck(
+                    "<article>Java <!-- python --></article>"):
+                print("❌ Pré-filtro 'raw' aceitou palavra-chave só em comentário")
+                return False
+            print("✓ Pré-filtro 'raw' consistente com o texto extraído")
+            
+            try:
+                WebCrawler().get_content_filter({'prefilter': 'dom'})
+                print("❌ Modo de pré-filtro inválido aceito")
+                return False
+            except ValueError:
+                print("✓ Modo de pré-filtro inválido rejeitado")
+            
+            return True
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste de pré-filtro: {e}")
+        return False
+
+def test_near_duplicates():
+    """Testa a detecção de páginas quase duplicadas"""
+    print("\n🧪 Testando detecção de quase duplicatas...")
+    
+    try:
+        import random
+        from web_crawler import WebCrawler
+        from near_duplicates import NearDuplicateIndex, simhash, similarity
+        
+        rng = random.Random(7)
+        words = [f"palavra{i}" for i in range(2000)]
+        article = " ".join(rng.choice(words) for _ in range(400))
+        other = " ".join(rng.choice(words) for _ in range(400))
+        
+        if similarity(simhash(article), simhash(article + " versão para impressão")) < 0.95:
+            print("❌ SimHash de textos quase iguais muito diferente")
+            return False
+        if similarity(simhash(article), simhash(other)) > 0.8:
+            print("❌ SimHash de textos diferentes muito parecido")
+            return False
+        print("✓ SimHash próximo para cópias e distante para textos diferentes")
+        
+        def page(text, extra_link):
+            return (f"<html><head><title>Artigo</title></head><body><article>{text}</article>"
+                    f"<a href='{extra_link}'>mais</a></body></html>")
+        
+        pages = {
+            '/': "<html><body><a href='/artigo'>1</a><a href='/artigo/imprimir'>2</a>"
+                 "<a href='/artigo/ordem'>3</a><a href='/outro'>4</a></body></html>",
+            '/artigo': page(article, '/extra-canonica'),
+            '/artigo/imprimir': page(article + " versão para impressão", '/extra-imprimir'),
+            '/artigo/ordem': page(article, '/extra-ordem'),
+            '/outro': page(other, '/extra-outro'),
+        }
+        for path in ('/extra-canonica', '/extra-imprimir', '/extra-ordem', '/extra-outro'):
+            pages[path] = f"<html><body><article>Página {path} sem relação</article></body></html>"
+        server, base_url = start_local_server(pages)
+        
+        try:
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0, timeout=5)
+            crawler.setup_dedup(threshold=0.9)
+            results = crawler.crawl_frontier([f"{base_url}/"], max_depth=2, respect_robots=False)
+            by_path = {result.url[len(base_url):]: result for result in results}
+            
+            canonical = f"{base_url}/artigo"
+            if (by_path['/artigo/imprimir'].duplicate_of != canonical
+                    or by_path['/artigo/ordem'].duplicate_of != canonical
+                    or by_path['/artigo'].duplicate_of or by_path['/outro'].duplicate_of):
+                print(f"❌ Duplicatas marcadas incorretamente: "
+                      f"{ {path: r.duplicate_of for path, r in by_path.items()} }")
+                return False
+            if '/extra-imprimir' in by_path or '/extra-ordem' in by_path or '/extra-canonica' not in by_path:
+                print(f"❌ Links de duplicatas seguidos: {sorted(by_path)}")
+                return False
+            print("✓ Duplicatas marcadas e seus links não seguidos")
+            
+            stats = crawler.get_statistics()['near_duplicates']
+            cluster = stats['largest_clusters'][0]
+            if stats['duplicates'] != 2 or cluster['url'] != canonical or cluster['duplicates'] != 2:
+                print(f"❌ Grupos de duplicatas incorretos: {stats}")
+                return False
+            print("✓ Grupos de duplicatas nas estatísticas")
+            
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0, timeout=5)
+            crawler.setup_dedup(threshold=0.9, action='drop')
+            urls = [f"{base_url}/artigo", f"{base_url}/artigo/ordem", f"{base_url}/outro"]
+            results = crawler.crawl_multiple_urls(urls, respect_robots=False)
+            if [result.url for result in results] != [urls[0], urls[2]]:
+                print(f"❌ Duplicata não descartada: {[result.url for result in results]}")
+                return False
+            print("✓ Duplicatas descartadas com action='drop'")
+            
+            # Retomada: o índice é reconstruído com as páginas do checkpoint
+            import tempfile
+            with tempfile.TemporaryDirectory() as tmp:
+                db_path = os.path.join(tmp, 'state.db')
+                crawler = WebCrawler()
+                crawler.setup_session(delay=0, timeout=5)
+                crawler.setup_dedup(threshold=0.9)
+                job_id = crawler.enable_checkpoint(db_path)
+                crawler.checkpoint.start_job('list', {'kwargs': {'respect_robots': False}},
+                                             [(url, 0) for url in urls])
+                crawler.crawl_url(urls[0], respect_robots=False)
+                crawler.record_checkpoint(urls[0], crawler.results[-1])
+                crawler.checkpoint.close()
+                
+                resumed = WebCrawler()
+                resumed.setup_session(delay=0, timeout=5)
+                resumed.setup_dedup(threshold=0.9)
+                results = resumed.resume(job_id, db_path)
+            if [result.duplicate_of for result in results] != [None, urls[0], None]:
+                print(f"❌ Duplicata de página anterior à retomada não detectada: "
+                      f"{[result.duplicate_of for result in results]}")
+                return False
+            print("✓ Índice de duplicatas reconstruído na retomada")
+            
+            # Grupos limitados: contagem e poucos exemplos, metade menor descartada
+            index = NearDuplicateIndex(max_clusters=4)
+            for i in range(6):
+                for copy in range(i + 1):
+                    index.restore(f"copia{i}-{copy}", "", duplicate_of=f"canonica{i}")
+            stats = index.get_statistics()
+            if len(index.clusters) > 4 or stats['largest_clusters'][0]['duplicates'] != 6 or \
+                    len(stats['largest_clusters'][0]['examples']) != 5:
+                print(f"❌ Grupos de duplicatas sem limite: {stats}")
+                return False
+            print("✓ Grupos de duplicatas limitados")
+            
+            # Limiar configurável: 1.0 só considera cópias exatas
+            index = NearDuplicateIndex(threshold=1.0)
+            index.check('a', article)
+            if index.check('b', article + " versão para impressão") is not None or index.check('c', article) != 'a':
+                print("❌ Limiar de similaridade ignorado")
+                return False
+            print("✓ Limiar de similaridade configurável")
+            
+            return True
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste de quase duplicatas: {e}")
+        return False
+
+def test_autothrottle():
+    """Testa o auto-throttle por host"""
+    print("\n🧪 Testando auto-throttle...")
+    
+    try:
+        from throttle import AutoThrottle
+        from web_crawler import WebCrawler
+        
+        throttle = AutoThrottle(min_delay=0.05, max_delay=10, start_delay=1.0, max_concurrency=3, increase_after=5)
+        for _ in range(20):
+            throttle.acquire('rapido.com')
+            throttle.release('rapido.com', 200, 0.01)
+        for _ in range(5):
+            throttle.acquire('lento.com')
+            throttle.release('lento.com', 200, 4.0)
+        throttle.acquire('lento.com')
+        throttle.release('lento.com', 503, 4.0, retry_after=8)
+        
+        stats = throttle.get_statistics()
+        fast, slow = stats['rapido.com'], stats['lento.com']
+        if fast['delay'] > 0.1 or fast['concurrency'] != 3:
+            print(f"❌ Host rápido não foi acelerado: {fast}")
+            return False
+        if slow['delay'] < 8 or slow['concurrency'] != 1 or slow['throttled'] != 1:
+            print(f"❌ Host lento/503 não foi freado: {slow}")
+            return False
+        if throttle.reserve('lento.com') < 7:
+            print("❌ Retry-After ignorado")
+            return False
+        print("✓ Delay e concorrência ajustados por latência, 503 e Retry-After")
+        
+        pages = {f'/p{i}': f"<html><title>{i}</title></html>" for i in range(12)}
+        pages['/limite'] = (429, {'Retry-After': '2'}, "<html>devagar</html>")
+        server, base_url = start_local_server(pages)
+        
+        try:
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0.3, timeout=5)
+            crawler.setup_autothrottle(min_delay=0.0, max_delay=5.0)
+            crawler.crawl_multiple_urls([f"{base_url}/p{i}" for i in range(12)], respect_robots=False)
+            
+            host = crawler._host(base_url)
+            host_stats = crawler.get_statistics()['hosts'][host]
+            if host_stats['delay'] >= 0.3 or host_stats['requests'] != 12:
+                print(f"❌ Delay do host local não diminuiu: {host_stats}")
+                return False
+            print(f"✓ Host local acelerado para {host_stats['delay']}s ({host_stats['rate']} req/s)")
+            
+            crawler.setup_retries(max_retries=0)
+            crawler.crawl_url(f"{base_url}/limite", respect_robots=False)
+            host_stats = crawler.throttle.get_statistics()[host]
+            if host_stats['delay'] < 2 or host_stats['throttled'] != 1:
+                print(f"❌ 429 com Retry-After não freou o host: {host_stats}")
+                return False
+            print("✓ 429 com Retry-After aumentou o delay do host")
+            
+            return True
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste de auto-throttle: {e}")
+        return False
+
+def test_retries():
+    """Testa as novas tentativas com backoff e jitter"""
+    print("\n🧪 Testando novas tentativas...")
+    
+    try:
+        import urllib.error
+        from retry import RetryPolicy
+        from crawler_simples import SimpleCrawler
+        from web_crawler import WebCrawler
+        
+        policy = RetryPolicy(max_retries=3, base_delay=1.0, max_delay=4.0, max_total_time=60)
+        unavailable = urllib.error.HTTPError('http://x', 503, 'Unavailable', {}, None)
+        missing = urllib.error.HTTPError('http://x', 404, 'Not Found', {}, None)
+        if not policy.is_retryable(unavailable) or not policy.is_retryable(TimeoutError()):
+            print("❌ 503/timeout deveriam ser tentados de novo")
+            return False
+        if policy.is_retryable(missing) or policy.is_retryable(ValueError()):
+            print("❌ 404/erro de programação não deveriam ser tentados de novo")
+            return False
+        delays = [policy.backoff(attempt) for attempt in range(6) for _ in range(50)]
+        if min(delays) < 0 or max(delays) > 4.0 or len(set(delays)) < 250:
+            print("❌ Backoff fora do limite ou sem jitter")
+            return False
+        if policy.backoff(0, retry_after=3) < 3:
+            print("❌ Retry-After ignorado pelo backoff")
+            return False
+        if policy.next_delay(unavailable, 3, time.monotonic()) is not None:
+            print("❌ max_retries não foi respeitado")
+            return False
+        if policy.next_delay(unavailable, 0, time.monotonic() - 59.5, retry_after=2) is not None:
+            print("❌ max_total_time não foi respeitado")
+            return False
+        print("✓ Só falhas temporárias, backoff com jitter limitado por tentativas e tempo total")
+        
+        hits = {}
+        
+        class FlakyPages(dict):
+            """/instavel responde 503 nas duas primeiras requisições"""
+            def get(self, path, default=None):
+                hits[path] = hits.get(path, 0) + 1
+                if path == '/instavel' and hits[path] <= 2:
+                    return (503, {'Retry-After': '0'}, "<html>ocupado</html>")
+                if path.startswith('/texto') and hits[path] == 1:
+                    return (503, {'Content-Type': 'text/plain', 'Retry-After': '0'}, "ocupado")
+                return super().get(path, default)
+        
+        pages = FlakyPages({
+            '/instavel': "<html><title>Instável</title></html>",
+            '/ok': "<html><title>OK</title></html>",
+            '/texto': "<html><title>Texto</title></html>",
+            '/texto-async': "<html><title>Texto</title></html>",
+            '/sempre-503': (503, {}, "<html>fora do ar</html>")
+        })
+        server, base_url = start_local_server(pages)
+        
+        try:
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0, timeout=5)
+            crawler.setup_retries(max_retries=3, base_delay=0.05, max_delay=0.2)
+            urls = [f"{base_url}{path}" for path in ('/instavel', '/ok', '/ausente')]
+            results = crawler.crawl_multiple_urls(urls, max_workers=2, respect_robots=False)
+            
+            if [result.title for result in results] != ['Instável', 'OK']:
+                print(f"❌ Resultados inesperados: {[result.title for result in results]}")
+                return False
+            if hits['/instavel'] != 3 or hits['/ausente'] != 1:
+                print(f"❌ Requisições inesperadas: {hits}")
+                return False
+            print("✓ 503 tentado de novo até dar certo, 404 não repetido, ordem mantida")
+            
+            if crawler.crawl_url(f"{base_url}/sempre-503", respect_robots=False) is not None:
+                print("❌ URL sempre fora do ar deveria falhar")
+                return False
+            retries = crawler.get_statistics()['retries']
+            if hits['/sempre-503'] != 4 or retries['scheduled'] != 5 or retries['exhausted'] != 1:
+                print(f"❌ Tentativas esgotadas incorretamente: {hits}, {retries}")
+                return False
+            print(f"✓ Desistiu após {retries['max_retries']} novas tentativas")
+            
+            import asyncio
+            result = crawler.crawl_url(f"{base_url}/texto", respect_robots=False)
+            async_results = asyncio.run(crawler.acrawl_many([f"{base_url}/texto-async"], respect_robots=False))
+            if result is None or len(async_results) != 1 or hits['/texto'] != 2 or hits['/texto-async'] != 2 \
+                    or crawler.non_html_skipped:
+                print(f"❌ 503 text/plain deveria ser tentado de novo, não descartado como não-HTML: {hits}")
+                return False
+            print("✓ 503 em text/plain tentado de novo (sync e async)")
+            
+            hits.clear()
+            simple = SimpleCrawler()
+            simple.retry_policy = RetryPolicy(max_retries=3, base_delay=0.05, max_delay=0.2)
+            simple_results = simple.crawl_multiple_urls([f"{base_url}/instavel", f"{base_url}/ok"], delay=0)
+            if [result['title'] for result in simple_results] != ['Instável', 'OK'] or hits['/instavel'] != 3:
+                print(f"❌ SimpleCrawler não tentou de novo: {hits}")
+                return False
+            print("✓ SimpleCrawler também tenta de novo sem travar as outras URLs")
+            
+            return True
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste de novas tentativas: {e}")
+        return False
+
+def test_connection_pool():
+    """Testa o reaproveitamento de conexões keep-alive"""
+    print("\n🧪 Testando pool de conexões...")
+    
+    try:
+        import urllib.request
+        from connection_pool import KeepAliveHandler
+        from crawler_simples import SimpleCrawler
+        from web_crawler import WebCrawler
+        
+        pages = {f'/p{i}': f"<html><title>{i}</title><p>{'x' * 2000}</p></html>" for i in range(14)}
+        pages['/grande'] = f"<html><title>grande</title><p>{'x' * 300000}</p></html>"
+        server, base_url = start_local_server(pages, keep_alive=True)
+        
+        try:
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0, timeout=5)
+            for i in range(6):
+                crawler.crawl_url(f"{base_url}/p{i}", respect_robots=False)
+            connections = crawler.get_statistics()['connections']
+            if connections['new_connections'] != 1 or connections['reused_connections'] != 5:
+                print(f"❌ Conexão não foi reaproveitada: {connections}")
+                return False
+            if len(server.client_ports) != 1:
+                print(f"❌ Servidor recebeu {len(server.client_ports)} conexões")
+                return False
+            print("✓ WebCrawler: 6 páginas em uma única conexão")
+            
+            # Um segundo job com o mesmo número de workers não descarta o pool
+            crawler.crawl_multiple_urls([f"{base_url}/p{i}" for i in range(6, 9)], max_workers=3,
+                                        respect_robots=False)
+            opened = len(server.client_ports)
+            crawler.crawl_multiple_urls([f"{base_url}/p{i}" for i in range(9, 12)], max_workers=3,
+                                        respect_robots=False)
+            if len(server.client_ports) != opened or opened > 3:
+                print(f"❌ Pool recriado entre jobs: {opened} -> {len(server.client_ports)} conexões")
+                return False
+            print(f"✓ Pool mantido entre jobs ({opened} conexões para 12 páginas)")
+            
+            replaced = crawler.session.get_adapter('https://')
+            crawler.setup_connection_pool(idle_timeout=0.1)
+            if replaced.poolmanager.pools:
+                print("❌ Adapter substituído manteve as conexões abertas")
+                return False
+            crawler.crawl_url(f"{base_url}/p12", respect_robots=False)
+            time.sleep(0.2)
+            crawler.crawl_url(f"{base_url}/p13", respect_robots=False)
+            if crawler.get_statistics()['connections']['expired_idle'] != 1:
+                print("❌ Conexão ociosa além do idle_timeout foi reaproveitada")
+                return False
+            print("✓ Conexão ociosa expirada após idle_timeout")
+            
+            server.client_ports.clear()
+            simple = SimpleCrawler()
+            for i in range(5):
+                simple.crawl_url(f"{base_url}/p{i}", delay=0)
+            stats = simple.connection_pool.get_statistics()
+            if stats['new_connections'] != 1 or stats['reused_connections'] != 4 or len(server.client_ports) != 1:
+                print(f"❌ SimpleCrawler não manteve a conexão: {stats}")
+                return False
+            
+            # Corpo truncado deixa dados pendentes: a conexão é descartada
+            simple.max_content_length = 1000
+            simple.crawl_url(f"{base_url}/grande", delay=0)
+            simple.crawl_url(f"{base_url}/p6", delay=0)
+            stats = simple.connection_pool.get_statistics()
+            if stats['new_connections'] != 2 or [r['title'] for r in simple.results][-1] != '6':
+                print(f"❌ Conexão com corpo pendente foi reaproveitada: {stats}")
+                return False
+            simple.close_connections()
+            print("✓ SimpleCrawler com keep-alive (conexões truncadas descartadas)")
+            
+            # https via proxy abre um túnel CONNECT em vez de TLS direto com o proxy
+            tunnels = []
+            
+            class ProxyHandler(BaseHTTPRequestHandler):
+                def do_CONNECT(self):
+                    tunnels.append(self.path)
+                    self.send_error(403)
+                
+                def log_message(self, format, *args):
+                    pass
+            
+            proxy = ThreadingHTTPServer(('127.0.0.1', 0), ProxyHandler)
+            threading.Thread(target=proxy.serve_forever, daemon=True).start()
+            try:
+                simple.opener = urllib.request.build_opener(
+                    urllib.request.ProxyHandler({'https': f"http://127.0.0.1:{proxy.server_address[1]}"}),
+                    KeepAliveHandler(simple.connection_pool))
+                simple.crawl_url("https://site.invalid/pagina", delay=0)
+            finally:
+                proxy.shutdown()
+            if tunnels != ['site.invalid:443']:
+                print(f"❌ Túnel CONNECT não foi aberto: {tunnels}")
+                return False
+            print("✓ HTTPS via proxy usa túnel CONNECT")
+            
+            return True
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste de pool de conexões: {e}")
+        return False
+
+def test_dns_cache():
+    """Testa o cache de DNS e o pré-aquecimento de hosts"""
+    print("\n🧪 Testando cache de DNS...")
+    
+    try:
+        import socket
+        import dns_cache
+        from dns_cache import DNSCache
+        from web_crawler import WebCrawler
+        
+        calls = []
+        real_getaddrinfo = dns_cache.socket.getaddrinfo
+        
+        def fake_getaddrinfo(host, port, *args):
+            calls.append(host)
+            time.sleep(0.05)
+            if host == 'nao-existe.invalid':
+                raise socket.gaierror(socket.EAI_NONAME, 'Name or service not known')
+            return real_getaddrinfo('127.0.0.1', port, *args)
+        
+        dns_cache.socket.getaddrinfo = fake_getaddrinfo
+        try:
+            cache = DNSCache(ttl=0.3, negative_ttl=60)
+            threads = [threading.Thread(target=cache.resolve, args=('exemplo.com', 80)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            if calls != ['exemplo.com'] or cache.addresses('exemplo.com', 80) != ['127.0.0.1']:
+                print(f"❌ Consultas repetidas para o mesmo host: {calls}")
+                return False
+            time.sleep(0.35)
+            cache.resolve('exemplo.com', 80)
+            for _ in range(2):
+                try:
+                    cache.resolve('nao-existe.invalid', 80)
+                    print("❌ Host inexistente foi resolvido")
+                    return False
+                except socket.gaierror:
+                    pass
+            stats = cache.get_statistics()
+            if calls.count('exemplo.com') != 2 or calls.count('nao-existe.invalid') != 1 or stats['failures'] != 1:
+                print(f"❌ TTL ou cache negativo incorretos: {calls}, {stats}")
+                return False
+            print(f"✓ Uma consulta por host entre workers, TTL e cache negativo ({stats['hit_rate']:.0%} de acertos)")
+        finally:
+            dns_cache.socket.getaddrinfo = real_getaddrinfo
+        
+        pages = {f'/p{i}': f"<html><title>{i}</title></html>" for i in range(10)}
+        server, base_url = start_local_server(pages, response_delay=0.05, keep_alive=True)
+        port = server.server_address[1]
+        
+        try:
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0, timeout=5)
+            crawler.setup_connection_pool(idle_timeout=0)
+            for i in range(4):
+                crawler.crawl_url(f"http://localhost:{port}/p{i}", respect_robots=False)
+            stats = crawler.get_statistics()
+            dns, connections = stats['dns'], stats['connections']
+            if dns['misses'] != 1 or dns['hits'] != 3 or connections['connects'] != 4:
+                print(f"❌ Conexões novas não usaram o cache de DNS: {dns}, {connections}")
+                return False
+            print(f"✓ 4 conexões, 1 consulta DNS ({dns['avg_resolve_ms']} ms), "
+                  f"{connections['avg_connect_ms']} ms por conexão")
+            
+            crawler.setup_connection_pool()
+            crawler.setup_dns_cache(prefetch=True, lookahead=5)
+            urls = [f"http://localhost:{port}/p{i}" for i in range(4, 7)]
+            urls += [f"http://127.0.0.1:{port}/p{i}" for i in range(7, 10)]
+            results = crawler.crawl_multiple_urls(urls, respect_robots=False)
+            stats = crawler.get_statistics()
+            crawler.close_prefetcher()
+            
+            second_host = stats['connections']['hosts']['127.0.0.1']
+            if len(results) != 6 or stats['dns']['prefetch']['warmed'] < 1 or second_host['new'] != 0:
+                print(f"❌ Host seguinte não foi aquecido: {stats['dns']}, {second_host}")
+                return False
+            print(f"✓ Próximo host resolvido e conectado antes da vez ({second_host['reused']} requisições "
+                  f"sem abrir conexão)")
+            
+            # Origens recentes limitadas a max_hosts
+            from dns_cache import DNSCache, HostPrefetcher
+            prefetcher = HostPrefetcher(DNSCache(), max_hosts=3)
+            prefetcher.prefetch([f"http://host{i}.invalid/" for i in range(10)])
+            recent = list(prefetcher._recent)
+            prefetcher.close()
+            if recent != [f"http://host{i}.invalid" for i in (7, 8, 9)]:
+                print(f"❌ Origens aquecidas sem limite: {recent}")
+                return False
+            print("✓ Origens recentes do prefetch limitadas")
+            
+            return True
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste de cache de DNS: {e}")
+        return False
+
+def test_parse_pool():
+    """Testa o modo pipeline com parse em processos"""
+    print("\n🧪 Testando parse em processos...")
+    
+    try:
+        from multiprocessing import shared_memory
+        from parse_pool import ParsePool
+        from web_crawler import WebCrawler
+        
+        with ParsePool(workers=2, slot_size=4096) as pool:
+            small = pool.parse(b"<html><title>Pequena</title><a href='/a'>a</a></html>", None, 'html.parser')
+            large = pool.parse(b"<html><title>Grande</title><p>" + b"x" * 10000 + b"</p></html>", None, 'html.parser')
+            stats = pool.get_statistics()
+            segment_names = [segment.name for segment in pool._segments]
+        if small.content['title'] != 'Pequena' or small.content['links'] != ['/a'] or large.content['title'] != 'Grande':
+            print("❌ Conteúdo extraído incorreto nos processos de parse")
+            return False
+        if stats['shared_memory'] != 1 or stats['inline'] != 1:
+            print(f"❌ Corpo pequeno deveria ir por memória compartilhada: {stats}")
+            return False
+        try:
+            shared_memory.SharedMemory(name=segment_names[0])
+            print("❌ Blocos de memória compartilhada não foram apagados no close")
+            return False
+        except FileNotFoundError:
+            pass
+        print("✓ Corpos por memória compartilhada (ou junto da tarefa quando não cabem)")
+        
+        pages = {}
+        for i in range(8):
+            topic = 'python' if i % 2 == 0 else 'java'
+            pages[f'/p{i}'] = (f"<html><head><title>Página {i} sobre {topic}</title></head><body>"
+                               f"<article>Texto sobre {topic}. <a href='/p{i + 1}'>próxima</a></article></body></html>")
+        server, base_url = start_local_server(pages)
+        
+        try:
+            urls = [f"{base_url}/p{i}" for i in range(8)]
+            filters = {'keywords': ['python']}
+            
+            reference = WebCrawler()
+            reference.setup_session(delay=0, timeout=5)
+            expected = reference.crawl_multiple_urls(urls, max_workers=4, respect_robots=False, content_filters=filters)
+            
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0, timeout=5)
+            crawler.setup_parse_pool(workers=2)
+            try:
+                results = crawler.crawl_multiple_urls(urls, max_workers=4, respect_robots=False,
+                                                      content_filters=filters)
+                stats = crawler.get_statistics()
+            finally:
+                crawler.close_parse_pool()
+            
+            if [(r.url, r.title, r.content, r.links) for r in results] != \
+                    [(r.url, r.title, r.content, r.links) for r in expected] or len(results) != 4:
+                print("❌ Resultados do modo pipeline diferem do parse na thread")
+                return False
+            filter_stats = stats['content_filters'][0]
+            if stats['parse_pool']['pages'] != 8 or stats['parse_pool']['shared_memory'] != 8:
+                print(f"❌ Páginas não passaram pelos processos de parse: {stats['parse_pool']}")
+                return False
+            if filter_stats['checked'] != 8 or filter_stats['rejected']['keywords'] != 4 or \
+                    stats['extraction_plans'][0]['pages'] != 8:
+                print(f"❌ Estatísticas dos processos não chegaram ao crawler: {filter_stats}")
+                return False
+            print(f"✓ Pipeline: 8 páginas parseadas em {stats['parse_pool']['workers']} processos, "
+                  f"mesmos resultados e estatísticas")
+            
+            return True
+        finally:
+            server.shutdown()
+            
+    except Exception as e:
+        print(f"❌ Erro no teste de parse em processos: {e}")
+        return False
+
+def _distributed_worker(address, name):
+    """Processo worker do teste distribuído"""
+    from web_crawler import WebCrawler
+    
+    crawler = WebCrawler()
+    crawler.setup_session(delay=0, timeout=5)
+    crawler.run_worker(address, batch_size=3, max_workers=2, name=name)
+
+def test_distributed():
+    """Testa o crawling distribuído com coordenador e workers em processos"""
+    print("\n🧪 Testando crawling distribuído...")
+    
+    try:
+        import multiprocessing
+        from coordinator import Coordinator, CoordinatorServer, host_partition
+        
+        hits = {}
+        hits_lock = threading.Lock()
+        
+        class CountingPages(dict):
+            def get(self, path, default=None):
+                with hits_lock:
+                    hits[path] = hits.get(path, 0) + 1
+                return super().get(path, default)
+        
+        pages = CountingPages()
+        server, base_url = start_local_server(pages, response_delay=0.1)
+        other_url = base_url.replace('127.0.0.1', 'localhost')
+        # Dois hosts (127.0.0.1 e localhost) com links entre si e repetidos
+        for prefix, base, other in (('a', base_url, f"{other_url}/b0"), ('b', other_url, f"{base_url}/a0")):
+            links = ''.join(f"<a href='/{prefix}{i}'>{i}</a>" for i in range(1, 5))
+            pages[f'/{prefix}0'] = f"<html><title>{prefix}0</title><body>{links}<a href='{other}'>x</a></body></html>"
+            for i in range(1, 5):
+                pages[f'/{prefix}{i}'] = (f"<html><title>{prefix}{i}</title><body><a href='/{prefix}{i + 4}'>n</a>"
+                                          f"<a href='/{prefix}0#topo'>início</a><a href='{base}/{prefix}1'>1</a></body></html>")
+            for i in range(5, 9):
+                pages[f'/{prefix}{i}'] = f"<html><title>{prefix}{i}</title><body><a href='/{prefix}99'>fundo</a></body></html>"
+        
+        if host_partition(base_url, 64) == host_partition(other_url, 64):
+            print("❌ Hosts de teste caíram na mesma partição")
+            return False
+        
+        coordinator = Coordinator([f"{base_url}/a0", f"{other_url}/b0"], max_depth=2, min_workers=2,
+                                  job={'respect_robots': False}, handoff_delay=0.3)
+        
+        # Registra quando cada lote saiu e quando foi entregue, com os hosts dele
+        leases = {}
+        lease, complete = coordinator.lease, coordinator.complete
+        
+        def recording_lease(worker_id, max_urls=20):
+            response = lease(worker_id, max_urls)
+            if response.get('urls'):
+                hosts = {url.split('/')[2] for url, _ in response['urls']}
+                leases[response['lease']] = [worker_id, hosts, time.monotonic(), None]
+            return response
+        
+        def recording_complete(worker_id, lease_id, pages):
+            leases[lease_id][3] = time.monotonic()
+            return complete(worker_id, lease_id, pages)
+        
+        coordinator.lease, coordinator.complete = recording_lease, recording_complete
+        
+        coordinator_server = CoordinatorServer(coordinator, port=0)
+        address = coordinator_server.start()
+        
+        try:
+            context = multiprocessing.get_context('spawn')
+            workers = [context.Process(target=_distributed_worker, args=(address, f"no{i}")) for i in range(2)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join(timeout=60)
+            if any(worker.exitcode != 0 for worker in workers):
+                print(f"❌ Workers terminaram com erro: {[worker.exitcode for worker in workers]}")
+                return False
+            stats = coordinator.get_statistics()
+        finally:
+            coordinator_server.stop()
+            server.shutdown()
+        
+        expected = {f'/{prefix}{i}' for prefix in 'ab' for i in range(9)}
+        if set(hits) != expected or any(count != 1 for count in hits.values()):
+            print(f"❌ Cada página deveria ser baixada uma vez no cluster: {hits}")
+            return False
+        if stats['completed'] != 18 or len(coordinator.results) != 18 or not stats['done']:
+            print(f"❌ Resultados não chegaram ao coordenador: {stats}")
+            return False
+        titles = sorted(result['title'] for result in coordinator.results)
+        if titles != sorted(path[1:] for path in expected):
+            print(f"❌ Resultados incorretos no coordenador: {titles}")
+            return False
+        print(f"✓ 18 páginas baixadas uma única vez por {len(stats['workers'])} workers")
+        
+        intervals = list(leases.values())
+        for i, (worker_a, hosts_a, start_a, end_a) in enumerate(intervals):
+            for worker_b, hosts_b, start_b, end_b in intervals[i + 1:]:
+                if worker_a != worker_b and hosts_a & hosts_b and start_a < end_b and start_b < end_a:
+                    print(f"❌ Dois workers no mesmo host ao mesmo tempo: {hosts_a & hosts_b}")
+                    return False
+        busy = [worker for worker, info in stats['workers'].items() if info['pages']]
+        if len(busy) != 2:
+            print(f"❌ Os dois workers deveriam receber partições: {stats['workers']}")
+            return False
+        print(f"✓ {len(intervals)} lotes, cada host com um único worker por vez")
+        
+        # Só o dono conclui o lote; expirado, ele volta e a página já vista no worker é baixada de novo
+        from web_crawler import WebCrawler
+        retry_server, retry_url = start_local_server({'/r': "<html><title>r</title></html>"})
+        single = Coordinator([f"{retry_url}/r"], max_depth=0, job={'respect_robots': False},
+                             lease_timeout=0.2, handoff_delay=0)
+        owner = single.register('dono')['worker']
+        intruder = single.register('intruso')['worker']
+        stale = single.lease(owner)
+        rejected = single.complete(intruder, stale['lease'], [{'url': f"{retry_url}/r", 'result': None}])
+        time.sleep(0.3)
+        single_server = CoordinatorServer(single, port=0)
+        try:
+            crawler = WebCrawler()
+            crawler.setup_session(delay=0, timeout=5)
+            crawler.crawl_url(f"{retry_url}/r", respect_robots=False)
+            crawler.run_worker(single_server.start(), max_workers=1)
+        finally:
+            single_server.stop()
+            retry_server.shutdown()
+        if rejected.get('ok') or single.failed or single.completed != 1:
+            print(f"❌ Lote reentregue perdido ou concluído por outro worker: {single.get_statistics()}")
+            return False
+        print("✓ Lote expirado reprocessado pelo mesmo worker; só o dono conclui o lote")
+        
+        # O coordenador sabe quando todos os workers já receberam 'done' (encerramento do serve)
+        finished = Coordinator([])
+        first, second = finished.register('a')['worker'], finished.register('b')['worker']
+        notified = [finished.lease(first).get('done'), finished.all_workers_notified()]
+        notified += [finished.lease(second).get('done'), finished.all_workers_notified()]
+        if notified != [True, False, True, True]:
+            print(f"❌ Aviso de término aos workers não acompanhado: {notified}")
+            return False
+        print("✓ Coordenador acompanha quais workers já receberam 'done'")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro no teste de crawling distribuído: {e}")
+        return False
+
 def run_all_tests():
     """Executa todos os testes"""
     print("🧪 WEB CRAWLER PRO - SUITE DE TESTES")
@@ -295,6 +2255,31 @@ def run_all_tests():
         ("Filtros", test_filters),
         ("Exportação", test_export),
         ("Configurações", test_config),
+        ("Crawling Concorrente", test_concurrent_crawl),
+        ("Crawling Assíncrono", test_async_crawl),
+        ("Cache robots.txt", test_robots_cache),
+        ("Crawling Recursivo", test_frontier_crawl),
+        ("Canonicalização URLs", test_url_canonicalization),
+        ("Checkpoint/Retomada", test_checkpoint_resume),
+        ("Cache HTTP", test_http_cache),
+        ("Pool WebDrivers", test_selenium_pool),
+        ("Esperas Selenium", test_selenium_waits),
+        ("Backends de Parse", test_parser_backends),
+        ("Planos de Extração", test_extraction_plan),
+        ("Limite de Conteúdo", test_content_limits),
+        ("Exportação Incremental", test_streaming_export),
+        ("Exportação Colunar", test_columnar_export),
+        ("Resultados Compactos", test_compact_results),
+        ("Armazenamento de Resultados", test_result_store),
+        ("Filtros Compilados", test_content_filter),
+        ("Pré-filtro", test_prefilter),
+        ("Quase Duplicatas", test_near_duplicates),
+        ("Auto-throttle", test_autothrottle),
+        ("Novas Tentativas", test_retries),
+        ("Pool de Conexões", test_connection_pool),
+        ("Cache de DNS", test_dns_cache),
+        ("Parse em Processos", test_parse_pool),
+        ("Crawling Distribuído", test_distributed),
         ("Selenium", test_selenium)
     ]
     
@@ -0,0 +1,156 @@
+"""
+Auto-throttle por host
+Ajusta o delay e a concorrência de cada host a partir da latência
+observada, das respostas de erro (429/503, falhas de conexão) e do
+cabeçalho Retry-After, sempre dentro dos limites configurados
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+# Respostas que indicam que o host pediu para ir mais devagar
+THROTTLE_STATUS = (429, 503)
+
+
+class HostState:
+    """Estado de throttling de um host"""
+    
+    __slots__ = ('delay', 'concurrency', 'in_flight', 'next_slot', 'latency', 'requests',
+                 'errors', 'throttled', 'successes', 'first_request')
+    
+    def __init__(self, delay: float, concurrency: int):
+        self.delay = delay
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.next_slot = 0.0
+        self.latency = None  # média móvel exponencial da latência
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.successes = 0  # respostas boas desde o último aumento de concorrência
+        self.first_request = None
+
+
+class AutoThrottle:
+    """Delay e concorrência adaptativos por host, thread-safe
+    
+    O delay tende a latência / target_concurrency (hosts rápidos recebem
+    mais requisições por segundo, hosts lentos menos) e dobra a cada
+    429/503 ou falha. A concorrência cresce em 1 a cada increase_after
+    respostas boas seguidas e cai pela metade em caso de erro (AIMD).
+    Retry-After bloqueia o host pelo tempo pedido.
+    """
+    
+    def __init__(self, min_delay: float = 0.0, max_delay: float = 30.0, start_delay: float = 1.0,
+                 target_concurrency: float = 1.0, max_concurrency: int = 4,
+                 increase_after: int = 10, smoothing: float = 0.3):
+        if min_delay > max_delay:
+            raise ValueError("min_delay não pode ser maior que max_delay")
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.start_delay = min(max(start_delay, min_delay), max_delay)
+        self.target_concurrency = target_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase_after = increase_after
+        self.smoothing = smoothing
+        
+        self._hosts: Dict[str, HostState] = {}
+        self._condition = threading.Condition()
+    
+    def _state(self, host: str) -> HostState:
+        """Estado do host, criado na primeira requisição (chamar com o lock)"""
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostState(self.start_delay, 1)
+        return state
+    
+    def try_acquire(self, host: str) -> bool:
+        """Ocupa uma vaga de concorrência do host se houver (não bloqueia)"""
+        with self._condition:
+            state = self._state(host)
+            if state.in_flight >= state.concurrency:
+                return False
+            state.in_flight += 1
+            return True
+    
+    def acquire(self, host: str):
+        """Espera uma vaga de concorrência do host"""
+        with self._condition:
+            state = self._state(host)
+            while state.in_flight >= state.concurrency:
+                self._condition.wait()
+            state.in_flight += 1
+    
+    def reserve(self, host: str, min_delay: float = 0.0) -> float:
+        """Reserva o próximo horário livre do host e retorna quanto esperar
+        
+        min_delay é um piso adicional (por exemplo o Crawl-delay do robots.txt).
+        """
+        with self._condition:
+            state = self._state(host)
+            now = time.monotonic()
+            slot = max(now, state.next_slot)
+            state.next_slot = slot + max(state.delay, min_delay)
+            if state.first_request is None:
+                state.first_request = now
+            return slot - now
+    
+    def release(self, host: str, status_code: Optional[int] = None, response_time: Optional[float] = None,
+                retry_after: Optional[float] = None):
+        """Libera a vaga e ajusta o host pela resposta (status_code=None indica falha)"""
+        with self._condition:
+            state = self._state(host)
+            state.in_flight = max(0, state.in_flight - 1)
+            state.requests += 1
+            
+            if response_time is not None:
+                state.latency = (response_time if state.latency is None
+                                 else self.smoothing * response_time + (1 - self.smoothing) * state.latency)
+            
+            if status_code is None or status_code in THROTTLE_STATUS or status_code >= 500:
+                # Recuo multiplicativo: dobra o delay e corta a concorrência pela metade
+                state.errors += 1
+                if status_code in THROTTLE_STATUS:
+                    state.throttled += 1
+                state.successes = 0
+                state.concurrency = max(1, state.concurrency // 2)
+                state.delay = min(self.max_delay, max(state.delay * 2, self.min_delay, 0.1))
+                if retry_after:
+                    state.delay = min(self.max_delay, max(state.delay, retry_after))
+                    state.next_slot = max(state.next_slot, time.monotonic() + min(retry_after, self.max_delay))
+            elif state.latency is not None:
+                # Aproxima o delay do alvo latência / concorrência desejada
+                target = state.latency / self.target_concurrency
+                delay = (state.delay + target) / 2
+                if status_code >= 400 and delay < state.delay:
+                    delay = state.delay  # respostas de erro não aceleram o host
+                state.delay = min(self.max_delay, max(self.min_delay, delay))
+                
+                if status_code < 400:
+                    state.successes += 1
+                    if state.successes >= self.increase_after and state.concurrency < self.max_concurrency:
+                        state.concurrency += 1
+                        state.successes = 0
+            
+            self._condition.notify_all()
+    
+    def get_statistics(self) -> Dict[str, Dict]:
+        """Delay, concorrência, latência e taxa atual de cada host"""
+        with self._condition:
+            now = time.monotonic()
+            stats = {}
+            for host, state in self._hosts.items():
+                elapsed = now - state.first_request if state.first_request is not None else 0
+                stats[host] = {
+                    'delay': round(state.delay, 3),
+                    'concurrency': state.concurrency,
+                    'in_flight': state.in_flight,
+                    'latency': round(state.latency, 3) if state.latency is not None else None,
+                    'requests': state.requests,
+                    'errors': state.errors,
+                    'throttled': state.throttled,
+                    'max_rate': round(1 / state.delay, 2) if state.delay else None,
+                    'rate': round(state.requests / elapsed, 2) if elapsed > 0 else 0.0
+                }
+            return stats
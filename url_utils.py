@@ -0,0 +1,174 @@
+"""
+Utilitários de URL usando apenas bibliotecas padrão
+Canonicalização de URLs e conjunto compacto de URLs visitadas
+baseado em fingerprints de 64 bits
+"""
+
+import hashlib
+import urllib.parse
+from array import array
+from typing import Iterable, Iterator, Optional
+
+# Parâmetros de rastreamento removidos por padrão ('*' no final indica prefixo)
+DEFAULT_TRACKING_PARAMS = (
+    'utm_*', 'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', 'igshid', 'ref_src', 'spm'
+)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def _is_tracking_param(name: str, tracking_params: Iterable[str]) -> bool:
+    """Verifica se o parâmetro de query deve ser descartado"""
+    name = name.lower()
+    for param in tracking_params:
+        if param.endswith('*'):
+            if name.startswith(param[:-1]):
+                return True
+        elif name == param:
+            return True
+    return False
+
+
+def canonicalize_url(url: str, tracking_params: Optional[Iterable[str]] = None) -> str:
+    """Gera a forma canônica de uma URL para deduplicação
+    
+    Coloca esquema e host em minúsculas, remove porta padrão e fragmento,
+    ordena os parâmetros de query e descarta parâmetros de rastreamento.
+    """
+    if tracking_params is None:
+        tracking_params = DEFAULT_TRACKING_PARAMS
+    
+    parts = urllib.parse.urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    
+    host = (parts.hostname or '').lower()
+    if ':' in host:
+        host = f"[{host}]"  # IPv6
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    if parts.username is not None:
+        userinfo = parts.username
+        if parts.password is not None:
+            userinfo += ':' + parts.password
+        host = f"{userinfo}@{host}"
+    
+    path = parts.path or '/'
+    
+    query = ''
+    if parts.query:
+        params = [
+            (name, value)
+            for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+            if not _is_tracking_param(name, tracking_params)
+        ]
+        params.sort()
+        query = urllib.parse.urlencode(params)
+    
+    return urllib.parse.urlunsplit((scheme, host, path, query, ''))
+
+
+def url_fingerprint(url: str, tracking_params: Optional[Iterable[str]] = None) -> int:
+    """Retorna o fingerprint de 64 bits (nunca zero) da forma canônica da URL"""
+    canonical = canonicalize_url(url, tracking_params)
+    digest = hashlib.blake2b(canonical.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') or 1
+
+
+class FingerprintSet:
+    """Conjunto de inteiros de 64 bits em um array com endereçamento aberto
+    
+    Cada entrada ocupa 8 bytes em um array('Q'); zero marca posição vazia.
+    Não é thread-safe: o chamador deve sincronizar o acesso.
+    """
+    
+    MAX_LOAD = 0.7
+    
+    def __init__(self, capacity: int = 1024):
+        size = 8
+        while size * self.MAX_LOAD < capacity:
+            size *= 2
+        self._table = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+    
+    def _slot(self, fingerprint: int) -> int:
+        """Retorna a posição do fingerprint ou da primeira posição vazia da sonda"""
+        table = self._table
+        mask = self._mask
+        index = fingerprint & mask
+        while True:
+            value = table[index]
+            if value == 0 or value == fingerprint:
+                return index
+            index = (index + 1) & mask
+    
+    def add(self, fingerprint: int) -> bool:
+        """Adiciona um fingerprint; retorna False se já existia"""
+        fingerprint = fingerprint or 1
+        index = self._slot(fingerprint)
+        if self._table[index] == fingerprint:
+            return False
+        
+        self._table[index] = fingerprint
+        self._count += 1
+        if self._count > len(self._table) * self.MAX_LOAD:
+            self._resize(len(self._table) * 2)
+        return True
+    
+    def _resize(self, size: int):
+        """Realoca a tabela reinserindo todos os fingerprints"""
+        old_table = self._table
+        self._table = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        for value in old_table:
+            if value:
+                self._table[self._slot(value)] = value
+    
+    def __contains__(self, fingerprint: int) -> bool:
+        fingerprint = fingerprint or 1
+        return self._table[self._slot(fingerprint)] == fingerprint
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __iter__(self) -> Iterator[int]:
+        return (value for value in self._table if value)
+    
+    def memory_usage(self) -> int:
+        """Bytes ocupados pela tabela"""
+        return self._table.itemsize * len(self._table)
+
+
+class VisitedURLSet:
+    """Conjunto de URLs visitadas que guarda apenas fingerprints canônicos
+    
+    Mantém a interface de um set de strings (add, in, len), então
+    'http://A.com/x?b=1&a=2#frag' e 'http://a.com/x?a=2&b=1' são a mesma URL.
+    """
+    
+    def __init__(self, tracking_params: Optional[Iterable[str]] = None, capacity: int = 1024):
+        self.tracking_params = tuple(tracking_params) if tracking_params is not None else DEFAULT_TRACKING_PARAMS
+        self.fingerprints = FingerprintSet(capacity)
+    
+    def fingerprint(self, url: str) -> int:
+        """Fingerprint da URL usando os parâmetros de rastreamento deste conjunto"""
+        return url_fingerprint(url, self.tracking_params)
+    
+    def add(self, url: str) -> bool:
+        """Adiciona uma URL; retorna False se ela (ou uma equivalente) já existia"""
+        return self.fingerprints.add(self.fingerprint(url))
+    
+    def add_fingerprint(self, fingerprint: int) -> bool:
+        """Adiciona um fingerprint já calculado"""
+        return self.fingerprints.add(fingerprint)
+    
+    def __contains__(self, url: str) -> bool:
+        return self.fingerprint(url) in self.fingerprints
+    
+    def __len__(self) -> int:
+        return len(self.fingerprints)
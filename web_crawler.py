@@ -1,47 +1,226 @@
 import requests
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from fake_useragent import UserAgent
-import pandas as pd
 import time
-import re
+import asyncio
+import itertools
+import threading
 import urllib.parse
-from urllib.robotparser import RobotFileParser
+import urllib.request
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import List, Dict, Optional
 import json
 import logging
-from dataclasses import dataclass
+import zlib
 from datetime import datetime
+from async_fetcher import AsyncFetcher
+from robots_cache import RobotsCache
+from frontier import CrawlScope, Frontier
+from url_utils import VisitedURLSet
+from crawl_state import CrawlState
+from http_cache import HTTPCache
+from selenium_utils import WebDriverPool, create_chrome_driver, wait_until_ready
+from html_parsers import LxmlDocument, decode_html, parse_html, resolve_backend
+from extraction import ExtractionPlan, load_preset_plans
+from content_filter import ContentFilter
+from near_duplicates import NearDuplicateIndex
+from exporters import ResultSink, create_sink
+from result_store import DEFAULT_MEMORY_BUDGET, ResultStore
+from http_utils import CHUNK_SIZE, DEFAULT_MAX_CONTENT_LENGTH, is_html_content_type, parse_retry_after, read_limited
+from throttle import AutoThrottle
+from parse_pool import ParsedPage, ParsePool
+from dns_cache import DEFAULT_DNS_TTL, DEFAULT_NEGATIVE_TTL, DNSCache, HostPrefetcher
+from connection_pool import (DEFAULT_IDLE_TIMEOUT, DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE,
+                             ConnectionStats, PooledHTTPAdapter)
+from retry import RetryLater, RetryPolicy, RetryQueue, error_retry_after, load_retry_policy
 
 
-@dataclass
 class CrawlResult:
-    """Classe para armazenar resultados do crawling"""
-    url: str
-    title: str
-    description: str
-    content: str
-    links: List[str]
-    images: List[str]
-    timestamp: datetime
-    status_code: int
-    response_time: float
+    """Classe para armazenar resultados do crawling
+    
+    Layout compacto para crawls grandes: __slots__ em vez de __dict__, o
+    timestamp como epoch e, com compress=True, o conteúdo comprimido com zlib
+    até ser lido. Os atributos públicos são os mesmos do antigo dataclass
+    (links e images continuam listas comuns, editáveis no lugar). Os links
+    guardam o href como está na página; link_base é a URL contra a qual os
+    relativos são resolvidos. Guardado em um ResultStore, url, links e
+    images passam a compartilhar as strings repetidas (ver StringTable).
+    """
+    
+    __slots__ = ('url', 'title', 'description', '_content', 'links', 'images',
+                 '_timestamp', 'status_code', 'response_time', 'truncated', 'duplicate_of', 'base_url')
+    
+    FIELDS = ('url', 'title', 'description', 'content', 'links', 'images',
+              'timestamp', 'status_code', 'response_time', 'truncated', 'duplicate_of', 'base_url')
+    
+    # Conteúdos menores que isto não compensam a compressão
+    COMPRESS_MIN_LENGTH = 256
+    
+    def __init__(self, url: str, title: str, description: str, content: str,
+                 links: List[str], images: List[str], timestamp, status_code: int,
+                 response_time: float, truncated: bool = False, duplicate_of: Optional[str] = None,
+                 base_url: Optional[str] = None, compress: bool = False):
+        self.url = url
+        self.title = title
+        self.description = description
+        self.content = content
+        self.links = links
+        self.images = images
+        self.timestamp = timestamp
+        self.status_code = status_code
+        self.response_time = response_time
+        self.truncated = truncated  # corpo cortado em max_content_length
+        self.duplicate_of = duplicate_of  # URL canônica quando a página é quase duplicata
+        self.base_url = base_url  # URL final (redirecionamentos, <base href>) quando difere de url
+        if compress:
+            self.compress_content()
+    
+    @property
+    def link_base(self) -> str:
+        """URL base dos links relativos da página"""
+        return self.base_url or self.url
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Momento do crawling"""
+        return datetime.fromtimestamp(self._timestamp)
+    
+    @timestamp.setter
+    def timestamp(self, value):
+        """Aceita datetime ou epoch em segundos"""
+        self._timestamp = value.timestamp() if isinstance(value, datetime) else float(value)
+    
+    @property
+    def content(self) -> str:
+        """Conteúdo extraído (descomprimido se necessário)"""
+        if isinstance(self._content, bytes):
+            return zlib.decompress(self._content).decode('utf-8')
+        return self._content
+    
+    @content.setter
+    def content(self, value: str):
+        """Substitui o conteúdo (sem compressão)"""
+        self._content = value
+    
+    def compress_content(self):
+        """Guarda o conteúdo comprimido (descomprimido a cada leitura de content)"""
+        if isinstance(self._content, str) and len(self._content) >= self.COMPRESS_MIN_LENGTH:
+            self._content = zlib.compress(self._content.encode('utf-8'), 1)
+    
+    @property
+    def is_compressed(self) -> bool:
+        """Indica se o conteúdo está comprimido"""
+        return isinstance(self._content, bytes)
+    
+    def _values(self) -> tuple:
+        """Valores públicos na ordem de FIELDS"""
+        return tuple(getattr(self, field) for field in self.FIELDS)
+    
+    def __eq__(self, other):
+        """Compara os valores públicos, como o dataclass"""
+        if not isinstance(other, CrawlResult):
+            return NotImplemented
+        return self._values() == other._values()
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        """Representação no formato do dataclass"""
+        fields = ', '.join(f"{field}={value!r}" for field, value in zip(self.FIELDS, self._values()))
+        return f"CrawlResult({fields})"
+    
+    def __reduce__(self):
+        """Serializa pelos valores públicos (o conteúdo segue comprimido se estiver)"""
+        return CrawlResult, self._values() + (self.is_compressed,)
+    
+    def to_dict(self) -> Dict:
+        """Converte o resultado em um dicionário serializável em JSON"""
+        return {
+            'url': self.url,
+            'title': self.title,
+            'description': self.description,
+            'content': self.content,
+            'links': list(self.links),
+            'images': list(self.images),
+            'timestamp': self.timestamp.isoformat(),
+            'status_code': self.status_code,
+            'response_time': self.response_time,
+            'truncated': self.truncated,
+            'duplicate_of': self.duplicate_of,
+            'base_url': self.base_url
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CrawlResult':
+        """Recria um resultado a partir de to_dict()"""
+        data = dict(data)
+        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+        return cls(**data)
 
 
 class WebCrawler:
     """Classe principal do Web Crawler com recursos avançados"""
     
-    def __init__(self):
+    def __init__(self, tracking_params: List[str] = None, parser: str = 'auto'):
         self.session = requests.Session()
         self.ua = UserAgent()
-        self.results = []
-        self.visited_urls = set()
-        self.setup_logging()
+        # Conexões keep-alive reaproveitadas por host (contadores em get_statistics()['connections'])
+        # e cache de DNS compartilhado pelos workers; prefetcher aquece os próximos hosts
+        self.connection_stats = ConnectionStats()
+        self.dns_cache = DNSCache()
+        self.prefetcher = None
+        self.prefetch_lookahead = 0
+        self.setup_connection_pool()
+        # Lista de resultados com orçamento de memória; os mais antigos vão para disco
+        self.results = ResultStore()
+        
+        # Exportadores incrementais; com keep_results=False os resultados só vão para eles
+        self.sinks: List[ResultSink] = []
+        self.keep_results = True
         
+        # URLs visitadas guardadas como fingerprints de 64 bits da forma canônica;
+        # tracking_params substitui a lista padrão de parâmetros descartados (utm_*, gclid...)
+        self.tracking_params = tracking_params
+        self.visited_urls = VisitedURLSet(tracking_params)
+        self.timeout = 10
+        self.delay = 1.0
+        self.bytes_downloaded = 0
+        
+        # Corpos são lidos em blocos até este limite (None = sem limite) e
+        # respostas com Content-Type que não é HTML são descartadas sem baixar
+        self.max_content_length = DEFAULT_MAX_CONTENT_LENGTH
+        self.truncated_pages = 0
+        self.non_html_skipped = 0
+        
+        # Com compress_content=True o conteúdo dos resultados fica comprimido na memória
+        self.compress_content = False
+        
+        # Backend de parse: 'auto' (o mais rápido disponível), 'lxml_raw', 'lxml' ou 'html.parser'
+        self.parser = resolve_backend(parser)
+        
+        # Planos de extração compilados por (seletores, backend) e filtros compilados
+        self._plans = {}
+        self._filters = {}
+        
+        # Estado compartilhado entre workers concorrentes
+        self._lock = threading.Lock()
+        self._host_next_request = {}
+        self.robots_cache = RobotsCache()
+        self.checkpoint = None
+        self.http_cache = None
+        self.selenium_pool = None
+        self.dedup = None
+        self.throttle = None  # AutoThrottle; sem ele vale o delay fixo de setup_session
+        self.parse_pool = None  # ParsePool; com ele o parse roda em processos (modo pipeline)
+        
+        # Novas tentativas para falhas temporárias (max_retries do config.json)
+        self.retry_policy = load_retry_policy()
+        self.retries_scheduled = 0
+        self.retries_exhausted = 0
+        self.setup_logging()
+    
     def setup_logging(self):
         """Configura o sistema de logging"""
         logging.basicConfig(
@@ -52,7 +231,9 @@ class WebCrawler:
         self.logger = logging.getLogger(__name__)
     
     def setup_session(self, headers: Dict = None, proxies: Dict = None, 
-                     timeout: int = 10, delay: float = 1.0):
+                     timeout: int = 10, delay: float = 1.0, parser: str = None,
+                     max_content_length: Optional[int] = DEFAULT_MAX_CONTENT_LENGTH,
+                     compress_content: bool = False):
         """Configura a sessão HTTP com headers e proxies personalizados"""
         if headers:
             self.session.headers.update(headers)
@@ -71,301 +252,1122 @@ class WebCrawler:
         
         self.timeout = timeout
         self.delay = delay
+        self.max_content_length = max_content_length
+        self.compress_content = compress_content
+        if parser:
+            self.parser = resolve_backend(parser)
+    
+    def setup_autothrottle(self, min_delay: float = 0.0, max_delay: float = 30.0, start_delay: float = None,
+                           target_concurrency: float = 1.0, max_concurrency: int = 4):
+        """Ativa o auto-throttle: delay e concorrência ajustados por host
+        
+        O delay de cada host parte de start_delay (padrão: o delay da sessão)
+        e se adapta à latência, aos 429/503 e ao Retry-After, entre min_delay
+        e max_delay; até max_concurrency requisições simultâneas por host.
+        """
+        self.throttle = AutoThrottle(min_delay, max_delay, self.delay if start_delay is None else start_delay,
+                                     target_concurrency, max_concurrency)
+    
+    def setup_retries(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 30.0,
+                      max_total_time: float = 120.0):
+        """Configura as novas tentativas de falhas temporárias (max_retries=0 desativa)"""
+        self.retry_policy = RetryPolicy(max_retries, base_delay, max_delay, max_total_time)
+    
+    def _retry_delay(self, url: str, error: Exception, attempt: int, started: float) -> Optional[float]:
+        """Espera até a próxima tentativa da URL, ou None se ela deve ser abandonada"""
+        retry_after = parse_retry_after(error_retry_after(error))
+        delay = self.retry_policy.next_delay(error, attempt, started, retry_after)
+        with self._lock:
+            if delay is not None:
+                self.retries_scheduled += 1
+            elif attempt > 0:
+                self.retries_exhausted += 1
+        if delay is not None:
+            self.logger.warning(f"Falha temporária em {url} (tentativa {attempt + 1}): {error}; "
+                                f"nova tentativa em {delay:.2f}s")
+        return delay
+    
+    @staticmethod
+    def _host(url: str) -> str:
+        """Host (netloc em minúsculas) de uma URL"""
+        return urllib.parse.urlparse(url).netloc.lower()
+    
+    def _reserve_host_slot(self, url: str) -> float:
+        """Reserva o próximo horário livre do host e retorna quanto esperar"""
+        host = self._host(url)
+        
+        if self.throttle:
+            return self.throttle.reserve(host, self.robots_cache.crawl_delay(url) or 0)
+        
+        # Respeita o Crawl-delay do robots.txt quando maior que o delay configurado
+        delay = max(self.delay, self.robots_cache.crawl_delay(url) or 0)
+        
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._host_next_request.get(host, now))
+            self._host_next_request[host] = slot + delay
+        
+        return slot - now
+    
+    def _wait_for_host(self, url: str):
+        """Aplica o delay por host antes de uma requisição"""
+        wait = self._reserve_host_slot(url)
+        if wait > 0:
+            time.sleep(wait)
+    
+    @contextmanager
+    def _host_turn(self, url: str):
+        """Espera a vez do host (concorrência e delay) e devolve a resposta ao auto-throttle
+        
+        O bloco preenche o dicionário recebido com status_code, response_time
+        e retry_after; se ele sair sem status_code a requisição conta como falha.
+        """
+        host = self._host(url)
+        if self.throttle:
+            self.throttle.acquire(host)
+        feedback = {}
+        try:
+            self._wait_for_host(url)
+            yield feedback
+        finally:
+            if self.throttle:
+                self.throttle.release(host, **feedback)
+    
+    @staticmethod
+    def _response_feedback(status_code: int, headers, response_time: float = None) -> Dict:
+        """Dados da resposta usados pelo auto-throttle"""
+        return {'status_code': status_code, 'response_time': response_time,
+                'retry_after': parse_retry_after(headers.get('retry-after'))}
+    
+    def setup_connection_pool(self, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                              pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                              idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT, pool_block: bool = False):
+        """Configura o pool de conexões keep-alive da sessão
+        
+        pool_maxsize é quantas conexões cada host mantém para reuso (com
+        pool_block=True, também o máximo simultâneo por host),
+        pool_connections quantos hosts mantêm um pool aberto e idle_timeout
+        após quantos segundos ociosa uma conexão é fechada em vez de reusada.
+        """
+        adapter = PooledHTTPAdapter(pool_connections, pool_maxsize, pool_block, idle_timeout,
+                                    self.connection_stats, self.dns_cache)
+        replaced = {id(old): old for old in (self.session.get_adapter('http://'),
+                                             self.session.get_adapter('https://'))}
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Fecha as conexões ociosas dos adapters substituídos
+        for old in replaced.values():
+            old.close()
+    
+    def setup_dns_cache(self, ttl: float = DEFAULT_DNS_TTL, negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                        prefetch: bool = False, preconnect: bool = True, lookahead: int = 20,
+                        prefetch_workers: int = 4):
+        """Configura o cache de DNS e o aquecimento antecipado dos próximos hosts
+        
+        Com prefetch=True, os jobs com pool resolvem em segundo plano os
+        hosts das próximas lookahead URLs pendentes e, com preconnect=True,
+        já deixam uma conexão aberta no pool de cada um.
+        """
+        self.close_prefetcher()
+        self.dns_cache = DNSCache(ttl, negative_ttl)
+        adapter = self.session.get_adapter('https://')
+        if isinstance(adapter, PooledHTTPAdapter):
+            self.setup_connection_pool(adapter._pool_maxsize, adapter._pool_connections, adapter.idle_timeout,
+                                       adapter._pool_block)
+        else:
+            self.setup_connection_pool()
+        
+        if prefetch:
+            self.prefetcher = HostPrefetcher(self.dns_cache, self._prewarm if preconnect else None,
+                                             max_workers=prefetch_workers)
+            self.prefetch_lookahead = lookahead
+    
+    def close_prefetcher(self):
+        """Encerra as threads de aquecimento de hosts"""
+        if self.prefetcher:
+            self.prefetcher.close()
+            self.prefetcher = None
+    
+    def _prewarm(self, url: str) -> bool:
+        """Abre antecipadamente uma conexão para o host da URL (não com proxies)"""
+        adapter = self.session.get_adapter(url)
+        if self.session.proxies or not isinstance(adapter, PooledHTTPAdapter):
+            return False
+        return adapter.prewarm(url, self.timeout)
+    
+    def _prefetch(self, urls):
+        """Agenda o aquecimento dos hosts das próximas URLs, se o prefetch estiver ativo"""
+        if self.prefetcher:
+            self.prefetcher.prefetch(urls)
+    
+    def _ensure_pool_size(self, size: int):
+        """Garante que o pool de conexões comporte a quantidade de workers
+        
+        O adapter só é trocado quando precisa crescer, para não descartar
+        as conexões já abertas entre um job e outro.
+        """
+        adapter = self.session.get_adapter('https://')
+        if not isinstance(adapter, PooledHTTPAdapter):
+            self.setup_connection_pool(pool_maxsize=size)
+        elif adapter._pool_maxsize < size:
+            self.setup_connection_pool(size, adapter._pool_connections, adapter.idle_timeout, adapter._pool_block)
+    
+    def setup_robots_cache(self, cache_file: str = 'robots_cache.json', ttl: float = 86400,
+                           error_ttl: float = 3600):
+        """Configura o cache de robots.txt (TTL, cache negativo e arquivo em disco)"""
+        self.robots_cache = RobotsCache(ttl=ttl, error_ttl=error_ttl, cache_file=cache_file)
+    
+    def setup_result_store(self, max_memory_bytes: Optional[int] = DEFAULT_MEMORY_BUDGET,
+                           spill_dir: Optional[str] = None):
+        """Define o orçamento de memória de self.results (None = sem limite)
+        
+        Resultados além do orçamento são gravados em um segmento temporário
+        em spill_dir (ou no diretório temporário do sistema).
+        """
+        store = ResultStore(max_memory_bytes, spill_dir)
+        with self._lock:
+            store.extend(self.results)
+            self.results.close()
+            self.results = store
+    
+    def setup_parse_pool(self, workers: Optional[int] = None, shared_memory: bool = True):
+        """Ativa o modo pipeline: as threads só baixam e o parse roda em processos
+        
+        workers processos (padrão: um por núcleo) aplicam pré-filtro, parse,
+        extração e filtros e devolvem só o conteúdo extraído, então o parse
+        deixa de disputar o GIL com as threads de I/O. Use max_workers maior
+        que workers nos jobs para manter os processos ocupados. Com
+        shared_memory=True os corpos (até max_content_length) vão por memória
+        compartilhada. Chame close_parse_pool() ao final.
+        """
+        self.close_parse_pool()
+        self.parse_pool = ParsePool(workers, self.max_content_length if shared_memory else None)
+    
+    def close_parse_pool(self):
+        """Encerra os processos de parse do modo pipeline"""
+        if self.parse_pool:
+            self.parse_pool.close()
+            self.parse_pool = None
+    
+    def setup_dedup(self, threshold: float = 0.95, action: str = 'mark', follow_links: bool = False,
+                    shingle_size: int = 3):
+        """Ativa a detecção de páginas quase duplicadas (SimHash do conteúdo extraído)
+        
+        action='mark' mantém a duplicata com duplicate_of apontando para a
+        página canônica; action='drop' a descarta. Com follow_links=False os
+        links das duplicatas não entram na fronteira de crawl_frontier.
+        Chamado antes de resume/load_checkpoint, o índice é reconstruído a
+        partir dos resultados restaurados.
+        """
+        if action not in ('mark', 'drop'):
+            raise ValueError(f"Ação inválida para duplicatas: {action} (use 'mark' ou 'drop')")
+        self.dedup = NearDuplicateIndex(threshold, shingle_size)
+        self.dedup_action = action
+        self.dedup_follow_links = follow_links
+    
+    def setup_http_cache(self, db_path: str = 'http_cache.db', max_bytes: int = 256 * 1024 * 1024):
+        """Ativa o cache HTTP em disco com requisições condicionais (ETag/Last-Modified)
+        
+        Em re-crawls, páginas que respondem 304 reaproveitam o conteúdo já
+        extraído sem baixar nem fazer o parse novamente.
+        """
+        self.http_cache = HTTPCache(db_path, max_bytes, self.tracking_params)
+    
+    def _fetch_robots(self, robots_url: str):
+        """Baixa um robots.txt usando a sessão configurada"""
+        response = self.session.get(robots_url, timeout=self.timeout)
+        return response.status_code, response.text
     
     def check_robots_txt(self, url: str, user_agent: str = '*') -> bool:
         """Verifica se é permitido fazer crawling baseado no robots.txt"""
         try:
-            base_url = urllib.parse.urljoin(url, '/')
-            robots_url = urllib.parse.urljoin(base_url, '/robots.txt')
-            
-            rp = RobotFileParser()
-            rp.set_url(robots_url)
-            rp.read()
-            
-            return rp.can_fetch(user_agent, url)
+            return self.robots_cache.can_fetch(url, user_agent, self._fetch_robots)
         except:
             return True  # Se não conseguir verificar, permite por padrão
     
     def extract_content(self, soup: BeautifulSoup, selectors: Dict) -> Dict:
-        """Extrai conteúdo baseado em seletores CSS personalizados"""
-        content = {}
-        
-        # Título
-        title_selectors = selectors.get('title', ['title', 'h1', '.title', '#title'])
-        title = self._extract_by_selectors(soup, title_selectors)
-        content['title'] = title
-        
-        # Descrição
-        desc_selectors = selectors.get('description', [
-            'meta[name="description"]', 
-            '.description', 
-            '.summary',
-            'p:first-of-type'
-        ])
-        description = self._extract_by_selectors(soup, desc_selectors)
-        content['description'] = description
-        
-        # Conteúdo principal
-        content_selectors = selectors.get('content', [
-            'article', 
-            '.content', 
-            '.post-content',
-            '.entry-content',
-            'main',
-            '#content'
-        ])
-        main_content = self._extract_by_selectors(soup, content_selectors)
-        content['content'] = main_content
-        
-        # Links
-        links = []
-        link_selectors = selectors.get('links', ['a[href]'])
-        for selector in link_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                href = element.get('href')
-                if href:
-                    links.append(href)
-        content['links'] = list(set(links))  # Remove duplicatas
-        
-        # Imagens
-        images = []
-        img_selectors = selectors.get('images', ['img[src]'])
-        for selector in img_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                src = element.get('src')
-                if src:
-                    images.append(src)
-        content['images'] = list(set(images))
-        
-        return content
-    
-    def _extract_by_selectors(self, soup: BeautifulSoup, selectors: List[str]) -> str:
-        """Extrai texto usando uma lista de seletores CSS"""
-        for selector in selectors:
-            try:
-                if selector.startswith('meta'):
-                    element = soup.select_one(selector)
-                    if element:
-                        return element.get('content', '')
-                else:
-                    element = soup.select_one(selector)
-                    if element:
-                        return element.get_text(strip=True)
-            except:
-                continue
-        return ""
+        """Extrai conteúdo baseado em seletores CSS personalizados
+        
+        Os seletores são compilados uma vez em um ExtractionPlan (ver
+        extraction.py) e reaproveitados nas próximas páginas.
+        """
+        backend = 'lxml_raw' if isinstance(soup, LxmlDocument) else 'html.parser'
+        return self.get_extraction_plan(selectors, backend).extract(soup)
     
-    def filter_content(self, content: str, filters: Dict) -> bool:
-        """Aplica filtros de conteúdo"""
-        if not filters:
-            return True
+    def get_extraction_plan(self, selectors: Dict = None, parser: str = None) -> ExtractionPlan:
+        """Retorna o plano compilado dos seletores para o backend (ValueError se inválidos)"""
+        backend = resolve_backend(parser or self.parser)
+        key = (ExtractionPlan.key(selectors), backend)
         
-        # Filtro por palavras-chave
-        keywords = filters.get('keywords', [])
-        if keywords:
-            content_lower = content.lower()
-            if not any(keyword.lower() in content_lower for keyword in keywords):
-                return False
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = ExtractionPlan(selectors, backend, 'custom' if selectors else 'padrão')
+            with self._lock:
+                plan = self._plans.setdefault(key, plan)
+        return plan
+    
+    def load_presets(self, config_file: str = 'config.json', parser: str = None) -> Dict[str, Dict]:
+        """Compila os presets do config.json e retorna seus seletores por nome
         
-        # Filtro por tamanho mínimo
-        min_length = filters.get('min_length', 0)
-        if len(content) < min_length:
-            return False
+        Os planos ficam em cache, então crawl_url(selectors=presets['blog'])
+        não recompila nada e aparece com o nome do preset nas estatísticas.
+        """
+        plans = load_preset_plans(config_file, parser or self.parser)
+        presets = {}
+        with self._lock:
+            for name, plan in plans.items():
+                self._plans[(ExtractionPlan.key(plan.selectors), plan.backend)] = plan
+                presets[name] = plan.selectors
+        return presets
+    
+    def get_content_filter(self, filters: Dict = None) -> ContentFilter:
+        """Retorna os filtros compilados do job (ValueError se a regex for inválida)"""
+        if isinstance(filters, ContentFilter):
+            return filters
+        key = ContentFilter.key(filters)
         
-        # Filtro por expressão regular
-        regex_pattern = filters.get('regex')
-        if regex_pattern:
-            if not re.search(regex_pattern, content, re.IGNORECASE):
-                return False
+        content_filter = self._filters.get(key)
+        if content_filter is None:
+            content_filter = ContentFilter(filters)
+            with self._lock:
+                content_filter = self._filters.setdefault(key, content_filter)
+        return content_filter
+    
+    @staticmethod
+    def _checkpoint_kwargs(kwargs: Dict) -> Dict:
+        """kwargs do job para o checkpoint (um ContentFilter é salvo pela sua configuração)"""
+        content_filters = kwargs.get('content_filters')
+        if isinstance(content_filters, ContentFilter):
+            return dict(kwargs, content_filters=content_filters.filters)
+        return kwargs
+    
+    def filter_content(self, content: str, filters: Dict) -> bool:
+        """Aplica filtros de conteúdo
         
-        # Filtro de exclusão
-        exclude_keywords = filters.get('exclude_keywords', [])
-        if exclude_keywords:
-            content_lower = content.lower()
-            if any(keyword.lower() in content_lower for keyword in exclude_keywords):
-                return False
+        Os filtros são compilados uma vez em um ContentFilter (ver
+        content_filter.py); a regra que rejeitou a página vai para o log.
+        """
+        if not filters:
+            return True
         
-        return True
+        decision = self.get_content_filter(filters).check(content)
+        if not decision:
+            self.logger.debug(f"Conteúdo rejeitado pela regra {decision.rule}: {decision.match!r}")
+        return decision.accepted
     
     def crawl_url(self, url: str, selectors: Dict = None, 
-                  content_filters: Dict = None, respect_robots: bool = True) -> Optional[CrawlResult]:
-        """Faz crawling de uma URL específica"""
+                  content_filters: Dict = None, respect_robots: bool = True,
+                  parser: str = None) -> Optional[CrawlResult]:
+        """Faz crawling de uma URL específica
+        
+        parser escolhe o backend de parse só para esta chamada (e, via
+        kwargs, para um job de crawl_multiple_urls/crawl_frontier).
+        Falhas temporárias são tentadas de novo com backoff (ver retry.py);
+        aqui a espera acontece na própria chamada, enquanto os jobs com
+        pool reagendam a URL sem ocupar um worker.
+        """
+        attempt, started = 0, time.monotonic()
+        while True:
+            try:
+                return self._crawl_attempt(url, selectors, content_filters, respect_robots, parser,
+                                           attempt, started)
+            except RetryLater as retry:
+                time.sleep(retry.delay)
+                attempt += 1
+    
+    def _crawl_attempt(self, url: str, selectors: Dict = None, content_filters: Dict = None,
+                       respect_robots: bool = True, parser: str = None, attempt: int = 0,
+                       started: float = None, dedup: bool = True) -> Optional[CrawlResult]:
+        """Uma tentativa de crawl_url; lança RetryLater quando vale tentar de novo
+        
+        dedup=False pula visited_urls (no worker distribuído quem deduplica é o coordenador).
+        """
         try:
             # Verifica robots.txt
             if respect_robots and not self.check_robots_txt(url):
                 self.logger.warning(f"Crawling não permitido pelo robots.txt: {url}")
                 return None
             
-            # Evita URLs duplicadas
-            if url in self.visited_urls:
-                return None
+            # Evita URLs duplicadas (verificação atômica entre workers); novas
+            # tentativas já foram registradas na primeira
+            if attempt == 0 and dedup:
+                with self._lock:
+                    if url in self.visited_urls:
+                        return None
+                    self.visited_urls.add(url)
             
-            self.visited_urls.add(url)
-            
-            # Delay entre requisições
-            time.sleep(self.delay)
-            
-            # Faz a requisição
-            start_time = time.time()
-            response = self.session.get(url, timeout=self.timeout)
-            response_time = time.time() - start_time
-            
-            response.raise_for_status()
-            
-            # Parse do HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Delay (e, com auto-throttle, concorrência) por host
+            with self._host_turn(url) as feedback:
+                # Requisição condicional quando a URL já está no cache HTTP
+                cache_entry = self.http_cache.get(url) if self.http_cache else None
+                request_headers = cache_entry.conditional_headers() if cache_entry else None
+                
+                # Faz a requisição, lendo o corpo em blocos
+                start_time = time.time()
+                response = self.session.get(url, timeout=self.timeout, headers=request_headers, stream=True)
+                try:
+                    feedback.update(self._response_feedback(response.status_code, response.headers))
+                    final_url = response.url
+                    # Páginas de erro (429/503 em text/plain) vão para as novas tentativas,
+                    # não para o descarte de conteúdo não-HTML
+                    response.raise_for_status()
+                    if not self._accept_content_type(url, response.headers.get('Content-Type')):
+                        return None
+                    body, truncated = read_limited(response.iter_content(CHUNK_SIZE), self.max_content_length)
+                finally:
+                    response.close()
+                response_time = time.time() - start_time
+                feedback['response_time'] = response_time
             
-            # Extrai conteúdo
-            if selectors is None:
-                selectors = {}
+            self._count_download(url, body, truncated)
             
-            extracted_content = self.extract_content(soup, selectors)
+            extraction_key = json.dumps(selectors or {}, sort_keys=True)
             
-            # Aplica filtros
-            if content_filters:
-                full_content = f"{extracted_content['title']} {extracted_content['description']} {extracted_content['content']}"
-                if not self.filter_content(full_content, content_filters):
-                    return None
-            
-            # Cria resultado
-            result = CrawlResult(
-                url=url,
-                title=extracted_content['title'],
-                description=extracted_content['description'],
-                content=extracted_content['content'],
-                links=extracted_content['links'],
-                images=extracted_content['images'],
-                timestamp=datetime.now(),
-                status_code=response.status_code,
-                response_time=response_time
-            )
+            if cache_entry is not None and response.status_code == 304:
+                # Não modificada: reaproveita o conteúdo extraído (ou o corpo) do cache
+                extracted_content = cache_entry.get_extracted(extraction_key)
+                if extracted_content is None:
+                    extracted_content = self._extract_html(cache_entry.get_body(), selectors, parser)
+                self.http_cache.record_not_modified(cache_entry, extraction_key, extracted_content)
+                status_code = cache_entry.status_code
+            else:
+                if self.parse_pool:
+                    # Modo pipeline: a thread espera o processo de parse sem segurar o GIL
+                    page = self.parse_pool.parse(body, selectors, self.get_extraction_plan(selectors, parser).backend,
+                                                 content_filters)
+                    extracted_content = self._accept_parsed(url, page, selectors, content_filters, parser)
+                    if extracted_content is None:
+                        return None
+                    content_filters = None  # já aplicados no processo de parse
+                else:
+                    if not self._prefilter(url, body, selectors, content_filters, parser):
+                        return None
+                    extracted_content = self._extract_html(body, selectors, parser)
+                status_code = response.status_code
+                
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                # Corpos truncados não vão para o cache (não representam a página inteira)
+                if self.http_cache and (etag or last_modified) and not truncated:
+                    self.http_cache.store(url, etag, last_modified, body, status_code,
+                                          extraction_key, extracted_content)
             
-            self.results.append(result)
-            self.logger.info(f"Crawling bem-sucedido: {url}")
+            result = self._build_result(url, extracted_content, status_code, response_time, content_filters,
+                                        truncated, final_url)
+            if result:
+                self.logger.info(f"Crawling bem-sucedido: {url}")
             
             return result
-            
+        
         except Exception as e:
+            delay = self._retry_delay(url, e, attempt, started or time.monotonic())
+            if delay is not None:
+                raise RetryLater(delay, e) from e
             self.logger.error(f"Erro ao fazer crawling de {url}: {str(e)}")
             return None
     
-    def crawl_multiple_urls(self, urls: List[str], **kwargs) -> List[CrawlResult]:
-        """Faz crawling de múltiplas URLs"""
+    def _accept_content_type(self, url: str, content_type: Optional[str]) -> bool:
+        """Descarta respostas que não são HTML antes de baixar o corpo"""
+        if is_html_content_type(content_type):
+            return True
+        with self._lock:
+            self.non_html_skipped += 1
+        self.logger.warning(f"Conteúdo não-HTML ignorado ({content_type}): {url}")
+        return False
+    
+    def _count_download(self, url: str, body: bytes, truncated: bool):
+        """Contabiliza os bytes baixados e os corpos cortados pelo limite"""
+        with self._lock:
+            self.bytes_downloaded += len(body)
+            if truncated:
+                self.truncated_pages += 1
+        if truncated:
+            self.logger.warning(f"Corpo truncado em {self.max_content_length} bytes: {url}")
+    
+    def _process_html(self, url: str, html, status_code: int, response_time: float,
+                      selectors: Dict = None, content_filters: Dict = None,
+                      parser: str = None, truncated: bool = False,
+                      final_url: Optional[str] = None) -> Optional[CrawlResult]:
+        """Faz o parse do HTML, extrai o conteúdo, aplica filtros e registra o resultado"""
+        if not self._prefilter(url, html, selectors, content_filters, parser):
+            return None
+        extracted_content = self._extract_html(html, selectors, parser)
+        return self._build_result(url, extracted_content, status_code, response_time, content_filters,
+                                  truncated, final_url)
+    
+    def _accept_parsed(self, url: str, page: ParsedPage, selectors: Dict = None, content_filters: Dict = None,
+                       parser: str = None) -> Optional[Dict]:
+        """Soma as estatísticas de uma página parseada em processo; None se ela foi filtrada"""
+        plan = self.get_extraction_plan(selectors, parser)
+        content_filter = self.get_content_filter(content_filters) if content_filters else None
+        
+        if page.prefilter is not None:
+            content_filter.record_precheck(page.prefilter, page.prefilter_time)
+            if not page.prefilter:
+                content_filter.record_saved(plan.average_page_time())
+                self.logger.debug(f"Página descartada pelo pré-filtro ({page.prefilter.rule}): {url}")
+                return None
+        
+        plan.record_page(page.parse_time, page.match_time, page.text_time)
+        if page.decision is not None:
+            content_filter.record_check(page.decision)
+            if not page.decision:
+                self.logger.debug(f"Conteúdo rejeitado pela regra {page.decision.rule}: {page.decision.match!r}")
+        return page.content
+    
+    def _prefilter(self, url: str, html, selectors: Dict = None, content_filters: Dict = None,
+                   parser: str = None) -> bool:
+        """Aplica o pré-filtro do job ao HTML bruto; False descarta a página antes do parse"""
+        if not content_filters:
+            return True
+        content_filter = self.get_content_filter(content_filters)
+        if content_filter.prefilter is None:
+            return True
+        
+        decision = content_filter.precheck(decode_html(html) if isinstance(html, bytes) else html)
+        if decision:
+            return True
+        
+        # O tempo poupado é estimado pela média de parse + extração das páginas já processadas
+        content_filter.record_saved(self.get_extraction_plan(selectors, parser).average_page_time())
+        self.logger.debug(f"Página descartada pelo pré-filtro ({decision.rule}): {url}")
+        return False
+    
+    def _extract_html(self, html, selectors: Dict = None, parser: str = None) -> Dict:
+        """Faz o parse do HTML e extrai o conteúdo com os seletores"""
+        plan = self.get_extraction_plan(selectors, parser)
+        
+        # Parse do HTML com o backend do job (ou o padrão do crawler)
+        start = time.perf_counter()
+        soup = parse_html(html, plan.backend)
+        plan.record_parse(time.perf_counter() - start)
+        
+        # Extrai conteúdo
+        return plan.extract(soup)
+    
+    def _build_result(self, url: str, extracted_content: Dict, status_code: int, response_time: float,
+                      content_filters: Dict = None, truncated: bool = False,
+                      final_url: Optional[str] = None) -> Optional[CrawlResult]:
+        """Aplica os filtros ao conteúdo extraído e registra o resultado
+        
+        final_url é a URL depois dos redirecionamentos; com o <base href> da
+        página ela define a base dos links relativos (base_url do resultado).
+        """
+        # Aplica filtros
+        if content_filters:
+            full_content = f"{extracted_content['title']} {extracted_content['description']} {extracted_content['content']}"
+            if not self.filter_content(full_content, content_filters):
+                return None
+        
+        # Quase duplicatas de uma página já vista são marcadas ou descartadas
+        duplicate_of = self.dedup.check(url, extracted_content['content']) if self.dedup else None
+        if duplicate_of:
+            self.logger.info(f"Quase duplicata de {duplicate_of}: {url}")
+            if self.dedup_action == 'drop':
+                return None
+        
+        # Base dos links relativos: URL final, ajustada pelo <base href> (ausente em caches antigos)
+        base_url = final_url or url
+        if extracted_content.get('base'):
+            base_url = urllib.parse.urljoin(base_url, extracted_content['base'])
+        
+        # Cria resultado
+        result = CrawlResult(
+            url=url,
+            title=extracted_content['title'],
+            description=extracted_content['description'],
+            content=extracted_content['content'],
+            links=extracted_content['links'],
+            images=extracted_content['images'],
+            timestamp=datetime.now(),
+            status_code=status_code,
+            response_time=response_time,
+            truncated=truncated,
+            duplicate_of=duplicate_of,
+            base_url=base_url if base_url != url else None,
+            compress=self.compress_content
+        )
+        
+        if self.keep_results:
+            with self._lock:
+                self.results.append(result)
+        
+        for sink in self.sinks:
+            sink.write(result)
+        
+        return result
+    
+    def enable_checkpoint(self, db_path: str = 'crawl_state.db', job_id: str = None,
+                          batch_size: int = 100, flush_interval: float = 2.0) -> str:
+        """Ativa checkpoints em SQLite para os próximos crawlings e retorna o job_id
+        
+        A fronteira pendente, as URLs visitadas e os resultados são gravados
+        em lotes; use resume(job_id) para continuar um crawling interrompido.
+        """
+        self.checkpoint = CrawlState(db_path, job_id, batch_size, flush_interval, self.tracking_params)
+        return self.checkpoint.job_id
+    
+    def record_checkpoint(self, url: str, result: Optional[CrawlResult]):
+        """Registra uma URL concluída no checkpoint ativo"""
+        if self.checkpoint:
+            self.checkpoint.record_done(url, result.to_dict() if result else None)
+    
+    def finish_checkpoint(self):
+        """Marca o job do checkpoint ativo como concluído e o desativa"""
+        if self.checkpoint:
+            self.checkpoint.finish()
+            self.checkpoint.close()
+            self.checkpoint = None
+    
+    def load_checkpoint(self, job_id: str, db_path: str = 'crawl_state.db'):
+        """Restaura URLs visitadas e resultados de um job salvo
+        
+        Retorna (modo, parâmetros, pendentes) e deixa o checkpoint ativo
+        para que o restante do crawling continue sendo registrado.
+        """
+        state = CrawlState(db_path, job_id, tracking_params=self.tracking_params)
+        mode, params, _ = state.load_job()
+        
+        with self._lock:
+            for fingerprint in state.visited_fingerprints():
+                self.visited_urls.add_fingerprint(fingerprint)
+            for data in state.results():
+                self.results.append(CrawlResult.from_dict(data))
+                if self.dedup:
+                    # Páginas de antes da interrupção continuam valendo como canônicas
+                    self.dedup.restore(data['url'], data.get('content') or '', data.get('duplicate_of'))
+        
+        self.checkpoint = state
+        return mode, params, state.pending()
+    
+    def resume(self, job_id: str, db_path: str = 'crawl_state.db', max_workers: int = None) -> List[CrawlResult]:
+        """Retoma um crawling interrompido sem baixar de novo as páginas concluídas
+        
+        Retorna todos os resultados do job (restaurados e novos).
+        """
+        restored_count = len(self.results)
+        mode, params, pending = self.load_checkpoint(job_id, db_path)
+        restored = self.results[restored_count:]
+        
+        workers = max_workers or params.get('max_workers', 1)
+        kwargs = params.get('kwargs', {})
+        
+        print(f"Retomando job {job_id}: {len(restored)} páginas concluídas, {len(pending)} pendentes")
+        
+        if mode == 'frontier':
+            frontier = Frontier(CrawlScope(params['seeds'], params['scope']),
+                                params['max_depth'], self.tracking_params)
+            for fingerprint in self.checkpoint.visited_fingerprints():
+                frontier.seen.add_fingerprint(fingerprint)
+            for url, depth in pending:
+                frontier.push(url, depth)
+            
+            results = self._run_frontier(frontier, workers, params.get('max_pages'),
+                                         params.get('max_bytes'), kwargs, len(frontier.seen) - len(frontier))
+        elif params.get('selenium') is not None:
+            # Job da interface gráfica feito com Selenium
+            results = self._run_selenium_list([url for url, _ in pending], params['selenium'], kwargs)
+        else:
+            results = self._run_url_list([url for url, _ in pending], workers, kwargs)
+        
+        return restored + results
+    
+    def _run_selenium_list(self, urls: List[str], selenium_options: Dict, kwargs: Dict) -> List[CrawlResult]:
+        """Executa o crawling sequencial de uma lista de URLs com crawl_with_selenium"""
         results = []
+        try:
+            for index, url in enumerate(urls, 1):
+                print(f"Processando {index}/{len(urls)}: {url}")
+                result = self.crawl_with_selenium(url, parser=kwargs.get('parser'),
+                                                  selectors=kwargs.get('selectors'),
+                                                  content_filters=kwargs.get('content_filters'),
+                                                  **selenium_options)
+                self.record_checkpoint(url, result)
+                if result and self.keep_results:
+                    results.append(result)
+            self.finish_checkpoint()
+        finally:
+            if self.checkpoint:
+                self.checkpoint.flush()
+        return results
+    
+    def crawl_multiple_urls(self, urls: List[str], max_workers: int = 1, **kwargs) -> List[CrawlResult]:
+        """Faz crawling de múltiplas URLs
+        
+        Com max_workers > 1 as requisições são feitas por um pool de threads:
+        hosts diferentes são processados em paralelo e o delay continua
+        valendo por host. Os resultados mantêm a ordem das URLs de entrada.
+        """
+        # Seletores e filtros inválidos falham aqui, antes do job começar
+        self.get_extraction_plan(kwargs.get('selectors'), kwargs.get('parser'))
+        self.get_content_filter(kwargs.get('content_filters'))
+        
+        if self.checkpoint:
+            params = {'max_workers': max_workers, 'kwargs': self._checkpoint_kwargs(kwargs)}
+            self.checkpoint.start_job('list', params, [(url, 0) for url in urls])
+        
+        return self._run_url_list(urls, max_workers, kwargs)
+    
+    def _run_url_list(self, urls: List[str], max_workers: int, kwargs: Dict,
+                      collect: bool = False) -> List[CrawlResult]:
+        """Executa o crawling de uma lista de URLs (sequencial ou com pool de threads)
+        
+        collect=True devolve os resultados mesmo com keep_results=False.
+        """
+        results = {}
         total_urls = len(urls)
+        max_workers = max(1, max_workers)
         
-        for i, url in enumerate(urls, 1):
-            print(f"Processando {i}/{total_urls}: {url}")
-            result = self.crawl_url(url, **kwargs)
-            if result:
-                results.append(result)
+        def worker(index, url, attempt, started):
+            if attempt:
+                print(f"Nova tentativa {attempt} de {index}/{total_urls}: {url}")
+            else:
+                print(f"Processando {index}/{total_urls}: {url}")
+            return self._crawl_attempt(url, attempt=attempt, started=started, **kwargs)
         
-        return results
+        try:
+            if max_workers > 1:
+                self._ensure_pool_size(max_workers)
+            
+            # (índice, url, tentativa, início); URLs com falha temporária voltam pela
+            # fila de novas tentativas quando o backoff termina
+            queue = [(index, url, 0, None) for index, url in enumerate(urls, 1)]
+            queue.reverse()
+            retries = RetryQueue()
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = {}
+                
+                while queue or retries or pending:
+                    queue.extend(reversed(retries.pop_due()))
+                    while queue and len(pending) < max_workers:
+                        index, url, attempt, started = queue.pop()
+                        started = started or time.monotonic()
+                        future = executor.submit(worker, index, url, attempt, started)
+                        pending[future] = (index, url, attempt, started)
+                    self._prefetch(task[1] for task in queue[-self.prefetch_lookahead:])
+                    
+                    if not pending:
+                        time.sleep(retries.next_due_in() or 0)
+                        continue
+                    
+                    done, _ = wait(pending, timeout=retries.next_due_in(), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, url, attempt, started = pending.pop(future)
+                        try:
+                            result = future.result()
+                        except RetryLater as retry:
+                            retries.push((index, url, attempt + 1, started), retry.delay)
+                            continue
+                        self.record_checkpoint(url, result)
+                        if result and (self.keep_results or collect):
+                            results[index] = result
+            
+            self.finish_checkpoint()
+        finally:
+            if self.checkpoint:
+                self.checkpoint.flush()
+            self.robots_cache.save()
+        
+        # Mantém a ordem das URLs de entrada
+        return [results[index] for index in sorted(results)]
     
-    def crawl_with_selenium(self, url: str, wait_time: int = 3, 
-                           execute_js: str = None) -> Optional[CrawlResult]:
-        """Faz crawling usando Selenium para sites com JavaScript"""
+    def crawl_frontier(self, seeds: List[str], max_depth: int = 2, scope='same_domain',
+                       max_pages: int = None, max_bytes: int = None, max_workers: int = 1,
+                       **kwargs) -> List[CrawlResult]:
+        """Faz crawling recursivo em largura a partir das URLs semente
+        
+        Os links de cada página são resolvidos contra a URL da página e
+        enfileirados até max_depth. scope aceita 'same_domain', 'any' ou uma
+        expressão regular. max_pages limita as páginas baixadas e max_bytes
+        o volume baixado nesta chamada. Os demais argumentos vão para crawl_url.
+        """
+        self.get_extraction_plan(kwargs.get('selectors'), kwargs.get('parser'))
+        self.get_content_filter(kwargs.get('content_filters'))
+        
+        frontier = Frontier(CrawlScope(seeds, scope), max_depth, self.tracking_params)
+        for seed in seeds:
+            frontier.push(seed, 0)
+        
+        if self.checkpoint:
+            params = {
+                'seeds': list(seeds),
+                'max_depth': max_depth,
+                'scope': getattr(scope, 'pattern', scope),
+                'max_pages': max_pages,
+                'max_bytes': max_bytes,
+                'max_workers': max_workers,
+                'kwargs': self._checkpoint_kwargs(kwargs)
+            }
+            self.checkpoint.start_job('frontier', params, list(frontier.queue))
+        
+        return self._run_frontier(frontier, max_workers, max_pages, max_bytes, kwargs)
+    
+    def _run_frontier(self, frontier: Frontier, max_workers: int, max_pages: Optional[int],
+                      max_bytes: Optional[int], kwargs: Dict, dispatched: int = 0) -> List[CrawlResult]:
+        """Consome a fronteira com um pool de workers até esvaziar ou estourar o orçamento"""
+        results = []
+        start_bytes = self.bytes_downloaded
+        
+        if max_workers > 1:
+            self._ensure_pool_size(max_workers)
+        
+        def budget_exhausted():
+            if max_pages is not None and dispatched >= max_pages:
+                return True
+            if max_bytes is not None and self.bytes_downloaded - start_bytes >= max_bytes:
+                return True
+            return False
+        
+        # (url, profundidade, tentativa, início) das URLs aguardando nova tentativa;
+        # elas já contam em dispatched e têm prioridade sobre a fronteira
+        retries = RetryQueue()
+        ready = []
+        
         try:
-            # Configura o Chrome
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument(f'--user-agent={self.ua.random}')
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = {}
+                
+                def submit(url, depth, attempt, started):
+                    future = executor.submit(self._crawl_attempt, url, attempt=attempt, started=started, **kwargs)
+                    pending[future] = (url, depth, attempt, started)
+                
+                while True:
+                    ready.extend(retries.pop_due())
+                    while ready and len(pending) < max_workers:
+                        url, depth, attempt, started = ready.pop(0)
+                        print(f"Nova tentativa {attempt} (profundidade {depth}): {url}")
+                        submit(url, depth, attempt, started)
+                    while frontier and len(pending) < max_workers and not budget_exhausted():
+                        url, depth = frontier.pop()
+                        dispatched += 1
+                        print(f"Processando {dispatched} (profundidade {depth}): {url}")
+                        submit(url, depth, 0, time.monotonic())
+                    self._prefetch(url for url, _ in itertools.islice(frontier.queue, self.prefetch_lookahead))
+                    
+                    if not pending:
+                        if not retries:
+                            break
+                        time.sleep(retries.next_due_in() or 0)
+                        continue
+                    
+                    done, _ = wait(pending, timeout=retries.next_due_in(), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url, depth, attempt, started = pending.pop(future)
+                        try:
+                            result = future.result()
+                        except RetryLater as retry:
+                            retries.push((url, depth, attempt + 1, started), retry.delay)
+                            continue
+                        if result:
+                            if self.keep_results:
+                                results.append(result)
+                            # Os links de quase duplicatas já vieram da página canônica
+                            if not result.duplicate_of or self.dedup_follow_links:
+                                for link in frontier.add_links(result.link_base, result.links, depth + 1):
+                                    if self.checkpoint:
+                                        self.checkpoint.record_pending(link, depth + 1)
+                        self.record_checkpoint(url, result)
             
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+            if frontier:
+                self.logger.info(f"Orçamento do crawling esgotado com {len(frontier)} URLs pendentes")
+            else:
+                self.finish_checkpoint()
+        finally:
+            if self.checkpoint:
+                self.checkpoint.flush()
+            self.robots_cache.save()
+        
+        return results
+    
+    def run_worker(self, address, batch_size: int = 20, max_workers: int = 4,
+                   name: Optional[str] = None) -> int:
+        """Trabalha como worker de um coordenador distribuído (ver coordinator.py)
+        
+        Registra-se no coordenador em address ('host:porta'), recebe dele os
+        argumentos de crawl_url do job e processa lotes de até batch_size URLs
+        com max_workers threads, devolvendo os resultados e os links de cada
+        página. Termina quando o coordenador informa que o crawling acabou e
+        retorna o número de páginas processadas.
+        """
+        from coordinator import CoordinatorClient
+        
+        processed = 0
+        with CoordinatorClient(address) as client:
+            worker_id = client.register(name)
+            # O coordenador já deduplica; um lote expirado pode voltar a este worker
+            kwargs = dict(client.job, dedup=False)
+            self.get_extraction_plan(kwargs.get('selectors'), kwargs.get('parser'))
+            self.get_content_filter(kwargs.get('content_filters'))
+            self.logger.info(f"Worker {worker_id} conectado ao coordenador {address}")
             
+            while True:
+                lease = client.lease(batch_size)
+                if lease.get('done'):
+                    break
+                if not lease['urls']:
+                    time.sleep(lease.get('wait', 0.5))
+                    continue
+                
+                urls = [url for url, _ in lease['urls']]
+                results = {result.url: result for result in self._run_url_list(urls, max_workers, kwargs, collect=True)}
+                
+                pages = []
+                for url in urls:
+                    result = results.get(url)
+                    page = {'url': url, 'result': result.to_dict() if result else None, 'links': []}
+                    # Os links de quase duplicatas já vieram da página canônica
+                    if result and (not result.duplicate_of or self.dedup_follow_links):
+                        page['links'] = list(result.links)
+                    pages.append(page)
+                client.complete(lease['lease'], pages)
+                processed += len(urls)
+        
+        self.logger.info(f"Worker {worker_id} concluído: {processed} páginas")
+        return processed
+    
+    async def acrawl_many(self, urls: List[str], concurrency: int = 100, selectors: Dict = None,
+                          content_filters: Dict = None, respect_robots: bool = True,
+                          parser: str = None) -> List[CrawlResult]:
+        """Faz crawling assíncrono de múltiplas URLs com asyncio
+        
+        Usa um cliente HTTP baseado em asyncio no lugar do requests.Session,
+        permitindo milhares de conexões simultâneas em uma única thread.
+        O delay por host e a deduplicação de URLs continuam valendo, e o
+        backoff das novas tentativas é aguardado fora do semáforo.
+        
+        Exemplo: results = asyncio.run(crawler.acrawl_many(urls, concurrency=500))
+        """
+        self.get_extraction_plan(selectors, parser)
+        self.get_content_filter(content_filters)
+        
+        # Mesmos proxies do caminho síncrono: os da sessão e, com trust_env, os do ambiente
+        proxies = dict(self.session.proxies)
+        if self.session.trust_env:
+            for scheme, proxy in urllib.request.getproxies().items():
+                proxies.setdefault(scheme, proxy)
+        fetcher = AsyncFetcher(headers=dict(self.session.headers), timeout=self.timeout,
+                               max_content_length=self.max_content_length, html_only=True,
+                               proxies=proxies)
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        
+        async def crawl(url):
+            attempt, started = 0, time.monotonic()
+            while True:
+                try:
+                    async with semaphore:
+                        return await crawl_attempt(url, attempt, started)
+                except RetryLater as retry:
+                    await asyncio.sleep(retry.delay)
+                    attempt += 1
+        
+        async def crawl_attempt(url, attempt, started):
             try:
+                # robots.txt ainda usa a API bloqueante, então roda em uma thread
+                if respect_robots and not await loop.run_in_executor(None, self.check_robots_txt, url):
+                    self.logger.warning(f"Crawling não permitido pelo robots.txt: {url}")
+                    return None
+                
+                if attempt == 0:
+                    with self._lock:
+                        if url in self.visited_urls:
+                            return None
+                        self.visited_urls.add(url)
+                
+                host = self._host(url)
+                if self.throttle:
+                    while not self.throttle.try_acquire(host):
+                        await asyncio.sleep(0.05)
+                feedback = {}
+                try:
+                    wait = self._reserve_host_slot(url)
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    
+                    start_time = time.time()
+                    response = await fetcher.get(url)
+                    response_time = time.time() - start_time
+                    feedback = self._response_feedback(response.status_code, response.headers, response_time)
+                finally:
+                    if self.throttle:
+                        self.throttle.release(host, **feedback)
+                
+                response.raise_for_status()
+                if not self._accept_content_type(url, response.headers.get('content-type')):
+                    return None
+                self._count_download(url, response.content, response.truncated)
+                
+                if self.parse_pool:
+                    # O laço de eventos segue baixando enquanto um processo faz o parse
+                    backend = self.get_extraction_plan(selectors, parser).backend
+                    page = await asyncio.wrap_future(self.parse_pool.submit(response.content, selectors, backend,
+                                                                            content_filters))
+                    extracted_content = self._accept_parsed(url, page, selectors, content_filters, parser)
+                    result = None
+                    if extracted_content is not None:
+                        result = self._build_result(url, extracted_content, response.status_code, response_time,
+                                                    truncated=response.truncated, final_url=response.url)
+                else:
+                    result = self._process_html(url, response.content, response.status_code,
+                                                response_time, selectors, content_filters, parser,
+                                                response.truncated, response.url)
+                if result:
+                    self.logger.info(f"Crawling bem-sucedido: {url}")
+                
+                return result
+            
+            except Exception as e:
+                delay = self._retry_delay(url, e, attempt, started)
+                if delay is not None:
+                    raise RetryLater(delay, e) from e
+                self.logger.error(f"Erro ao fazer crawling de {url}: {str(e) or type(e).__name__}")
+                return None
+        
+        try:
+            results = await asyncio.gather(*(crawl(url) for url in urls))
+        finally:
+            await fetcher.close()
+            self.robots_cache.save()
+        
+        return [result for result in results if result]
+    
+    def setup_selenium_pool(self, size: int = 2, max_pages_per_driver: int = 50):
+        """Configura o pool de WebDrivers reutilizados por crawl_with_selenium"""
+        self.close_selenium_pool()
+        self.selenium_pool = WebDriverPool(
+            size=size,
+            max_pages_per_driver=max_pages_per_driver,
+            driver_factory=lambda: create_chrome_driver(self.ua.random)
+        )
+    
+    def close_selenium_pool(self):
+        """Fecha os navegadores do pool de WebDrivers"""
+        if self.selenium_pool:
+            self.selenium_pool.close()
+            self.selenium_pool = None
+    
+    def crawl_with_selenium(self, url: str, wait_time: int = 3, 
+                           execute_js: str = None, wait_for: str = 'ready_state',
+                           wait_selector: Optional[str] = None,
+                           idle_time: float = 0.5, parser: str = None, selectors: Dict = None,
+                           content_filters: Dict = None) -> Optional[CrawlResult]:
+        """Faz crawling usando Selenium para sites com JavaScript
+        
+        O navegador vem do pool de WebDrivers (criado com um driver na
+        primeira chamada se setup_selenium_pool não foi usado). wait_time é
+        o tempo máximo de espera pela condição wait_for (ver wait_until_ready);
+        a renderização segue assim que a página estiver pronta. selectors e
+        content_filters (inclusive o pré-filtro) valem como em crawl_url.
+        """
+        try:
+            if self.selenium_pool is None:
+                self.setup_selenium_pool(size=1)
+            
+            with self.selenium_pool.driver() as driver:
                 start_time = time.time()
                 driver.get(url)
                 
-                # Aguarda carregar
-                time.sleep(wait_time)
+                # Aguarda a página ficar pronta
+                if not wait_until_ready(driver, wait_for, wait_time, wait_selector, idle_time):
+                    self.logger.warning(f"Timeout aguardando '{wait_for}' em {url}")
                 
                 # Executa JavaScript personalizado se fornecido
                 if execute_js:
                     driver.execute_script(execute_js)
-                    time.sleep(1)
+                    if wait_for == 'sleep':
+                        time.sleep(1)
+                    else:
+                        # Espera o DOM assentar após o script (ex.: scroll infinito)
+                        wait_until_ready(driver, 'dom_stable', wait_time, idle_time=idle_time)
                 
                 response_time = time.time() - start_time
                 
                 # Obtém o HTML renderizado
                 html = driver.page_source
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Extrai conteúdo
-                extracted_content = self.extract_content(soup, {})
-                
-                result = CrawlResult(
-                    url=url,
-                    title=extracted_content['title'],
-                    description=extracted_content['description'],
-                    content=extracted_content['content'],
-                    links=extracted_content['links'],
-                    images=extracted_content['images'],
-                    timestamp=datetime.now(),
-                    status_code=200,
-                    response_time=response_time
-                )
-                
-                self.results.append(result)
-                return result
-                
-            finally:
-                driver.quit()
-                
+                # URL final após redirecionamentos (drivers sem current_url ficam com a pedida)
+                final_url = getattr(driver, 'current_url', None) or url
+            
+            return self._process_html(url, html, 200, response_time, selectors, content_filters, parser,
+                                      final_url=final_url)
+        
         except Exception as e:
             self.logger.error(f"Erro no crawling com Selenium: {str(e)}")
             return None
     
+    def crawl_many_with_selenium(self, urls: List[str], wait_time: int = 3,
+                                 execute_js: str = None, **wait_options) -> List[CrawlResult]:
+        """Renderiza várias URLs em paralelo, uma por driver do pool"""
+        if self.selenium_pool is None:
+            self.setup_selenium_pool()
+        
+        with ThreadPoolExecutor(max_workers=self.selenium_pool.size) as executor:
+            futures = [executor.submit(self.crawl_with_selenium, url, wait_time, execute_js, **wait_options)
+                       for url in urls]
+            results = [future.result() for future in futures]
+        
+        return [result for result in results if result]
+    
+    def open_export(self, filename: str, format: str = 'jsonl', keep_results: bool = True,
+                    **sink_options) -> ResultSink:
+        """Passa a gravar cada resultado no arquivo assim que ele é obtido
+        
+        format aceita 'jsonl', 'csv', 'excel', 'json', 'parquet' ou 'arrow'
+        (ver exporters.py); parquet/arrow guardam o resultado completo.
+        Com keep_results=False os resultados não ficam em self.results nem
+        nas listas retornadas, mantendo a memória constante em crawls longos.
+        Chame close_exports() ao final.
+        """
+        sink = create_sink(filename, format, **sink_options)
+        self.sinks.append(sink)
+        self.keep_results = keep_results
+        return sink
+    
+    def close_exports(self):
+        """Finaliza os arquivos dos exportadores incrementais"""
+        sinks, self.sinks = self.sinks, []
+        for sink in sinks:
+            sink.close()
+        self.keep_results = True
+    
     def export_results(self, filename: str, format: str = 'excel'):
-        """Exporta os resultados para diferentes formatos"""
+        """Exporta os resultados para diferentes formatos
+        
+        Os resultados são gravados um a um pelo exportador do formato, sem
+        montar um DataFrame com tudo na memória.
+        """
         if not self.results:
             print("Nenhum resultado para exportar.")
             return
         
-        # Converte resultados para DataFrame
-        data = []
-        for result in self.results:
-            data.append({
-                'URL': result.url,
-                'Título': result.title,
-                'Descrição': result.description,
-                'Conteúdo': result.content[:500] + '...' if len(result.content) > 500 else result.content,
-                'Número de Links': len(result.links),
-                'Número de Imagens': len(result.images),
-                'Status Code': result.status_code,
-                'Tempo de Resposta (s)': round(result.response_time, 2),
-                'Timestamp': result.timestamp.strftime('%Y-%m-%d %H:%M:%S')
-            })
-        
-        df = pd.DataFrame(data)
-        
-        if format.lower() == 'excel':
-            df.to_excel(filename, index=False)
-        elif format.lower() == 'csv':
-            df.to_csv(filename, index=False, encoding='utf-8')
-        elif format.lower() == 'json':
-            df.to_json(filename, orient='records', indent=2, force_ascii=False)
+        with create_sink(filename, format) as sink:
+            for result in list(self.results):
+                sink.write(result)
         
         print(f"Resultados exportados para: {filename}")
     
     def get_statistics(self) -> Dict:
-        """Retorna estatísticas dos resultados"""
-        if not self.results:
-            return {}
+        """Retorna estatísticas dos resultados e dos subsistemas
         
+        Os agregados por resultado ficam zerados quando nenhum resultado foi
+        guardado (ex.: open_export com keep_results=False), mas os contadores
+        de robots, cache, conexões, hosts etc. continuam disponíveis.
+        """
         total_results = len(self.results)
-        avg_response_time = sum(r.response_time for r in self.results) / total_results
-        total_links = sum(len(r.links) for r in self.results)
-        total_images = sum(len(r.images) for r in self.results)
-        
+        avg_response_time = 0.0
+        total_links = 0
+        total_images = 0
         status_codes = {}
-        for result in self.results:
-            status_codes[result.status_code] = status_codes.get(result.status_code, 0) + 1
+        
+        if total_results:
+            # Uma única passada: resultados despejados são lidos do disco uma vez só
+            total_response_time = 0.0
+            for result in self.results:
+                total_response_time += result.response_time
+                total_links += len(result.links)
+                total_images += len(result.images)
+                status_codes[result.status_code] = status_codes.get(result.status_code, 0) + 1
+            avg_response_time = total_response_time / total_results
         
         return {
             'total_pages': total_results,
@@ -373,5 +1375,25 @@ class WebCrawler:
             'total_links_found': total_links,
             'total_images_found': total_images,
             'status_codes': status_codes,
-            'total_urls_visited': len(self.visited_urls)
+            'total_urls_visited': len(self.visited_urls),
+            'total_bytes_downloaded': self.bytes_downloaded,
+            'truncated_pages': self.truncated_pages,
+            'non_html_skipped': self.non_html_skipped,
+            'parser': self.parser,
+            'extraction_plans': [dict(plan.get_statistics(), name=plan.name) for plan in self._plans.values()
+                                 if plan.pages],
+            'result_store': self.results.get_statistics(),
+            'content_filters': [content_filter.get_statistics() for content_filter in self._filters.values()
+                                if content_filter.checked],
+            'robots_cache': self.robots_cache.get_statistics(),
+            'http_cache': self.http_cache.get_statistics() if self.http_cache else {},
+            'near_duplicates': self.dedup.get_statistics() if self.dedup else {},
+            'hosts': self.throttle.get_statistics() if self.throttle else {},
+            'connections': self.connection_stats.get_statistics(),
+            'dns': dict(self.dns_cache.get_statistics(),
+                        prefetch=self.prefetcher.get_statistics() if self.prefetcher else {}),
+            'parse_pool': self.parse_pool.get_statistics() if self.parse_pool else {},
+            'retries': {'max_retries': self.retry_policy.max_retries, 'scheduled': self.retries_scheduled,
+                        'exhausted': self.retries_exhausted},
+            'selenium_pool': self.selenium_pool.get_statistics() if self.selenium_pool else {}
         }